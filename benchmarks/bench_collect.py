@@ -0,0 +1,52 @@
+"""Benchmark StockTwitsScraper.collect_community_data against a local stub server.
+
+Usage:
+    python benchmarks/bench_collect.py [--latency 0.05] [--workers 8]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import StockTwitsScraper
+from rate_limit import TokenBucket
+from stub_server import StubStockTwitsServer
+
+
+def run(counts, latency: float, workers: int, rate: float):
+    """Print wall-clock collection time versus symbol count."""
+    print(f"latency={latency * 1000:.0f}ms  limiter={rate:g} req/s  workers={workers}")
+    print(f"{'Symbols':<10} {'Serial (s)':<12} {'Concurrent (s)':<16} {'Speedup':<8}")
+    print("-" * 50)
+
+    with StubStockTwitsServer(latency=latency) as server:
+        for count in counts:
+            timings = []
+            for max_workers in (1, workers):
+                limiter = TokenBucket(rate=rate, capacity=workers)
+                scraper = StockTwitsScraper(rate_limiter=limiter)
+                scraper.BASE_URL = server.base_url
+                start = time.perf_counter()
+                data = scraper.collect_community_data(num_symbols=count, max_workers=max_workers)
+                timings.append(time.perf_counter() - start)
+                scraper.close()
+                assert len(data['symbols']) == count
+
+            serial, concurrent = timings
+            print(f"{count:<10} {serial:<12.3f} {concurrent:<16.3f} {serial / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[5, 10, 20, 40, 80])
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency in seconds')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent in-flight limit')
+    parser.add_argument('--rate', type=float, default=50.0, help='Limiter rate (requests/second)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.counts, args.latency, args.workers, args.rate)
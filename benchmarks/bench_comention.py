@@ -0,0 +1,45 @@
+"""Measure co-mention graph build throughput and query latency.
+
+Usage:
+    python benchmarks/bench_comention.py [--messages 200000] [--universe 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from co_mentions import CoMentionGraph
+from corpus import make_universe, stream_texts
+
+
+def per_call_us(query, repeat: int = 200) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=200_000)
+    parser.add_argument('--universe', type=int, default=5000)
+    args = parser.parse_args()
+
+    universe = make_universe(args.universe)
+    texts = stream_texts(args.messages, universe)
+    graph = CoMentionGraph(SymbolAnalyzer(universe=universe))
+    start = time.perf_counter()
+    graph.update(texts)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.messages:,} messages in {elapsed:.2f}s ({args.messages / elapsed:,.0f} msgs/s)")
+    print(f"{len(graph):,} symbols, {graph.num_pairs:,} pairs "
+          f"({graph.num_pairs / max(len(graph) ** 2 / 2, 1):.2%} of a dense matrix)")
+    hub = universe[0]
+    print(f"related({hub!r}, 10):     {per_call_us(lambda: graph.related(hub, 10)):>8.1f} us")
+    print(f"strongest_pairs(10):     {per_call_us(lambda: graph.strongest_pairs(10)):>8.1f} us")
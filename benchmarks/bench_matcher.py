@@ -0,0 +1,53 @@
+"""Compare the regex and trie symbol extraction engines on a synthetic corpus.
+
+Usage:
+    python benchmarks/bench_matcher.py [--messages 1000000] [--universe 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from corpus import labeled_messages, make_universe
+
+
+def score(analyzer: SymbolAnalyzer, corpus):
+    """Return (messages/second, precision, recall) for one engine."""
+    texts = [text for text, _ in corpus]
+    start = time.perf_counter()
+    extracted = [analyzer.extract_symbols(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    true_positives = found = expected = 0
+    for symbols, (_, truth) in zip(extracted, corpus):
+        truth_counts = Counter(truth)
+        found_counts = Counter(symbols)
+        true_positives += sum((truth_counts & found_counts).values())
+        found += len(symbols)
+        expected += len(truth)
+
+    precision = true_positives / found if found else 0.0
+    recall = true_positives / expected if expected else 0.0
+    return len(texts) / elapsed, precision, recall
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--universe', type=int, default=5000)
+    args = parser.parse_args()
+
+    universe = make_universe(args.universe)
+    print(f"Generating {args.messages:,} messages over a {len(universe):,}-symbol universe...")
+    corpus = labeled_messages(args.messages, universe)
+
+    print(f"{'Engine':<10} {'Msgs/s':>12} {'Precision':>10} {'Recall':>8}")
+    print("-" * 44)
+    for name, analyzer in (('regex', SymbolAnalyzer()), ('trie', SymbolAnalyzer(universe=universe))):
+        rate, precision, recall = score(analyzer, corpus)
+        print(f"{name:<10} {rate:>12,.0f} {precision:>10.3f} {recall:>8.3f}")
@@ -0,0 +1,43 @@
+"""Measure parallel mention counting throughput from 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_parallel.py [--messages 1000000] [--chunk-size 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from corpus import labeled_messages, make_universe
+from parallel import parallel_count_mentions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    texts = [text for text, _ in labeled_messages(args.messages, make_universe())]
+    analyzer = SymbolAnalyzer()
+    serial = analyzer.count_mentions(texts)
+
+    print(f"{args.messages:,} messages, chunk size {args.chunk_size:,}, {os.cpu_count()} CPUs")
+    print(f"{'Workers':<9} {'Seconds':>9} {'Msgs/s':>12} {'Speedup':>8}")
+    print("-" * 42)
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        result = parallel_count_mentions(texts, workers=workers, chunk_size=args.chunk_size, analyzer=analyzer)
+        elapsed = time.perf_counter() - start
+        assert result.most_common(50) == serial.most_common(50)
+        assert result.statistics() == serial.statistics()
+        baseline = baseline or elapsed
+        print(f"{workers:<9} {elapsed:>9.2f} {args.messages / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x")
+        workers *= 2
@@ -0,0 +1,75 @@
+"""Compare top-K selection against a full sort and measure incremental re-ranking.
+
+Usage:
+    python benchmarks/bench_ranking.py [--sizes 10000 100000] [--k 20] [--changed 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from corpus import make_universe
+from ranking import RankingEngine, top_k_indices
+
+
+def per_call_us(query, repeat: int = 50) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def build_engine(size: int, rng: np.random.Generator) -> RankingEngine:
+    """Engine over a synthetic universe with log-normal volumes."""
+    engine = RankingEngine(capacity=size)
+    volume = rng.lognormal(13, 2, size)
+    engine.update_many(
+        {'symbol': symbol, 'volume': float(v), 'change_pct': float(c),
+         'avg_volume': float(v * r), 'mentions': int(m)}
+        for symbol, v, c, r, m in zip(make_universe(size), volume, rng.normal(0, 4, size),
+                                      rng.lognormal(0, 0.5, size), rng.poisson(3, size))
+    )
+    return engine
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--changed', type=int, default=50, help='Quotes changed per incremental update')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(f"{'Symbols':>9} {'full sort':>11} {'argpartition':>13} {'composite':>11} "
+          f"{'update+rerank':>14} {'full rescore':>13}")
+    for size in args.sizes:
+        engine = build_engine(size, rng)
+        volume = engine.column('volume')
+        full_sort = per_call_us(lambda: np.argsort(-volume, kind='stable')[:args.k])
+        partial = per_call_us(lambda: top_k_indices(volume, args.k))
+        rescore = per_call_us(engine.rescore)
+
+        def cold_composite():
+            engine.rescore()
+            engine.top(args.k)
+
+        composite = per_call_us(cold_composite)
+        symbols = engine.symbols
+
+        def update_and_rerank():
+            rows = rng.integers(0, size, args.changed)
+            engine.update_many({'symbol': symbols[i], 'volume': float(volume[i]) * 0.99} for i in rows)
+            engine.top(args.k)
+
+        engine.top(args.k)
+        incremental = per_call_us(update_and_rerank, repeat=200)
+        print(f"{size:>9,} {full_sort:>9.0f}us {partial:>11.0f}us {composite:>9.0f}us "
+              f"{incremental:>12.0f}us {rescore:>11.0f}us")
+        print(f"{'':>9} cached selections: {engine.stats['cached_selections']}, "
+              f"full: {engine.stats['full_selections']}")
@@ -0,0 +1,79 @@
+"""Seeded synthetic StockTwits-style corpora for benchmarks."""
+
+import itertools
+import random
+import string
+from typing import Iterator, List, Tuple
+
+# Filler vocabulary; capitalized and all-caps words exercise false positives
+WORDS = [
+    'looking', 'strong', 'today', 'bullish', 'bearish', 'breakout', 'support',
+    'resistance', 'calls', 'puts', 'earnings', 'volume', 'watching', 'holding',
+    'the', 'and', 'for', 'this', 'week', 'into', 'close', 'gap', 'fill', 'run',
+    'Tesla', 'Nvidia', 'Market', 'Fed', 'Buy', 'Sell', 'Long', 'Short',
+]
+NOISE_CAPS = ['CEO', 'USA', 'IMO', 'YOLO', 'ATH', 'FOMO', 'EPS', 'GDP', 'CPI', 'ETF', 'IPO', 'DD']
+# Plurals and suffixed words whose uppercase prefix must not match a ticker
+NOISE_SUFFIXED = ['IPOs', 'CEOs', 'ETFs', 'ATHs', 'DDs', 'EPSs']
+REAL_TICKERS = [
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'SPY', 'QQQ', 'DIA',
+    'SMX', 'INTC', 'IBRX', 'MSTR', 'ALT', 'DJT', 'NIO', 'TMDX', 'CRDO', 'MOS',
+    'BOB.X', 'ALGO.X', 'BTC.X', 'ETH.X', 'BRK.B',
+]
+
+
+def make_universe(size: int = 5000, seed: int = 7) -> List[str]:
+    """Generate a ticker universe with realistic shapes (1-5 letters, some dotted)."""
+    rng = random.Random(seed)
+    noise = set(NOISE_CAPS)
+    universe = set(REAL_TICKERS)
+    while len(universe) < size:
+        length = rng.choice((1, 2, 3, 3, 4, 4, 4, 5))
+        symbol = ''.join(rng.choice(string.ascii_uppercase) for _ in range(length))
+        if rng.random() < 0.03:
+            symbol += '.X'
+        if symbol not in noise:
+            universe.add(symbol)
+    return sorted(universe)
+
+
+def iter_labeled_messages(count: int, universe: List[str], seed: int = 11) -> Iterator[Tuple[str, List[str]]]:
+    """Lazily generate messages paired with the tickers they truly mention.
+
+    Tickers appear as bare words or $cashtags; all-caps noise words that are
+    not tickers appear too, as do plurals (IPOs) and tickers run into a
+    lowercase suffix (AAPLx), so precision can be measured.
+    """
+    rng = random.Random(seed)
+    # Skew mentions toward the head of the universe like real chatter
+    weights = [1.0 / (rank + 1) for rank in range(len(universe))]
+    cumulative = list(itertools.accumulate(weights))
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(6, 14))
+        truth = rng.choices(universe, cum_weights=cumulative, k=rng.randint(1, 3))
+        for ticker in truth:
+            token = f"${ticker}" if rng.random() < 0.4 else ticker
+            words.insert(rng.randrange(len(words) + 1), token)
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(NOISE_CAPS))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(NOISE_SUFFIXED))
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(universe) + rng.choice('sx'))
+        yield ' '.join(words), truth
+
+
+def labeled_messages(count: int, universe: List[str], seed: int = 11) -> List[Tuple[str, List[str]]]:
+    """Generate messages paired with the tickers they truly mention."""
+    return list(iter_labeled_messages(count, universe, seed))
+
+
+def stream_texts(count: int, universe: List[str], pool_size: int = 100_000, seed: int = 11) -> Iterator[str]:
+    """Stream ``count`` message texts in constant memory.
+
+    A seeded pool of at most ``pool_size`` messages is generated once and
+    cycled, so corpora up to 10^7 messages cost no more memory than the pool
+    and generation time is not part of what a benchmark measures.
+    """
+    pool = [text for text, _ in iter_labeled_messages(min(count, pool_size), universe, seed)]
+    return itertools.islice(itertools.cycle(pool), count)
@@ -0,0 +1,127 @@
+"""Local stub of the StockTwits API used by the benchmarks."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubStockTwitsServer:
+    """Threaded HTTP server that mimics the StockTwits endpoints the scraper uses.
+
+    Every response is delayed by ``latency`` seconds and carries
+    ``X-RateLimit-*`` headers so the client's limiter has something to read.
+    It also answers Finnhub-style ``/quote`` requests so the quote fetcher
+    can be benchmarked against the same server.
+    """
+
+    def __init__(self, latency: float = 0.05, num_symbols: int = 200,
+                 messages_per_symbol: int = 30, rate_limit: int = 100000):
+        """Initialize the stub server.
+
+        Args:
+            latency: Artificial per-request latency in seconds
+            num_symbols: Size of the trending symbol universe
+            messages_per_symbol: Messages served for each symbol
+            rate_limit: Value reported in the rate-limit headers
+        """
+        self.latency = latency
+        self.symbols = [f"S{i:03d}" for i in range(num_symbols)]
+        self.messages_per_symbol = messages_per_symbol
+        self.rate_limit = rate_limit
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to assign to ``StockTwitsScraper.BASE_URL``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    @property
+    def quote_url(self) -> str:
+        """Base URL to assign to ``MarketDataFetcher.FINNHUB_BASE_URL``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/finnhub"
+
+    def messages_page(self, symbol: str, limit: int, query) -> dict:
+        """Newest-first page of a symbol's stream honoring 'max'/'since' cursors.
+
+        Message ids run from ``messages_per_symbol`` down to 1.
+        """
+        newest = int(query['max'][0]) if 'max' in query else self.messages_per_symbol
+        since = int(query['since'][0]) if 'since' in query else 0
+        ids = list(range(min(newest, self.messages_per_symbol), since, -1))[:limit]
+        messages = [
+            {'id': i, 'body': f"${symbol} looking strong today #{i}",
+             'created_at': '2025-11-28T15:30:00Z',
+             'entities': {'sentiment': ({'basic': 'Bullish'} if i % 3 else {'basic': 'Bearish'})
+                          if i % 2 else None}}
+            for i in ids
+        ]
+        more = bool(ids) and ids[-1] - 1 > since
+        return {'messages': messages,
+                'cursor': {'more': more, 'max': ids[-1] - 1 if ids else None, 'since': since}}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(stub.latency)
+                with stub._lock:
+                    stub.request_count += 1
+                    count = stub.request_count
+
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                query = parse_qs(url.query)
+                limit = int(query.get('limit', ['30'])[0])
+
+                if parts[-2:] == ['symbols', 'trending']:
+                    payload = {'symbols': [{'symbol': s} for s in stub.symbols[:limit]]}
+                elif len(parts) >= 2 and parts[-1] == 'messages':
+                    payload = stub.messages_page(parts[-2], limit, query)
+                elif parts[-2:] == ['finnhub', 'quote']:
+                    payload = {'c': 100.0 + len(query['symbol'][0]), 'dp': 1.5}
+                else:
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-RateLimit-Limit', str(stub.rate_limit))
+                self.send_header('X-RateLimit-Remaining', str(max(stub.rate_limit - count, 0)))
+                self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> 'StubStockTwitsServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
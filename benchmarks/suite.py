@@ -0,0 +1,295 @@
+"""Benchmark suite for the analyzer, scraper and fetcher hot paths with regression checks.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000 100000] [--latency 0.02]
+    python benchmarks/suite.py --save-baseline        # record the current numbers
+    python benchmarks/suite.py --threshold 0.15       # compare against the baseline
+
+Throughput benchmarks stream a seeded synthetic corpus (10^3 to 10^7
+messages) through ``SymbolAnalyzer``; latency benchmarks run
+``collect_community_data`` and ``get_stock_prices`` against the local stub
+server; ranking benchmarks select the top 20 of 10^4 and 10^5 quotes,
+cold and after a small incremental update. Each benchmark keeps its best
+of ``--repeat`` runs. When a baseline file exists, results worse than it by
+more than ``--threshold`` are flagged and the script exits with status 1;
+a slowdown is ignored when the measured run time moved by less than
+``--min-delta`` seconds, so sub-millisecond benchmarks do not fail on
+scheduler noise.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from analyzer import SymbolAnalyzer
+from bench_ranking import build_engine
+from corpus import make_universe, stream_texts
+from market_data import MarketDataFetcher
+from rate_limit import TokenBucket
+from scraper import StockTwitsScraper
+from stub_server import StubStockTwitsServer
+from transport import Transport
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# Run-time changes smaller than this (seconds) are treated as noise
+DEFAULT_MIN_DELTA = 0.005
+RANKING_SIZES = [10_000, 100_000]
+
+
+class Result:
+    """One benchmark measurement."""
+
+    def __init__(self, name: str, value: float, unit: str, higher_is_better: bool,
+                 seconds: Optional[float] = None):
+        """Initialize the result.
+
+        Args:
+            name: Benchmark name
+            value: Reported value (a rate or a duration)
+            unit: Unit of ``value``
+            higher_is_better: Whether larger values are improvements
+            seconds: Wall-clock time of the measured run (``value`` itself
+                for durations), used for the noise floor
+        """
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.seconds = value if seconds is None and unit == 's' else seconds
+
+    def to_dict(self) -> Dict:
+        return {'value': self.value, 'unit': self.unit, 'higher_is_better': self.higher_is_better,
+                'seconds': self.seconds}
+
+
+def best_of(repeat: int, run: Callable[[], float]) -> float:
+    """Fastest wall-clock time of ``repeat`` calls to ``run`` (which returns seconds)."""
+    return min(run() for _ in range(repeat))
+
+
+def timed(func: Callable[[], object]) -> Callable[[], float]:
+    """Wrap ``func`` so calling it returns its wall-clock duration."""
+    def run() -> float:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    return run
+
+
+def analyzer_benchmarks(sizes: List[int], repeat: int, universe: List[str]) -> List[Result]:
+    """Messages/second for extract_symbols, analyze_mentions and get_statistics."""
+    engines = (('regex', SymbolAnalyzer()), ('trie', SymbolAnalyzer(universe=universe)))
+    results = []
+    for size in sizes:
+        for engine, analyzer in engines:
+            def extract():
+                texts = stream_texts(size, universe)
+                start = time.perf_counter()
+                for text in texts:
+                    analyzer.extract_symbols(text)
+                return time.perf_counter() - start
+
+            def analyze():
+                texts = stream_texts(size, universe)
+                return timed(lambda: analyzer.analyze_mentions(texts, top_n=10))()
+
+            def statistics():
+                texts = stream_texts(size, universe)
+                return timed(lambda: analyzer.get_statistics(texts))()
+
+            for method, run in (('extract_symbols', extract), ('analyze_mentions', analyze),
+                                ('get_statistics', statistics)):
+                seconds = best_of(repeat, run)
+                results.append(Result(f"analyzer.{method}[{engine},n={size}]",
+                                      size / seconds, 'msgs/s', higher_is_better=True, seconds=seconds))
+    return results
+
+
+def network_benchmarks(latency: float, repeat: int, num_symbols: int, workers: int) -> List[Result]:
+    """Wall-clock seconds for collect_community_data and get_stock_prices against the stub."""
+    results = []
+    with StubStockTwitsServer(latency=latency) as server:
+        for max_workers in (1, workers):
+            def collect():
+                scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=10_000.0, capacity=workers),
+                                            transport=Transport(max_retries=0))
+                scraper.BASE_URL = server.base_url
+                start = time.perf_counter()
+                data = scraper.collect_community_data(num_symbols=num_symbols, max_workers=max_workers)
+                elapsed = time.perf_counter() - start
+                scraper.transport.close()
+                assert len(data['symbols']) == num_symbols
+                return elapsed
+
+            seconds = best_of(repeat, collect)
+            results.append(Result(f"scraper.collect_community_data[symbols={num_symbols},workers={max_workers}]",
+                                  seconds, 's', higher_is_better=False))
+
+        symbols = server.symbols[:num_symbols]
+
+        def prices():
+            fetcher = MarketDataFetcher(api_key='bench', transport=Transport(max_retries=0),
+                                        rate_limiter=TokenBucket(rate=10_000.0, capacity=workers))
+            fetcher.FINNHUB_BASE_URL = server.quote_url
+            start = time.perf_counter()
+            quotes = fetcher.get_stock_prices(symbols, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            fetcher.transport.close()
+            assert len(quotes) == len(symbols)
+            return elapsed
+
+        seconds = best_of(repeat, prices)
+        results.append(Result(f"fetcher.get_stock_prices[symbols={num_symbols},workers={workers}]",
+                              seconds, 's', higher_is_better=False))
+    return results
+
+
+def ranking_benchmarks(repeat: int, k: int = 20, changed: int = 50) -> List[Result]:
+    """Seconds for a cold composite top-K and for re-ranking after a partial update."""
+    results = []
+    rng = np.random.default_rng(7)
+    for size in RANKING_SIZES:
+        engine = build_engine(size, rng)
+        symbols = engine.symbols
+
+        def cold():
+            engine.rescore()
+            engine.top(k)
+
+        def incremental():
+            rows = rng.integers(0, size, changed)
+            engine.update_many({'symbol': symbols[i], 'volume': float(rng.lognormal(13, 2))} for i in rows)
+            engine.top(k)
+
+        results.append(Result(f"ranking.top[n={size},k={k}]", best_of(repeat, timed(cold)),
+                              's', higher_is_better=False))
+        engine.top(k)
+        results.append(Result(f"ranking.update_top[n={size},k={k},changed={changed}]",
+                              best_of(repeat, timed(incremental)), 's', higher_is_better=False))
+    return results
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    """Load a saved baseline, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[Result]):
+    """Write results (with the machine they were measured on) as the new baseline."""
+    baseline = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count()},
+        'results': {r.name: r.to_dict() for r in results},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare(results: List[Result], baseline: Dict, threshold: float,
+            min_delta: float = DEFAULT_MIN_DELTA) -> List[Dict]:
+    """Relative change of each result against the baseline.
+
+    Args:
+        results: Current measurements
+        baseline: Loaded baseline file
+        threshold: Fractional slowdown tolerated before flagging (0.10 = 10%)
+        min_delta: Run-time change in seconds below which a slowdown is
+            noise (only applied when both sides recorded their run time)
+
+    Returns:
+        One row per result with 'name', 'baseline', 'value', 'change'
+        (positive means better) and 'regressed'
+    """
+    rows = []
+    for result in results:
+        reference = baseline.get('results', {}).get(result.name)
+        if reference is None or not reference['value']:
+            rows.append({'name': result.name, 'baseline': None, 'value': result.value,
+                         'change': None, 'regressed': False})
+            continue
+        ratio = result.value / reference['value']
+        change = ratio - 1 if result.higher_is_better else 1 / ratio - 1
+        regressed = change < -threshold
+        if regressed and result.seconds is not None and reference.get('seconds') is not None:
+            regressed = result.seconds - reference['seconds'] >= min_delta
+        rows.append({'name': result.name, 'baseline': reference['value'], 'value': result.value,
+                     'change': change, 'regressed': regressed})
+    return rows
+
+
+def report(results: List[Result], rows: Optional[List[Dict]]):
+    """Print the results table, with baseline deltas when available."""
+    width = max(len(r.name) for r in results)
+    print(f"{'Benchmark':<{width}} {'Value':>14} {'Unit':<7} {'Baseline':>14} {'Change':>8}")
+    print("-" * (width + 47))
+    for index, result in enumerate(results):
+        row = rows[index] if rows else None
+        baseline = f"{row['baseline']:>14,.3f}" if row and row['baseline'] is not None else f"{'-':>14}"
+        change = f"{row['change']:>+7.1%}" if row and row['change'] is not None else f"{'-':>7}"
+        flag = ' REGRESSION' if row and row['regressed'] else ''
+        print(f"{result.name:<{width}} {result.value:>14,.3f} {result.unit:<7} {baseline} {change}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; returns the process exit status (1 on regressions)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Corpus sizes in messages (up to 10000000)')
+    parser.add_argument('--universe', type=int, default=5000, help='Ticker universe size')
+    parser.add_argument('--latency', type=float, default=0.02, help='Stub latency in seconds')
+    parser.add_argument('--symbols', type=int, default=20, help='Symbols per network benchmark')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent in-flight limit')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per benchmark (best is kept)')
+    parser.add_argument('--only', choices=['analyzer', 'network', 'ranking'], help='Run one group only')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Overwrite the baseline with this run')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Fractional slowdown that counts as a regression')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help='Ignore slowdowns whose run time grew by less than this many seconds')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = []
+    if args.only in (None, 'analyzer'):
+        results += analyzer_benchmarks(args.sizes, args.repeat, make_universe(args.universe))
+    if args.only in (None, 'network'):
+        results += network_benchmarks(args.latency, args.repeat, args.symbols, args.workers)
+    if args.only in (None, 'ranking'):
+        results += ranking_benchmarks(args.repeat)
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold, args.min_delta) if baseline else None
+    report(results, rows)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+    else:
+        regressions = [row['name'] for row in rows if row['regressed']]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
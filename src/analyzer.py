@@ -2,9 +2,12 @@
 
 import re
 from collections import Counter
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional
 import logging
 
+from heavy_hitters import SpaceSaving
+from symbol_matcher import SymbolMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,15 +32,22 @@ class SymbolAnalyzer:
         'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'
     }
     
-    def __init__(self, min_length: int = 1, max_length: int = 4):
+    def __init__(self, min_length: int = 1, max_length: int = 4,
+                 universe: Optional[Iterable[str]] = None):
         """Initialize the analyzer.
         
         Args:
-            min_length: Minimum symbol length
-            max_length: Maximum symbol length
+            min_length: Minimum symbol length (regex engine only)
+            max_length: Maximum symbol length (regex engine only)
+            universe: Known ticker symbols; when given, extraction uses a
+                SymbolMatcher over this universe instead of the regex
         """
         self.min_length = min_length
         self.max_length = max_length
+        self.matcher = (
+            SymbolMatcher(universe, stop_words=self.COMMON_WORDS)
+            if universe is not None else None
+        )
     
     def extract_symbols(self, text: str) -> List[str]:
         """Extract potential stock symbols from text.
@@ -51,6 +61,9 @@ class SymbolAnalyzer:
         if not text:
             return []
         
+        if self.matcher is not None:
+            return self.matcher.find(text)
+        
         matches = self.SYMBOL_PATTERN.findall(text)
         # Filter out common words and respect length constraints
         symbols = [
@@ -60,47 +73,139 @@ class SymbolAnalyzer:
         ]
         return symbols
     
-    def analyze_mentions(self, texts: List[str], top_n: int = 10) -> List[Tuple[str, int]]:
+    def count_mentions(self, texts: Iterable[str]) -> 'MentionCounter':
+        """Count symbol mentions over texts in a single streaming pass.
+        
+        Args:
+            texts: Iterable (or generator) of texts to analyze
+            
+        Returns:
+            MentionCounter holding the per-symbol counts and running totals
+        """
+        counter = MentionCounter(self)
+        counter.update(texts)
+        return counter
+    
+    def analyze_mentions(self, texts: Iterable[str], top_n: int = 10,
+                         capacity: Optional[int] = None) -> List[Tuple[str, int]]:
         """Analyze symbol mentions across multiple texts.
         
         Args:
-            texts: List of texts to analyze
+            texts: Texts to analyze (any iterable, consumed once)
             top_n: Number of top symbols to return
+            capacity: If given, count approximately with a fixed-memory
+                Space-Saving summary tracking at most this many symbols
+                (counts may overestimate by at most mentions / capacity)
             
         Returns:
             List of (symbol, count) tuples sorted by frequency
         """
-        all_symbols = []
+        if capacity is not None:
+            return self.approximate_mentions(texts, capacity).most_common(top_n)
+        return self.count_mentions(texts).most_common(top_n)
+    
+    def approximate_mentions(self, texts: Iterable[str], capacity: int = 1000) -> SpaceSaving:
+        """Summarize symbol mentions in bounded memory.
         
+        Args:
+            texts: Texts to analyze (any iterable, consumed once)
+            capacity: Maximum number of symbols tracked
+            
+        Returns:
+            Mergeable SpaceSaving summary of the mentions
+        """
+        summary = SpaceSaving(capacity)
         for text in texts:
-            symbols = self.extract_symbols(text)
-            all_symbols.extend(symbols)
-        
-        if not all_symbols:
-            return []
-        
-        counter = Counter(all_symbols)
-        return counter.most_common(top_n)
+            summary.update(self.extract_symbols(text))
+        return summary
     
-    def get_statistics(self, texts: List[str]) -> Dict:
+    def get_statistics(self, texts: Iterable[str]) -> Dict:
         """Get statistics about symbol mentions.
         
         Args:
-            texts: List of texts to analyze
+            texts: Texts to analyze (any iterable, consumed once)
             
         Returns:
             Dictionary with analysis statistics
         """
-        all_symbols = []
+        return self.count_mentions(texts).statistics()
+
+
+class MentionCounter:
+    """Incremental symbol mention counter.
+    
+    Texts are consumed once and only per-symbol counts plus running totals
+    are kept, so memory grows with the number of distinct symbols rather
+    than the number of mentions. Both the top-N list and the statistics
+    dict are served from the same counts without re-scanning.
+    """
+    
+    def __init__(self, analyzer: Optional[SymbolAnalyzer] = None):
+        """Initialize the counter.
+        
+        Args:
+            analyzer: Analyzer used for symbol extraction (default settings if omitted)
+        """
+        self.analyzer = analyzer or SymbolAnalyzer()
+        self.counts: Counter = Counter()
+        self.total_mentions = 0
+        self.total_texts = 0
+    
+    def update(self, texts: Iterable[str]) -> 'MentionCounter':
+        """Consume a batch (or stream) of texts.
+        
+        Args:
+            texts: Iterable of texts; generators are consumed lazily
+            
+        Returns:
+            self, to allow chaining
+        """
+        extract = self.analyzer.extract_symbols
+        counts = self.counts
         for text in texts:
-            symbols = self.extract_symbols(text)
-            all_symbols.extend(symbols)
+            symbols = extract(text)
+            counts.update(symbols)
+            self.total_mentions += len(symbols)
+            self.total_texts += 1
+        return self
+    
+    def merge(self, other: 'MentionCounter') -> 'MentionCounter':
+        """Fold another counter's counts and totals into this one.
         
-        unique_symbols = set(all_symbols)
+        Merging partial counters in input order reproduces the serial
+        result exactly, including the order of tied symbols.
+        
+        Args:
+            other: Counter built over a different part of the input
+            
+        Returns:
+            self, to allow chaining
+        """
+        self.counts.update(other.counts)
+        self.total_mentions += other.total_mentions
+        self.total_texts += other.total_texts
+        return self
+    
+    def most_common(self, top_n: int = 10) -> List[Tuple[str, int]]:
+        """Top symbols by mention count.
         
+        Args:
+            top_n: Number of top symbols to return
+            
+        Returns:
+            List of (symbol, count) tuples sorted by frequency
+        """
+        return self.counts.most_common(top_n)
+    
+    def statistics(self) -> Dict:
+        """Statistics about the mentions seen so far.
+        
+        Returns:
+            Dictionary with analysis statistics
+        """
         return {
-            'total_mentions': len(all_symbols),
-            'unique_symbols': len(unique_symbols),
-            'average_mentions_per_text': len(all_symbols) / len(texts) if texts else 0,
-            'most_common': Counter(all_symbols).most_common(5) if all_symbols else []
+            'total_mentions': self.total_mentions,
+            'unique_symbols': len(self.counts),
+            'average_mentions_per_text': self.total_mentions / self.total_texts if self.total_texts else 0,
+            'most_common': self.counts.most_common(5)
         }
@@ -0,0 +1,379 @@
+"""Unified command line for the StockTwits pipeline.
+
+Usage:
+    python src/cli.py movers
+    python src/cli.py export [--output PATH] [--ttl-hours 24] [--export-dir DIR]
+    python src/cli.py snapshot --output-dir DIR [--formats csv jsonl parquet]
+    python src/cli.py collect [--symbols 20] [--workers 4] [--output messages.jsonl]
+    python src/cli.py analyze messages.jsonl [--top 10] [--universe tickers.txt]
+    python src/cli.py sentiment messages.jsonl [--window-minutes 60]
+    python src/cli.py universe master.csv tickers.idx [--lookup AAPL ...]
+    python src/cli.py rank quotes.jsonl [--weight volume=1 mentions=0.5] [--mentions messages.jsonl]
+    python src/cli.py run [--daemon] [--interval 60]
+
+Any subcommand accepts ``--record traffic.jsonl.gz`` to capture its HTTP
+traffic, ``--replay traffic.jsonl.gz`` to run offline against a capture and
+``--cache responses.db`` to keep an on-disk HTTP response cache across runs.
+
+Only argparse is imported up front; each subcommand imports the modules it
+needs (requests, numpy, the scraper...) when it runs, so ``--help`` and
+scheduler health checks start quickly.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Mirrors exporters.EXPORTERS, kept here so parsing imports nothing heavy
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def configure_logging(level: str = 'INFO'):
+    """Configure root logging once, at program start rather than on import."""
+    import logging
+    logging.basicConfig(level=getattr(logging, level.upper()), format=LOG_FORMAT)
+
+
+def cmd_movers(args) -> bool:
+    """Display the most active stocks, gainers and losers."""
+    from market_movers import display_market_movers
+    display_market_movers()
+    return True
+
+
+def cmd_export(args) -> bool:
+    """Export the most active symbols and trigger the automation."""
+    from export_stocks import OUTPUT_PATH, extract_and_save_stocks
+    return extract_and_save_stocks(
+        args.output or OUTPUT_PATH,
+        launch_command=args.launch,
+        analysis_ttl_hours=args.ttl_hours,
+        export_dir=args.export_dir,
+        export_formats=args.formats,
+    )
+
+
+def cmd_snapshot(args) -> bool:
+    """Export the current market snapshot's quotes to data files."""
+    from exporters import export_snapshot
+    from market_data import MarketDataFetcher
+
+    fetcher = MarketDataFetcher()
+    try:
+        snapshot = fetcher.get_snapshot()
+    finally:
+        fetcher.close()
+    if snapshot is None:
+        print("✗ No market snapshot available", file=sys.stderr)
+        return False
+    try:
+        paths = export_snapshot(snapshot, args.output_dir, args.formats, args.basename)
+    except ImportError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return False
+    for fmt, path in paths.items():
+        print(f"✓ {fmt:<8} {path}")
+    return True
+
+
+def cmd_collect(args) -> bool:
+    """Collect recent posts for the trending symbols as JSON lines."""
+    import json
+    from rate_limit import TokenBucket
+    from scraper import StockTwitsScraper
+
+    seen = None
+    if args.seen_file:
+        from dedup import SeenSet
+        seen = SeenSet(args.seen_file, ttl=args.seen_ttl_hours * 3600)
+    universe = None
+    if args.universe:
+        from universe import TickerUniverse
+        universe = TickerUniverse(args.universe)
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=args.rate, capacity=max(1, args.workers)),
+                                seen=seen, universe=universe)
+    try:
+        data = scraper.collect_community_data(num_symbols=args.symbols, max_workers=args.workers)
+    finally:
+        scraper.close()
+        if universe is not None:
+            universe.close()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for message in data['messages']:
+            out.write(json.dumps(message) + '\n')
+    finally:
+        if args.output:
+            out.close()
+    print(f"✓ Collected {len(data['messages'])} messages for {len(data['symbols'])} symbols",
+          file=sys.stderr)
+    if seen is not None:
+        report = seen.report()
+        print(f"✓ Skipped {report['duplicates']:,} duplicates (dedup rate {report['dedup_rate']:.1%})",
+              file=sys.stderr)
+    return bool(data['symbols'])
+
+
+def cmd_analyze(args) -> bool:
+    """Count symbol mentions in a text or JSON-lines corpus."""
+    from analyzer import SymbolAnalyzer
+    from parallel import iter_file_messages, parallel_count_file
+    from symbol_matcher import load_universe
+
+    universe = load_universe(args.universe) if args.universe else None
+    analyzer = SymbolAnalyzer(universe=universe)
+    if hasattr(universe, 'close'):
+        # A compiled index is only read while the matcher builds its trie
+        universe.close()
+    if args.workers > 1:
+        counter = parallel_count_file(args.corpus, workers=args.workers, analyzer=analyzer)
+    else:
+        counter = analyzer.count_mentions(iter_file_messages(args.corpus))
+
+    stats = counter.statistics()
+    print(f"{'Rank':<6} {'Symbol':<10} {'Mentions':>10}")
+    print("-" * 28)
+    for rank, (symbol, count) in enumerate(counter.most_common(args.top), 1):
+        print(f"{rank:<6} {symbol:<10} {count:>10,}")
+    print(f"\n✓ {stats['total_mentions']:,} mentions of {stats['unique_symbols']:,} symbols "
+          f"in {counter.total_texts:,} messages")
+    return True
+
+
+def _format(value: float, spec: str) -> str:
+    """Format a number, showing '-' for NaN."""
+    return '-' if value != value else format(value, spec)
+
+
+def cmd_sentiment(args) -> bool:
+    """Aggregate per-symbol sentiment from a JSON-lines corpus."""
+    import json
+    from sentiment import aggregate_sentiment
+
+    with open(args.corpus, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    table = aggregate_sentiment(records, window_seconds=args.window_minutes * 60).head(args.top)
+
+    print(f"{'Symbol':<10} {'Msgs':>6} {'Bull %':>7} {'Bear %':>7} {'Msgs/h':>8} {'Momentum':>9}")
+    print("-" * 52)
+    for row in table.itertuples():
+        print(f"{row.Index:<10} {row.messages:>6} {_format(row.bullish_ratio, '.0%'):>7} "
+              f"{_format(row.bearish_ratio, '.0%'):>7} {row.velocity:>8.1f} {_format(row.momentum, '+.2f'):>9}")
+    print(f"\n✓ Sentiment for {len(table)} symbols from {len(records):,} messages")
+    return True
+
+
+def cmd_universe(args) -> bool:
+    """Compile a ticker master list into a memory-mapped index."""
+    from universe import TickerUniverse, compile_universe
+
+    count = compile_universe(args.source, args.output)
+    print(f"✓ Compiled {count:,} symbols into {args.output}")
+    if args.lookup:
+        with TickerUniverse(args.output) as universe:
+            for symbol in args.lookup:
+                info = universe.lookup(symbol)
+                if info is None:
+                    print(f"{symbol.upper():<10} not listed")
+                else:
+                    print(f"{info.symbol:<10} {info.exchange:<8} {info.type:<8} {info.name}")
+    return count > 0
+
+
+def _parse_weights(pairs: List[str]) -> dict:
+    """Parse ``feature=weight`` arguments."""
+    weights = {}
+    for pair in pairs:
+        feature, _, weight = pair.partition('=')
+        try:
+            weights[feature] = float(weight)
+        except ValueError:
+            raise SystemExit(f"Invalid weight {pair!r}; expected FEATURE=NUMBER")
+    return weights
+
+
+def cmd_rank(args) -> bool:
+    """Rank a quote file by a composite score or a single field."""
+    import csv
+    import json
+    from collections import Counter
+    from ranking import rank_quotes
+
+    with open(args.quotes, newline='', encoding='utf-8') as f:
+        if args.quotes.endswith('.csv'):
+            quotes = list(csv.DictReader(f))
+        else:
+            quotes = [json.loads(line) for line in f if line.strip()]
+    mentions = None
+    if args.mentions:
+        with open(args.mentions, encoding='utf-8') as f:
+            mentions = Counter(json.loads(line).get('symbol') for line in f if line.strip())
+    weights = _parse_weights(args.weight) if args.weight else None
+    try:
+        ranked = rank_quotes(quotes, k=args.top, weights=weights, mentions=mentions,
+                             by=args.by, descending=not args.ascending)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return False
+
+    print(f"{'Rank':<6} {'Symbol':<8} {'Score':>9}")
+    print("-" * 25)
+    for rank, quote in enumerate(ranked, 1):
+        print(f"{rank:<6} {quote['symbol']:<8} {quote['score']:>9.3f}")
+    print(f"\n✓ Ranked {len(quotes):,} quotes")
+    return True
+
+
+def cmd_run(args) -> bool:
+    """Run the full fetch-and-export pipeline once, or as a daemon."""
+    import main
+    if args.daemon:
+        return main.run_daemon(args.interval, market_hours=not args.ignore_market_hours)
+    return main.main()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (no subsystem is imported here)."""
+    # Shared options live on every subcommand so they can follow its name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    common.add_argument('--metrics', metavar='PATH',
+                        help='Record timings and HTTP metrics to PATH (.prom for Prometheus text, else JSON lines)')
+    common.add_argument('--profile-dir', metavar='DIR', help='Dump a cProfile file per stage into DIR')
+    common.add_argument('--trace-memory', action='store_true', help='Record peak memory per stage (tracemalloc)')
+    common.add_argument('--cache', metavar='PATH',
+                        help='Cache HTTP responses in the SQLite database PATH (ignored with --replay)')
+    common.add_argument('--record', metavar='PATH', help='Append all HTTP traffic to PATH (gzip JSON lines)')
+    common.add_argument('--replay', nargs='+', metavar='PATH',
+                        help='Answer HTTP requests from these recordings instead of the network')
+    common.add_argument('--replay-speed', type=float, metavar='X',
+                        help='Pace replay at X times the recorded speed (default: as fast as possible)')
+
+    parser = argparse.ArgumentParser(prog='stocktwits', description="StockTwits Most Active Equities Analyzer")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    movers = commands.add_parser('movers', help='Display most active stocks and market movers',
+                                 parents=[common])
+    movers.set_defaults(handler=cmd_movers)
+
+    export = commands.add_parser('export', help='Export new most-active symbols and trigger the automation',
+                                 parents=[common])
+    export.add_argument('--output', metavar='PATH', help='Symbol file (defaults to the DesktopAuto input file)')
+    export.add_argument('--ttl-hours', type=float, default=24.0, help='Skip symbols analyzed within this many hours')
+    export.add_argument('--launch', nargs='+', metavar='ARG', help='Automation command (defaults to DesktopAuto.exe)')
+    export.add_argument('--export-dir', metavar='DIR', help='Also write the full snapshot to data files in DIR')
+    export.add_argument('--formats', nargs='+', default=['csv', 'jsonl'], choices=EXPORT_FORMATS,
+                        help='Data file formats for --export-dir')
+    export.set_defaults(handler=cmd_export)
+
+    snapshot = commands.add_parser('snapshot', help='Export the current snapshot to CSV/JSON lines/Parquet',
+                                   parents=[common])
+    snapshot.add_argument('--output-dir', metavar='DIR', default='.', help='Directory for the data files')
+    snapshot.add_argument('--formats', nargs='+', default=['csv', 'jsonl'], choices=EXPORT_FORMATS,
+                          help='File formats (parquet needs pyarrow)')
+    snapshot.add_argument('--basename', help='File name without extension (default: snapshot_<timestamp>)')
+    snapshot.set_defaults(handler=cmd_snapshot)
+
+    collect = commands.add_parser('collect', help='Collect recent posts for trending symbols as JSON lines',
+                                  parents=[common])
+    collect.add_argument('--symbols', type=int, default=20, help='Number of trending symbols')
+    collect.add_argument('--workers', type=int, default=1, help='Concurrent symbol requests')
+    collect.add_argument('--rate', type=float, default=2.0, help='Request rate limit (requests/second)')
+    collect.add_argument('--output', metavar='PATH', help='JSON-lines file (stdout if omitted)')
+    collect.add_argument('--seen-file', metavar='PATH', help='Remember collected message ids here to skip repeats')
+    collect.add_argument('--seen-ttl-hours', type=float, default=48.0, help='How long a message id is remembered')
+    collect.add_argument('--universe', metavar='PATH', help='Compiled ticker index; skip symbols it does not list')
+    collect.set_defaults(handler=cmd_collect)
+
+    analyze = commands.add_parser('analyze', help='Count symbol mentions in a corpus file',
+                                  parents=[common])
+    analyze.add_argument('corpus', help='Text file (one message per line) or .jsonl from collect')
+    analyze.add_argument('--top', type=int, default=10, help='Number of symbols to list')
+    analyze.add_argument('--universe', metavar='PATH',
+                         help='Ticker universe (symbol list, CSV or compiled index) for trie matching')
+    analyze.add_argument('--workers', type=int, default=1, help='Worker processes')
+    analyze.set_defaults(handler=cmd_analyze)
+
+    sentiment = commands.add_parser('sentiment', help='Aggregate per-symbol sentiment from collected messages',
+                                    parents=[common])
+    sentiment.add_argument('corpus', help='.jsonl file written by collect')
+    sentiment.add_argument('--window-minutes', type=float, default=60.0, help='Recent window for velocity/momentum')
+    sentiment.add_argument('--top', type=int, default=20, help='Number of symbols to list')
+    sentiment.set_defaults(handler=cmd_sentiment)
+
+    universe = commands.add_parser('universe', help='Compile a ticker master list into a memory-mapped index',
+                                   parents=[common])
+    universe.add_argument('source', help='Master-list CSV with symbol, name, exchange and type columns')
+    universe.add_argument('output', help='Index file to write')
+    universe.add_argument('--lookup', nargs='+', metavar='SYMBOL', help='Print metadata for these symbols afterwards')
+    universe.set_defaults(handler=cmd_universe)
+
+    rank = commands.add_parser('rank', help='Rank quotes by volume, change, relative volume and mentions',
+                               parents=[common])
+    rank.add_argument('quotes', help='Quote file (.jsonl or .csv, e.g. from snapshot)')
+    rank.add_argument('--top', type=int, default=10, help='Number of symbols to list')
+    rank.add_argument('--weight', nargs='+', metavar='FEATURE=W',
+                      help='Composite weights over volume, change_pct, abs_change_pct, relative_volume, mentions')
+    rank.add_argument('--by', metavar='FEATURE', help='Rank by one feature instead of the composite score')
+    rank.add_argument('--ascending', action='store_true', help='With --by, smallest first (e.g. losers)')
+    rank.add_argument('--mentions', metavar='PATH', help='Messages .jsonl from collect, for mention counts')
+    rank.set_defaults(handler=cmd_rank)
+
+    run = commands.add_parser('run', help='Run the fetch-and-export pipeline',
+                              parents=[common])
+    run.add_argument('--daemon', action='store_true', help='Keep running and poll on a schedule')
+    run.add_argument('--interval', type=float, default=60.0, help='Seconds between polls in daemon mode')
+    run.add_argument('--ignore-market-hours', action='store_true', help='Poll outside the regular session too')
+    run.set_defaults(handler=cmd_run)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments and run a subcommand.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit status
+    """
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+
+    registry = None
+    if args.metrics or args.profile_dir or args.trace_memory:
+        from metrics import get_registry
+        registry = get_registry()
+        registry.enable(profile_dir=args.profile_dir, trace_memory=args.trace_memory)
+
+    transport = None
+    cache = None
+    if args.record or args.replay or args.cache:
+        from transport import Transport, set_shared_transport
+        replay = None
+        if args.replay:
+            from recording import ReplayAdapter
+            replay = ReplayAdapter(args.replay, speed=args.replay_speed)
+        elif args.cache:
+            from http_cache import ResponseCache
+            cache = ResponseCache(args.cache)
+        transport = Transport(cache=cache, record_path=args.record, replay=replay)
+        set_shared_transport(transport)
+
+    try:
+        success = args.handler(args)
+    finally:
+        if transport is not None:
+            transport.close()
+        if cache is not None:
+            cache.close()
+        if registry is not None and args.metrics:
+            registry.write(args.metrics)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
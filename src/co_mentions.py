@@ -0,0 +1,167 @@
+"""Incremental sparse co-mention graph of stock symbols."""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from analyzer import SymbolAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class CoMentionGraph:
+    """Counts how often pairs of symbols are mentioned in the same message.
+
+    Symbols get dense integer ids on first sight and each symbol keeps a
+    sparse row ``{neighbor id: count}``, so memory grows with the number of
+    observed pairs rather than the square of the universe. A small set of
+    the heaviest pairs is maintained as counts grow: every pair outside it
+    has a count no greater than its minimum, so the strongest-pairs query
+    normally reads only that set instead of rescanning the matrix.
+    """
+
+    def __init__(self, analyzer: Optional[SymbolAnalyzer] = None, top_capacity: int = 256):
+        """Initialize the graph.
+
+        Args:
+            analyzer: Analyzer used for symbol extraction from texts
+            top_capacity: Number of heaviest pairs tracked for ``strongest_pairs``
+        """
+        if top_capacity <= 0:
+            raise ValueError("top_capacity must be positive")
+        self.analyzer = analyzer or SymbolAnalyzer()
+        self.top_capacity = top_capacity
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._rows: List[Dict[int, int]] = []
+        self._mentions: List[int] = []
+        self._top: Dict[Tuple[int, int], int] = {}
+        self._top_min = 0
+        self.num_pairs = 0
+        self.total_messages = 0
+
+    def _id(self, symbol: str) -> int:
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+            self._rows.append({})
+            self._mentions.append(0)
+        return symbol_id
+
+    def add_symbols(self, symbols: Iterable[str]):
+        """Record one message's symbols (repeats within a message count once).
+
+        Args:
+            symbols: Symbols mentioned together
+        """
+        ids = sorted({self._id(s) for s in symbols})
+        self.total_messages += 1
+        rows = self._rows
+        for index, a in enumerate(ids):
+            self._mentions[a] += 1
+            row_a = rows[a]
+            for b in ids[index + 1:]:
+                count = row_a.get(b, 0) + 1
+                if count == 1:
+                    self.num_pairs += 1
+                row_a[b] = count
+                rows[b][a] = count
+                self._track(a, b, count)
+
+    def _track(self, a: int, b: int, count: int):
+        """Keep ``_top`` holding the heaviest pairs as ``(a, b)`` reaches ``count``.
+
+        ``_top_min`` is a lower bound on the smallest tracked count; it is
+        only made exact (an O(top_capacity) scan) when a pair outside the
+        set rises above it.
+        """
+        top = self._top
+        pair = (a, b)
+        if pair in top or len(top) < self.top_capacity:
+            top[pair] = count
+            return
+        if count <= self._top_min:
+            return
+        weakest = min(top, key=top.__getitem__)
+        if count > top[weakest]:
+            del top[weakest]
+            top[pair] = count
+            weakest = min(top, key=top.__getitem__)
+        self._top_min = top[weakest]
+
+    def add_text(self, text: str):
+        """Extract the symbols from one message and record them."""
+        self.add_symbols(self.analyzer.extract_symbols(text))
+
+    def update(self, texts: Iterable[str]) -> 'CoMentionGraph':
+        """Consume a batch (or stream) of message texts.
+
+        Args:
+            texts: Iterable of texts; generators are consumed lazily
+
+        Returns:
+            self, to allow chaining
+        """
+        for text in texts:
+            self.add_text(text)
+        return self
+
+    def weight(self, a: str, b: str) -> int:
+        """Number of messages mentioning both symbols."""
+        if a not in self._ids or b not in self._ids:
+            return 0
+        return self._rows[self._ids[a]].get(self._ids[b], 0)
+
+    def mentions(self, symbol: str) -> int:
+        """Number of messages mentioning a symbol."""
+        symbol_id = self._ids.get(symbol)
+        return self._mentions[symbol_id] if symbol_id is not None else 0
+
+    def related(self, symbol: str, n: int = 10) -> List[Tuple[str, int]]:
+        """Symbols most often mentioned alongside ``symbol``.
+
+        Args:
+            symbol: Symbol to look up
+            n: Number of neighbors to return
+
+        Returns:
+            List of (symbol, co-mention count), strongest first
+        """
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            return []
+        names = self._symbols
+        best = heapq.nsmallest(n, self._rows[symbol_id].items(), key=lambda item: (-item[1], names[item[0]]))
+        return [(names[other], count) for other, count in best]
+
+    def strongest_pairs(self, n: int = 10) -> List[Tuple[str, str, int]]:
+        """Most frequently co-mentioned pairs overall.
+
+        Served from the tracked top pairs; a full scan is needed only when
+        ``n`` exceeds ``top_capacity`` or the answer reaches the weakest
+        tracked count, where untracked pairs may tie.
+
+        Args:
+            n: Number of pairs to return
+
+        Returns:
+            List of (symbol, symbol, count), strongest first
+        """
+        names = self._symbols
+        key = lambda item: (-item[1], names[item[0][0]], names[item[0][1]])
+        best = heapq.nsmallest(n, self._top.items(), key=key)
+        # Untracked pairs can at most tie the weakest tracked count, so the
+        # tracked set is exact unless the answer reaches down to that count
+        if len(self._top) == self.top_capacity and best and (
+                n > self.top_capacity or best[-1][1] <= min(self._top.values())):
+            pairs = (((a, b), count) for a, row in enumerate(self._rows) for b, count in row.items() if a < b)
+            best = heapq.nsmallest(n, pairs, key=key)
+        return [(names[a], names[b], count) for (a, b), count in best]
+
+    def __len__(self) -> int:
+        """Number of distinct symbols seen."""
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
@@ -0,0 +1,89 @@
+"""Persisted per-symbol message cursors for incremental StockTwits reads."""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CursorStore:
+    """JSON file mapping each symbol to the newest and oldest message ids seen.
+
+    ``newest`` lets an incremental poll ask only for messages after it;
+    ``oldest`` lets a backfill resume below the deepest page already read.
+    ``gap`` is the id range a page-capped poll skipped over, which later
+    polls read before moving on.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the store.
+
+        Args:
+            path: JSON file to load from and save to (in-memory only if omitted)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._cursors: Dict[str, Dict] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._cursors = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cursor file {path}: {e}")
+
+    def newest(self, symbol: str) -> Optional[int]:
+        """Id of the newest message seen for a symbol."""
+        return self._cursors.get(symbol, {}).get('newest')
+
+    def oldest(self, symbol: str) -> Optional[int]:
+        """Id of the oldest message read for a symbol."""
+        return self._cursors.get(symbol, {}).get('oldest')
+
+    def gap(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """Unread id range ``(after, through]`` left by a page-capped poll, if any."""
+        gap = self._cursors.get(symbol, {}).get('gap')
+        return tuple(gap) if gap else None
+
+    def set_gap(self, symbol: str, gap: Optional[Tuple[int, int]]):
+        """Replace a symbol's unread id range (None once it has been read) and persist it."""
+        with self._lock:
+            cursor = self._cursors.setdefault(symbol, {})
+            if gap is None:
+                cursor.pop('gap', None)
+            else:
+                cursor['gap'] = list(gap)
+            self._save()
+
+    def record(self, symbol: str, newest: Optional[int] = None, oldest: Optional[int] = None):
+        """Widen a symbol's cursor range and persist it.
+
+        Args:
+            symbol: Stock symbol
+            newest: Newest message id observed
+            oldest: Oldest message id observed
+        """
+        with self._lock:
+            cursor = self._cursors.setdefault(symbol, {})
+            if newest is not None and newest > cursor.get('newest', -1):
+                cursor['newest'] = newest
+            if oldest is not None and ('oldest' not in cursor or oldest < cursor['oldest']):
+                cursor['oldest'] = oldest
+            self._save()
+
+    def _save(self):
+        """Atomically write the cursors to disk (lock held)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._cursors, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,163 @@
+"""Long-running, market-hours-aware polling mode for the main pipeline."""
+
+import signal
+import threading
+from datetime import datetime, time as dt_time, timedelta, timezone, tzinfo
+from typing import Callable, Iterable, Optional, Set
+import logging
+
+from market_data import MarketDataFetcher, MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _eastern() -> tzinfo:
+    """US/Eastern time zone (fixed UTC-5 if the tz database is unavailable)."""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo('America/New_York')
+    except Exception:
+        logger.warning("Time zone database unavailable; assuming UTC-5 for market hours")
+        return timezone(timedelta(hours=-5))
+
+
+class MarketHours:
+    """Regular trading session (default 9:30-16:00 US/Eastern, Monday-Friday)."""
+
+    def __init__(self, open_time: dt_time = dt_time(9, 30), close_time: dt_time = dt_time(16, 0),
+                 tz: Optional[tzinfo] = None, weekdays: Iterable[int] = range(5)):
+        """Initialize the session.
+
+        Args:
+            open_time: Session open (local to ``tz``)
+            close_time: Session close (local to ``tz``)
+            tz: Exchange time zone (US/Eastern if omitted)
+            weekdays: Trading weekdays (Monday is 0)
+        """
+        self.open_time = open_time
+        self.close_time = close_time
+        self.tz = tz or _eastern()
+        self.weekdays = frozenset(weekdays)
+
+    def is_open(self, when: datetime) -> bool:
+        """Check whether the session is open at ``when`` (timezone-aware)."""
+        local = when.astimezone(self.tz)
+        return (local.weekday() in self.weekdays
+                and self.open_time <= local.time() < self.close_time)
+
+    def seconds_until_open(self, when: datetime) -> float:
+        """Seconds from ``when`` until the next session open (0 if open now)."""
+        if self.is_open(when):
+            return 0.0
+        local = when.astimezone(self.tz)
+        candidate = local.replace(hour=self.open_time.hour, minute=self.open_time.minute,
+                                  second=0, microsecond=0)
+        if candidate <= local:
+            candidate += timedelta(days=1)
+        while candidate.weekday() not in self.weekdays:
+            candidate += timedelta(days=1)
+        # Compare absolute times so a DST change in between is accounted for
+        return candidate.timestamp() - local.timestamp()
+
+
+class PipelineDaemon:
+    """Keeps one fetcher (and its pooled connections) warm and polls on a schedule.
+
+    Each cycle refreshes the market snapshot; the export step runs only when
+    the set of most-active symbols differs from the last exported set.
+    Outside market hours the daemon sleeps until the next open. SIGTERM and
+    SIGINT finish the current cycle and exit cleanly.
+    """
+
+    def __init__(self, export: Callable[[MarketSnapshot], bool],
+                 fetcher: Optional[MarketDataFetcher] = None, interval: float = 60.0,
+                 hours: Optional[MarketHours] = None, limit: int = 10,
+                 on_snapshot: Optional[Callable[[MarketSnapshot], None]] = None,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """Initialize the daemon.
+
+        Args:
+            export: Called with the snapshot when the most-active set changes;
+                returns True on success
+            fetcher: Long-lived fetcher (created if omitted)
+            interval: Seconds between polls during market hours
+            hours: Trading session to poll in (None polls around the clock)
+            limit: Size of the most-active list that is compared and exported
+            on_snapshot: Optional hook called with every fresh snapshot
+            clock: Returns the current timezone-aware time
+        """
+        self.export = export
+        self.fetcher = fetcher or MarketDataFetcher(snapshot_ttl=0)
+        self.interval = interval
+        self.hours = hours
+        self.limit = limit
+        self.on_snapshot = on_snapshot
+        self._clock = clock
+        self._stop = threading.Event()
+        self._last_symbols: Optional[Set[str]] = None
+        self.cycles = 0
+        self.exports = 0
+
+    def install_signal_handlers(self):
+        """Stop gracefully on SIGTERM/SIGINT (call from the main thread)."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda received, frame: self.stop())
+
+    def stop(self):
+        """Ask the loop to exit after the current cycle."""
+        logger.info("Shutdown requested")
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run_once(self) -> bool:
+        """Poll once and export if the most-active set changed.
+
+        Returns:
+            True if the export step ran
+        """
+        self.cycles += 1
+        snapshot = self.fetcher.refresh_snapshot()
+        if snapshot is None:
+            logger.warning("No snapshot this cycle")
+            return False
+        if self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
+
+        symbols = {s.get('symbol') for s in snapshot.most_active(self.limit) or []}
+        if symbols == self._last_symbols:
+            logger.info("Most-active set unchanged; skipping export")
+            return False
+
+        added = sorted(symbols - (self._last_symbols or set()))
+        logger.info(f"Most-active set changed (+{added}); running export")
+        if self.export(snapshot):
+            self._last_symbols = symbols
+            self.exports += 1
+        return True
+
+    def run(self, max_cycles: Optional[int] = None):
+        """Poll until stopped (or for ``max_cycles`` polls).
+
+        Args:
+            max_cycles: Optional cap on polls, mainly for testing
+        """
+        logger.info(f"Daemon started (interval {self.interval:g}s)")
+        try:
+            while not self.stopped and (max_cycles is None or self.cycles < max_cycles):
+                if self.hours is not None:
+                    wait = self.hours.seconds_until_open(self._clock())
+                    if wait > 0:
+                        logger.info(f"Market closed; sleeping {wait / 60:.0f} min until open")
+                        self._stop.wait(wait)
+                        continue
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Daemon cycle failed: {e}", exc_info=True)
+                self._stop.wait(self.interval)
+        finally:
+            self.fetcher.close()
+            logger.info(f"Daemon stopped after {self.cycles} cycles, {self.exports} exports")
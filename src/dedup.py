@@ -0,0 +1,122 @@
+"""Bounded, time-expiring record of StockTwits message ids already processed."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SeenSet:
+    """LRU of message ids with a time-to-live, persisted between runs.
+
+    An id is remembered for ``ttl`` seconds after it was last seen and at
+    most ``max_entries`` ids are kept (oldest dropped first), so memory
+    stays constant however long polling runs. StockTwits message ids are
+    unique across symbols, so a post that mentions several trending
+    symbols is recognized as the same message under each of them.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 2 * 86400.0,
+                 max_entries: int = 200_000, clock: Callable[[], float] = time.time):
+        """Initialize the set.
+
+        Args:
+            path: JSON file to load from and save to (in-memory only if omitted)
+            ttl: Seconds an id is remembered after it was last seen
+            max_entries: Maximum number of ids kept
+            clock: Wall clock (epoch seconds), injectable for tests
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: 'OrderedDict[int, float]' = OrderedDict()
+        self.stats = {'checked': 0, 'duplicates': 0, 'expired': 0, 'evicted': 0}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entries = json.load(f)
+                for message_id, seen_at in sorted(entries, key=lambda entry: entry[1]):
+                    self._seen[message_id] = seen_at
+                self._expire(self._clock())
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable seen-set file {path}: {e}")
+                self._seen.clear()
+
+    def check(self, message_id) -> bool:
+        """Record an id and report whether it had been seen before.
+
+        Args:
+            message_id: StockTwits message id (None is never a duplicate)
+
+        Returns:
+            True if the id was already seen within the TTL
+        """
+        if message_id is None:
+            return False
+        now = self._clock()
+        with self._lock:
+            self.stats['checked'] += 1
+            duplicate = message_id in self._seen
+            if duplicate:
+                self.stats['duplicates'] += 1
+                self._seen.move_to_end(message_id)
+            self._seen[message_id] = now
+            self._expire(now)
+        return duplicate
+
+    def _expire(self, now: float):
+        """Drop ids past their TTL and trim to ``max_entries`` (lock held)."""
+        seen = self._seen
+        cutoff = now - self.ttl
+        while seen:
+            oldest_id, seen_at = next(iter(seen.items()))
+            if seen_at >= cutoff:
+                break
+            del seen[oldest_id]
+            self.stats['expired'] += 1
+        while len(seen) > self.max_entries:
+            seen.popitem(last=False)
+            self.stats['evicted'] += 1
+
+    @property
+    def dedup_rate(self) -> float:
+        """Fraction of checked ids that were duplicates."""
+        checked = self.stats['checked']
+        return self.stats['duplicates'] / checked if checked else 0.0
+
+    def save(self):
+        """Atomically write the ids and their last-seen times to disk."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = list(self._seen.items())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def report(self) -> Dict:
+        """Counters plus the current size and dedup rate."""
+        with self._lock:
+            return dict(self.stats, size=len(self._seen), dedup_rate=self.dedup_rate)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, message_id) -> bool:
+        return message_id in self._seen
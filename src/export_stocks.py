@@ -2,84 +2,222 @@
 
 import sys
 import os
+import json
 import logging
+import shutil
 import subprocess
+import tempfile
+import time
 from datetime import datetime
-from market_data import MarketDataFetcher
+from typing import Dict, List, Optional, Sequence
+from exporters import export_snapshot
+from market_data import MarketDataFetcher, MarketSnapshot
+from metrics import timed
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+OUTPUT_PATH = r"C:\Users\senth\OneDrive\Documents\data\screenshots\stock_symbols.txt"
+DESKTOP_AUTO_PATH = r"C:\Users\senth\OneDrive\Documents\desktop_auto\dist\DesktopAuto.exe"
+DESKTOP_AUTO_DIR = r"C:\Users\senth\OneDrive\Documents\desktop_auto\dist"
+
+# Symbols analyzed more recently than this are not handed off again
+DEFAULT_ANALYSIS_TTL_HOURS = 24.0
+
+
+class ExportResult:
+    """Outcome of ``extract_and_save_stocks``; truthy when the export succeeded.
+
+    ``handed_off`` lists the symbols passed to an automation that actually
+    launched (empty when nothing was new or the launch failed).
+    """
+
+    def __init__(self, success: bool, handed_off: Sequence[str] = ()):
+        self.success = success
+        self.handed_off = list(handed_off)
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def __repr__(self) -> str:
+        return f"ExportResult(success={self.success}, handed_off={self.handed_off})"
+
+
+@timed('export.atomic_write_text')
+def atomic_write_text(path: str, content: str):
+    """Write a text file so readers never see a partial file.
+
+    Args:
+        path: Destination file
+        content: Text to write
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_export_state(state_file: str) -> Dict:
+    """Load the previous export's symbol list and per-symbol analysis times.
+
+    Args:
+        state_file: JSON state file
+
+    Returns:
+        Dict with 'symbols' (last exported list) and 'analyzed' (symbol -> epoch seconds)
+    """
+    state = {'symbols': [], 'analyzed': {}}
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, encoding='utf-8') as f:
+                state.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export state {state_file}: {e}")
+    return state
+
+
+def plan_export(symbols: Sequence[str], state: Dict, ttl_seconds: float,
+                now: Optional[float] = None) -> List[str]:
+    """Pick the symbols that need to be handed downstream.
+
+    Args:
+        symbols: Current most-active symbols, in rank order
+        state: Previous export state (see load_export_state)
+        ttl_seconds: Skip symbols analyzed within this many seconds
+        now: Current epoch seconds (defaults to now)
+
+    Returns:
+        Symbols added since the last export and not analyzed within the TTL
+    """
+    now = now if now is not None else time.time()
+    previous = set(state.get('symbols', []))
+    analyzed = state.get('analyzed', {})
+    return [s for s in symbols
+            if s not in previous and now - analyzed.get(s, float('-inf')) >= ttl_seconds]
+
+
+@timed('export.launch_automation')
+def launch_automation(command: Sequence[str], cwd: Optional[str] = None) -> Optional[subprocess.Popen]:
+    """Start the downstream automation without waiting for it.
+
+    Args:
+        command: Program and arguments
+        cwd: Working directory, so the program can find its config files
+
+    Returns:
+        The started process, or None if the program is missing or failed to start
+    """
+    program = command[0]
+    if not os.path.exists(program) and shutil.which(program) is None:
+        logger.warning(f"Automation program not found at {program}")
+        print(f"✗ {os.path.basename(program)} not found at {program}")
+        return None
+    kwargs = {'cwd': cwd}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_CONSOLE
+    try:
+        logger.info(f"Triggering {program}...")
+        process = subprocess.Popen(list(command), **kwargs)
+        print(f"✓ {os.path.basename(program)} triggered")
+        return process
+    except Exception as e:
+        logger.error(f"Failed to trigger {program}: {e}")
+        print(f"✗ Failed to trigger automation: {e}")
+        return None
+
+
+def extract_and_save_stocks(output_file: str, snapshot: Optional[MarketSnapshot] = None,
+                            launch_command: Optional[Sequence[str]] = None,
+                            launch_cwd: Optional[str] = None, state_file: Optional[str] = None,
+                            analysis_ttl_hours: float = DEFAULT_ANALYSIS_TTL_HOURS,
+                            export_dir: Optional[str] = None,
+                            export_formats: Sequence[str] = ('csv', 'jsonl')) -> ExportResult:
+    """Extract active stocks and hand the new ones to the automation.
+
+    Only symbols that were not in the previous export and were not analyzed
+    within ``analysis_ttl_hours`` are written (atomically) and handed off;
+    when there are none, neither the file nor the automation is touched.
 
-def extract_and_save_stocks(output_file: str) -> bool:
-    """Extract active stocks and save to file.
-    
     Args:
         output_file: Path to save the stock data
-        
+        snapshot: Market snapshot already fetched by the caller; fetched
+            here only when omitted
+        launch_command: Automation command (DesktopAuto.exe if omitted)
+        launch_cwd: Working directory for the automation
+        state_file: Export state file (defaults to ``<output_file>.state.json``)
+        analysis_ttl_hours: Re-analysis interval for a symbol in hours
+        export_dir: Also write the full snapshot (every list, all quote
+            fields) here in ``export_formats``, on every run
+        export_formats: Snapshot formats: 'csv', 'jsonl' and/or 'parquet'
+
     Returns:
-        True if successful, False otherwise
+        ExportResult, truthy if successful, with the symbols handed off
     """
     try:
-        fetcher = MarketDataFetcher()
-        
+        if snapshot is None:
+            fetcher = MarketDataFetcher()
+            snapshot = fetcher.get_snapshot()
+            fetcher.close()
+            if snapshot is None:
+                logger.error("No market snapshot available")
+                return ExportResult(False)
+
         # Get active stocks
-        active_stocks = fetcher.get_most_active_stocks(limit=10)
-        gainers = fetcher.get_gainers(limit=5)
-        losers = fetcher.get_losers(limit=5)
-        
+        active_stocks = snapshot.most_active(limit=10)
+        gainers = snapshot.gainers(limit=5) or []
+        losers = snapshot.losers(limit=5) or []
+
         if not active_stocks:
             logger.error("No active stocks found")
-            return False
-        
-        # Prepare content - Only symbols
-        content = []
-        
-        for stock in active_stocks:
-            symbol = stock.get('symbol', 'N/A')
-            content.append(symbol)
-        
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
-        
-        logger.info(f"Successfully saved active stocks to {output_file}")
+            return ExportResult(False)
+
+        if export_dir:
+            for path in export_snapshot(snapshot, export_dir, export_formats).values():
+                print(f"✓ Snapshot exported to: {path}")
+
+        symbols = [stock.get('symbol', 'N/A') for stock in active_stocks]
+        state_file = state_file or f"{output_file}.state.json"
+        state = load_export_state(state_file)
+        now = time.time()
+        ttl_seconds = analysis_ttl_hours * 3600
+        to_analyze = plan_export(symbols, state, ttl_seconds, now)
+
+        if not to_analyze:
+            logger.info("No new symbols to analyze; skipping export")
+            print("✓ Active stocks unchanged; nothing to hand off")
+            state['symbols'] = symbols
+            atomic_write_text(state_file, json.dumps(state))
+            return ExportResult(True)
+
+        # Write only the symbols downstream still has to analyze
+        atomic_write_text(output_file, '\n'.join(to_analyze))
+
+        logger.info(f"Successfully saved {len(to_analyze)} new symbols to {output_file}")
         print(f"✓ Active stocks extracted and saved to: {output_file}")
         print(f"✓ Total records: {len(active_stocks)} most active + {len(gainers)} gainers + {len(losers)} losers")
-        
-        # Trigger DesktopAuto.exe
-        desktop_auto_path = r"C:\Users\senth\OneDrive\Documents\desktop_auto\dist\DesktopAuto.exe"
-        desktop_auto_dir = r"C:\Users\senth\OneDrive\Documents\desktop_auto\dist"
-        if os.path.exists(desktop_auto_path):
-            try:
-                logger.info(f"Triggering {desktop_auto_path}...")
-                # Launch with proper working directory so it can find config files
-                subprocess.Popen(
-                    [desktop_auto_path],
-                    cwd=desktop_auto_dir,
-                    creationflags=subprocess.CREATE_NEW_CONSOLE
-                )
-                print("✓ DesktopAuto.exe triggered")
-            except Exception as e:
-                logger.error(f"Failed to trigger DesktopAuto.exe: {e}")
-                print(f"✗ Failed to trigger automation: {e}")
-        else:
-            logger.warning(f"DesktopAuto.exe not found at {desktop_auto_path}")
-            print(f"✗ DesktopAuto.exe not found at {desktop_auto_path}")
-        
-        fetcher.close()
-        return True
-        
+        print(f"✓ New symbols handed off: {', '.join(to_analyze)}")
+
+        if launch_command is None:
+            launch_command, launch_cwd = [DESKTOP_AUTO_PATH], launch_cwd or DESKTOP_AUTO_DIR
+        if launch_automation(launch_command, launch_cwd) is None:
+            # Leave the state alone so the next run hands these symbols off again
+            return ExportResult(True)
+
+        analyzed = {s: t for s, t in state.get('analyzed', {}).items() if now - t < ttl_seconds}
+        analyzed.update({s: now for s in to_analyze})
+        atomic_write_text(state_file, json.dumps({'symbols': symbols, 'analyzed': analyzed}))
+        return ExportResult(True, to_analyze)
+
     except Exception as e:
         logger.error(f"Error extracting stocks: {e}", exc_info=True)
         print(f"✗ Error: {e}")
-        return False
+        return ExportResult(False)
 
 
 if __name__ == "__main__":
-    output_path = r"C:\Users\senth\OneDrive\Documents\data\screenshots\stock_symbols.txt"
-    success = extract_and_save_stocks(output_path)
-    sys.exit(0 if success else 1)
+    from cli import main as cli_main
+    sys.exit(cli_main(['export'] + sys.argv[1:]))
@@ -0,0 +1,361 @@
+"""Streaming snapshot exporters: CSV, JSON lines, Parquet and console tables."""
+
+import abc
+import csv
+import json
+import math
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+import logging
+
+from market_data import MarketSnapshot
+from snapshot_store import SNAPSHOT_LISTS
+
+logger = logging.getLogger(__name__)
+
+# Columns of an exported quote row (the SnapshotStore quote columns)
+RECORD_FIELDS = ('captured_at', 'list_name', 'rank', 'symbol', 'name', 'price', 'change_pct', 'volume')
+
+# Parquet column types for RECORD_FIELDS (other fields are inferred)
+PARQUET_TYPES = {
+    'captured_at': 'float64', 'list_name': 'string', 'rank': 'int64', 'symbol': 'string',
+    'name': 'string', 'price': 'float64', 'change_pct': 'float64', 'volume': 'float64',
+}
+
+# Write buffer for file exporters; rows are flushed in blocks of about this size
+BUFFER_SIZE = 1 << 20
+
+
+def _nullable(value: float) -> Optional[float]:
+    """Export NaN as an empty value."""
+    return None if math.isnan(value) else value
+
+
+def snapshot_records(snapshot: MarketSnapshot, lists: Sequence[str] = SNAPSHOT_LISTS) -> Iterator[Dict]:
+    """Stream a snapshot's quotes as flat export rows.
+
+    Args:
+        snapshot: Snapshot to export
+        lists: Which lists to include, in order
+
+    Yields:
+        One dict per quote with RECORD_FIELDS keys (missing numbers are None)
+    """
+    for list_name in lists:
+        for rank, quote in enumerate(snapshot.quote_batch(list_name), 1):
+            yield {
+                'captured_at': snapshot.fetched_at, 'list_name': list_name, 'rank': rank,
+                'symbol': quote.symbol, 'name': quote.name, 'price': _nullable(quote.price),
+                'change_pct': _nullable(quote.change_pct), 'volume': _nullable(quote.volume),
+            }
+
+
+class Exporter(abc.ABC):
+    """Base class for record sinks; subclasses implement ``write``.
+
+    File exporters write through a large buffer into a temporary file next
+    to the destination and move it into place on ``close``, so readers see
+    either the previous file or the complete new one. Leaving a ``with``
+    block through an exception discards the partial output.
+    """
+
+    extension = ''
+
+    def __init__(self, path: str):
+        """Open a temporary file beside ``path``.
+
+        Args:
+            path: Destination file
+        """
+        self.path = path
+        self.rows = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        self._file = self._open(fd)
+
+    def _open(self, fd: int):
+        return os.fdopen(fd, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE)
+
+    @abc.abstractmethod
+    def write(self, record: Dict):
+        """Write one record."""
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        """Write records from an iterable; returns the number written."""
+        before = self.rows
+        for record in records:
+            self.write(record)
+        return self.rows - before
+
+    def _finish(self):
+        """Flush format trailers before the file is closed."""
+
+    def close(self):
+        """Finish the file and move it into place."""
+        if self._file is None:
+            return
+        try:
+            self._finish()
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+        except Exception:
+            self.abort()
+            raise
+        self._file = None
+        logger.info(f"Exported {self.rows} rows to {self.path}")
+
+    def abort(self):
+        """Discard the output, leaving any previous file untouched."""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        self._file = None
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self) -> 'Exporter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvExporter(Exporter):
+    """Comma-separated rows with a header; missing values are empty cells."""
+
+    extension = 'csv'
+
+    def __init__(self, path: str, fields: Sequence[str] = RECORD_FIELDS):
+        super().__init__(path)
+        self._writer = csv.DictWriter(self._file, fieldnames=list(fields), extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, record: Dict):
+        self._writer.writerow(record)
+        self.rows += 1
+
+
+class JsonLinesExporter(Exporter):
+    """One JSON object per line; missing values are null."""
+
+    extension = 'jsonl'
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, separators=(',', ':')))
+        self._file.write('\n')
+        self.rows += 1
+
+
+class ParquetExporter(Exporter):
+    """Parquet file written in row groups of ``batch_size`` records.
+
+    Needs the optional ``pyarrow`` package; at most one row group is held
+    in memory at a time.
+    """
+
+    extension = 'parquet'
+
+    def __init__(self, path: str, fields: Sequence[str] = RECORD_FIELDS, batch_size: int = 65536):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from None
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.fields = list(fields)
+        self.batch_size = batch_size
+        self._columns: Dict[str, List] = {field: [] for field in self.fields}
+        self._schema = None
+        if all(field in PARQUET_TYPES for field in self.fields):
+            self._schema = pyarrow.schema([(field, pyarrow.type_for_alias(PARQUET_TYPES[field]))
+                                           for field in self.fields])
+        self._writer = None
+        super().__init__(path)
+
+    def _open(self, fd: int):
+        return os.fdopen(fd, 'wb', buffering=BUFFER_SIZE)
+
+    def write(self, record: Dict):
+        for field, column in self._columns.items():
+            column.append(record.get(field))
+        self.rows += 1
+        if len(self._columns[self.fields[0]]) >= self.batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if not self._columns[self.fields[0]]:
+            return
+        table = self._pa.table(self._columns, schema=self._schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._file, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self._columns = {field: [] for field in self.fields}
+
+    def _finish(self):
+        self._flush_batch()
+        if self._writer is not None:
+            self._writer.close()
+
+
+EXPORTERS = {
+    'csv': CsvExporter,
+    'jsonl': JsonLinesExporter,
+    'parquet': ParquetExporter,
+}
+
+
+def open_exporter(fmt: str, path: str) -> Exporter:
+    """Create the exporter for a format name ('csv', 'jsonl' or 'parquet')."""
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(EXPORTERS)}")
+    return EXPORTERS[fmt](path)
+
+
+def export_records(records: Iterable[Dict], output_dir: str, basename: str,
+                   formats: Sequence[str] = ('csv', 'jsonl')) -> Dict[str, str]:
+    """Write one record stream to several formats in a single pass.
+
+    Args:
+        records: Rows to export (consumed once)
+        output_dir: Directory for the files (created if missing)
+        basename: File name without extension
+        formats: Format names (see EXPORTERS)
+
+    Returns:
+        Mapping of format to the file written
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown export format {unknown[0]!r}; expected one of {sorted(EXPORTERS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    exporters = []
+    try:
+        for fmt in formats:
+            exporters.append(open_exporter(fmt, os.path.join(output_dir, f"{basename}.{EXPORTERS[fmt].extension}")))
+        for record in records:
+            for exporter in exporters:
+                exporter.write(record)
+        for exporter in exporters:
+            exporter.close()
+    except BaseException:
+        for exporter in exporters:
+            exporter.abort()
+        raise
+    return {fmt: exporter.path for fmt, exporter in zip(formats, exporters)}
+
+
+def export_snapshot(snapshot: MarketSnapshot, output_dir: str,
+                    formats: Sequence[str] = ('csv', 'jsonl'), basename: Optional[str] = None) -> Dict[str, str]:
+    """Export every list of a snapshot (see export_records).
+
+    Args:
+        snapshot: Snapshot to export
+        output_dir: Directory for the files
+        formats: Format names (see EXPORTERS)
+        basename: File name without extension (defaults to a timestamped
+            ``snapshot_YYYYmmdd_HHMMSS``)
+
+    Returns:
+        Mapping of format to the file written
+    """
+    if basename is None:
+        from datetime import datetime
+        basename = datetime.fromtimestamp(snapshot.fetched_at).strftime('snapshot_%Y%m%d_%H%M%S')
+    return export_records(snapshot_records(snapshot), output_dir, basename, formats)
+
+
+def format_price(value) -> str:
+    """'$12.34' for a known price, the raw value otherwise."""
+    if isinstance(value, (int, float)) and not math.isnan(value):
+        return f"${value:.2f}"
+    return str(value)
+
+
+class Column:
+    """One console table column: header, record key, width and formatter."""
+
+    def __init__(self, header: str, key: str, width: int, align: str = '<',
+                 formatter: Callable[[object], str] = str):
+        self.header = header
+        self.key = key
+        self.width = width
+        self.align = align
+        self.formatter = formatter
+
+    def render(self, value) -> str:
+        return format(self.formatter(value), f"{self.align}{self.width}")
+
+
+# The ranked quote table shown by ``movers`` and ``run``
+QUOTE_COLUMNS = (
+    Column('Rank', 'rank', 6),
+    Column('Symbol', 'symbol', 8),
+    Column('Company Name', 'name', 25),
+    Column('Price', 'price', 12, formatter=format_price),
+    Column('% Change', 'change', 12),
+    Column('Volume', 'volume', 15),
+)
+
+
+class ConsoleTableExporter:
+    """Renders records as a fixed-width text table on a stream.
+
+    Rows are formatted as they arrive and written in one block on ``close``,
+    so a table costs a single write instead of one per row.
+    """
+
+    def __init__(self, columns: Sequence[Column] = QUOTE_COLUMNS, stream: Optional[TextIO] = None,
+                 rule_width: int = 100):
+        """Initialize the table.
+
+        Args:
+            columns: Column layout
+            stream: Output stream (stdout at close time if omitted)
+            rule_width: Width of the rule under the header
+        """
+        self.columns = list(columns)
+        self.stream = stream
+        self.rows = 0
+        self._lines = [' '.join(format(c.header, f"{c.align}{c.width}") for c in self.columns),
+                       '-' * rule_width]
+
+    def write(self, record: Dict):
+        self._lines.append(' '.join(c.render(record.get(c.key, 'N/A')) for c in self.columns))
+        self.rows += 1
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        before = self.rows
+        for record in records:
+            self.write(record)
+        return self.rows - before
+
+    def close(self):
+        (self.stream or sys.stdout).write('\n'.join(self._lines) + '\n')
+
+    def __enter__(self) -> 'ConsoleTableExporter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def ranked(quotes: Iterable[Dict], start: int = 1) -> Iterator[Dict]:
+    """Raw quote dicts with a 'rank' added, for QUOTE_COLUMNS tables."""
+    for rank, quote in enumerate(quotes, start):
+        yield dict(quote, rank=rank)
+
+
+def print_quote_table(quotes: Iterable[Dict], rule_width: int = 100, stream: Optional[TextIO] = None):
+    """Print raw quote dicts as the ranked quote table."""
+    with ConsoleTableExporter(QUOTE_COLUMNS, stream=stream, rule_width=rule_width) as table:
+        table.write_many(ranked(quotes))
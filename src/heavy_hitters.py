@@ -0,0 +1,154 @@
+"""Bounded-memory approximate heavy hitters (Space-Saving) for symbol mentions."""
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SpaceSaving:
+    """Space-Saving summary tracking at most ``capacity`` symbols.
+
+    When a new symbol arrives and the summary is full, the symbol with the
+    smallest count is replaced and the newcomer inherits that count as its
+    error. With N total mentions this guarantees, for every tracked symbol:
+
+        true_count <= count <= true_count + error,  error <= N / capacity
+
+    and every symbol whose true count exceeds N / capacity is tracked, so
+    the top-N is exact whenever the N-th count clears that bound. Summaries
+    built on different shards can be combined with ``merge`` and keep the
+    same N / capacity bound over the combined stream.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """Initialize the summary.
+
+        Args:
+            capacity: Maximum number of symbols tracked (memory bound)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        # One (count, symbol) entry per tracked symbol; counts only grow, so
+        # a stale entry is an underestimate and is refreshed when popped
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, symbol: str, count: int = 1):
+        """Record ``count`` mentions of a symbol."""
+        self.total += count
+        counts = self.counts
+        if symbol in counts:
+            counts[symbol] += count
+            return
+        if len(counts) < self.capacity:
+            counts[symbol] = count
+            self.errors[symbol] = 0
+            heapq.heappush(self._heap, (count, symbol))
+            return
+
+        floor, victim = self._pop_min()
+        del counts[victim]
+        del self.errors[victim]
+        counts[symbol] = floor + count
+        self.errors[symbol] = floor
+        heapq.heappush(self._heap, (floor + count, symbol))
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """Remove and return the tracked symbol with the smallest count."""
+        heap = self._heap
+        while True:
+            count, symbol = heapq.heappop(heap)
+            actual = self.counts[symbol]
+            if actual == count:
+                return count, symbol
+            heapq.heappush(heap, (actual, symbol))
+
+    def update(self, symbols: Iterable[str]) -> 'SpaceSaving':
+        """Record one mention for each symbol in an iterable."""
+        for symbol in symbols:
+            self.add(symbol)
+        return self
+
+    def min_count(self) -> int:
+        """Smallest tracked count (0 until the summary is full)."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    @property
+    def error_bound(self) -> float:
+        """Maximum overestimate of any reported count (N / capacity)."""
+        return self.total / self.capacity
+
+    def most_common(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Top symbols by estimated count.
+
+        Args:
+            n: Number of symbols to return
+
+        Returns:
+            List of (symbol, estimated_count) tuples, highest first
+        """
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def guaranteed(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Top-N entries whose rank is certain despite the approximation.
+
+        An entry is kept when its lower bound (count - error) is at least
+        the estimated count of the first symbol outside the top-N.
+
+        Args:
+            n: Number of candidate symbols to consider
+
+        Returns:
+            List of (symbol, estimated_count) tuples guaranteed to be true top-N members
+        """
+        ranked = self.most_common(n + 1)
+        if len(ranked) <= n:
+            return ranked
+        threshold = ranked[n][1]
+        return [(s, c) for s, c in ranked[:n] if c - self.errors[s] >= threshold]
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """Combine two summaries (e.g. from separate shards or processes).
+
+        A symbol missing from one full summary may still have occurred up to
+        that summary's minimum count, so that minimum is added to its count
+        and error before pruning back to ``capacity`` entries.
+
+        Args:
+            other: Summary to merge with this one
+
+        Returns:
+            New merged summary
+        """
+        capacity = max(self.capacity, other.capacity)
+        floor_self, floor_other = self.min_count(), other.min_count()
+        combined = {}
+        for symbol in set(self.counts) | set(other.counts):
+            count = error = 0
+            for summary, floor in ((self, floor_self), (other, floor_other)):
+                if symbol in summary.counts:
+                    count += summary.counts[symbol]
+                    error += summary.errors[symbol]
+                else:
+                    count += floor
+                    error += floor
+            combined[symbol] = (count, error)
+
+        merged = SpaceSaving(capacity)
+        merged.total = self.total + other.total
+        for symbol, (count, error) in heapq.nlargest(capacity, combined.items(), key=lambda item: item[1][0]):
+            merged.counts[symbol] = count
+            merged.errors[symbol] = error
+            merged._heap.append((count, symbol))
+        heapq.heapify(merged._heap)
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.counts)
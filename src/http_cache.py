@@ -0,0 +1,277 @@
+"""Persistent HTTP response cache with conditional revalidation."""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+import logging
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """A stored response body plus the metadata needed to revalidate it."""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, stored_at: float):
+        self.url = url
+        self.status = status
+        # Header names from the JSON store keep the server's casing
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+        self.stored_at = stored_at
+
+    def to_response(self, request: PreparedRequest, adapter: BaseAdapter) -> Response:
+        """Build a requests Response that replays this entry."""
+        response = Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.body
+        response._content_consumed = True
+        response.url = self.url
+        response.request = request
+        response.connection = adapter
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """SQLite-backed response store with per-endpoint TTLs and LRU eviction.
+
+    Entries younger than the TTL matching their URL are served without
+    touching the network. Older entries are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` so an unchanged resource costs
+    a 304 instead of a full body. The store is bounded by ``max_bytes``;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str = ':memory:', max_bytes: int = 50 * 1024 * 1024,
+                 default_ttl: float = 0.0, ttls: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (':memory:' for a process-local cache)
+            max_bytes: Upper bound on the total size of cached bodies
+            default_ttl: Freshness lifetime in seconds for unmatched URLs
+            ttls: Mapping of URL regex pattern to freshness lifetime in seconds
+            clock: Epoch clock, injectable for tests
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls: Dict[str, float] = dict(ttls or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._compiled = {}
+        # LRU access times recorded by get(), written in batches rather than per hit
+        self._accessed: Dict[str, float] = {}
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB,"
+            " size INTEGER, stored_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def record(self, event: str):
+        """Increment a hit/miss counter."""
+        with self._lock:
+            self.stats[event] += 1
+
+    def set_default_ttls(self, ttls: Dict[str, float]):
+        """Register endpoint TTLs without overriding ones already configured."""
+        for pattern, ttl in ttls.items():
+            self.ttls.setdefault(pattern, ttl)
+
+    def ttl_for(self, url: str) -> float:
+        """Freshness lifetime for a URL (first matching pattern wins)."""
+        for pattern, ttl in self.ttls.items():
+            regex = self._compiled.get(pattern)
+            if regex is None:
+                regex = self._compiled[pattern] = re.compile(pattern)
+            if regex.search(url):
+                return ttl
+        return self.default_ttl
+
+    # Pending access times are written once this many have accumulated
+    ACCESS_FLUSH_SIZE = 256
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Look up a stored response and mark it as recently used.
+
+        The access time is kept in memory and written together with other
+        pending ones (at the next store, eviction, revalidation or close),
+        so a cache hit does not cost a disk write.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = self._clock()
+            if len(self._accessed) >= self.ACCESS_FLUSH_SIZE:
+                self._flush_access()
+                self._conn.commit()
+        status, headers, body, stored_at = row
+        return CachedResponse(url, status, json.loads(headers), bytes(body), stored_at)
+
+    def is_fresh(self, url: str, entry: Optional[CachedResponse] = None) -> bool:
+        """Check whether a URL can be served from cache without revalidation."""
+        if entry is None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT stored_at FROM responses WHERE url = ?", (url,)
+                ).fetchone()
+            if row is None:
+                return False
+            stored_at = row[0]
+        else:
+            stored_at = entry.stored_at
+        return self._clock() - stored_at < self.ttl_for(url)
+
+    def _flush_access(self):
+        """Write pending access times (lock held; the caller commits)."""
+        if self._accessed:
+            self._conn.executemany("UPDATE responses SET last_access = ? WHERE url = ?",
+                                   [(at, url) for url, at in self._accessed.items()])
+            self._accessed.clear()
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Store a response, evicting least recently used entries past ``max_bytes``."""
+        if len(body) > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock:
+            self._accessed.pop(url, None)
+            self._flush_access()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(headers), body, len(body), now, now)
+            )
+            self.stats['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Restart an entry's freshness lifetime after a successful revalidation."""
+        now = self._clock()
+        with self._lock:
+            self._accessed.pop(url, None)
+            self._flush_access()
+            if headers:
+                row = self._conn.execute("SELECT headers FROM responses WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    merged = CaseInsensitiveDict(json.loads(row[0]))
+                    merged.update(headers)
+                    self._conn.execute("UPDATE responses SET headers = ? WHERE url = ?",
+                                       (json.dumps(dict(merged)), url))
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the size bound holds (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            url, size = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            self.stats['evictions'] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        """Write pending access times and close the underlying database."""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+        self._conn.close()
+
+
+class CachingAdapter(BaseAdapter):
+    """Transport adapter that serves GETs from a ResponseCache.
+
+    Wraps another adapter (a plain HTTPAdapter by default) so it can be
+    mounted on any ``requests.Session``.
+    """
+
+    def __init__(self, cache: ResponseCache, adapter: Optional[BaseAdapter] = None):
+        """Initialize the adapter.
+
+        Args:
+            cache: Response store to read from and write to
+            adapter: Adapter that performs real network requests
+        """
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Serve from cache, revalidate, or fetch and store."""
+        if request.method != 'GET':
+            return self.adapter.send(request, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(url, entry):
+            self.cache.record('hits')
+            return entry.to_response(request, self)
+
+        if entry is not None:
+            request = request.copy()
+            if 'ETag' in entry.headers:
+                request.headers['If-None-Match'] = entry.headers['ETag']
+            if 'Last-Modified' in entry.headers:
+                request.headers['If-Modified-Since'] = entry.headers['Last-Modified']
+
+        response = self.adapter.send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.record('revalidated')
+            self.cache.touch(url, {k: v for k, v in response.headers.items()
+                                   if k.lower() in ('etag', 'last-modified')})
+            response.close()
+            return entry.to_response(request, self)
+
+        self.cache.record('misses')
+        if response.status_code == 200 and self._is_storable(response, url):
+            headers = {k: v for k, v in response.headers.items()
+                       if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+            self.cache.put(url, response.status_code, headers, response.content)
+        return response
+
+    def _is_storable(self, response: Response, url: str) -> bool:
+        """Only keep responses that can be reused or revalidated."""
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return False
+        return ('ETag' in response.headers or 'Last-Modified' in response.headers
+                or self.cache.ttl_for(url) > 0)
+
+    def close(self):
+        """Close the wrapped adapter."""
+        self.adapter.close()
@@ -1,17 +1,18 @@
 """Main entry point for the StockTwits analyzer - Fetch active stocks and trigger automation."""
 
+import os
 import sys
 import logging
 from market_data import MarketDataFetcher
-from export_stocks import extract_and_save_stocks
+from export_stocks import OUTPUT_PATH, extract_and_save_stocks
+from exporters import print_quote_table
+from metrics import get_registry
+from snapshot_store import SnapshotStore
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_DB = os.path.join(os.path.dirname(OUTPUT_PATH), "snapshots.db")
+
 
 # Placeholder - no longer used
 SAMPLE_POSTS = [
@@ -45,15 +46,17 @@ def main():
     print("=" * 80)
     
     fetcher = MarketDataFetcher()
+    metrics = get_registry()
     
     try:
         # Step 1: Fetch Most Active Equities
         print("\n[Step 1] Fetching Most Active Equities...")
         print("-" * 80)
         
-        active_stocks = fetcher.get_most_active_stocks(limit=10)
-        gainers = fetcher.get_gainers(limit=5)
-        losers = fetcher.get_losers(limit=5)
+        with metrics.stage('step1_fetch'):
+            active_stocks = fetcher.get_most_active_stocks(limit=10)
+            gainers = fetcher.get_gainers(limit=5)
+            losers = fetcher.get_losers(limit=5)
         
         if not active_stocks:
             print("✗ No active stocks found")
@@ -66,30 +69,35 @@ def main():
         # Display the data
         print("\n[Most Active Equities - Top 10]")
         print("-" * 80)
-        print(f"{'Rank':<6} {'Symbol':<8} {'Company':<25} {'Price':<12} {'% Change':<12} {'Volume':<15}")
-        print("-" * 80)
-        
-        for idx, stock in enumerate(active_stocks, 1):
-            symbol = stock.get('symbol', 'N/A')
-            name = stock.get('name', 'N/A')
-            price = stock.get('price', 0)
-            change = stock.get('change', 'N/A')
-            volume = stock.get('volume', 'N/A')
-            
-            if isinstance(price, (int, float)):
-                print(f"{idx:<6} {symbol:<8} {name:<25} ${price:<11.2f} {change:<12} {volume:<15}")
+        print_quote_table(active_stocks, rule_width=80)
         
         # Step 2: Export & Automation
         print("\n[Step 2] Export Symbols & Trigger Automation...")
         print("-" * 80)
         
-        output_path = r"C:\Users\senth\OneDrive\Documents\data\screenshots\stock_symbols.txt"
-        success = extract_and_save_stocks(output_path)
+        output_path = OUTPUT_PATH
+        
+        # Keep the full snapshot history next to the exported symbols
+        with metrics.stage('snapshot_history'):
+            try:
+                store = SnapshotStore(SNAPSHOT_DB)
+                store.append(fetcher.get_snapshot())
+                store.close()
+            except Exception as e:
+                logger.warning(f"Could not record snapshot history: {e}")
+        
+        # Reuse the Step 1 snapshot instead of fetching the market again
+        with metrics.stage('step2_export'):
+            result = extract_and_save_stocks(output_path, snapshot=fetcher.get_snapshot())
+        success = bool(result)
         
         if success:
             print("\n✓ Workflow Complete!")
-            print("  - Symbols exported to file")
-            print("  - DesktopAuto.exe triggered for chart analysis")
+            if result.handed_off:
+                print("  - Symbols exported to file")
+                print("  - DesktopAuto.exe triggered for chart analysis")
+            else:
+                print("  - No new symbols; automation not triggered")
         
         print("\n" + "=" * 80)
         
@@ -102,6 +110,33 @@ def main():
         return False
 
 
+def run_daemon(interval: float = 60.0, market_hours: bool = True) -> bool:
+    """Poll continuously, exporting only when the most-active set changes.
+    
+    Args:
+        interval: Seconds between polls
+        market_hours: Only poll during the regular US session
+        
+    Returns:
+        True once the daemon has shut down cleanly
+    """
+    from daemon import MarketHours, PipelineDaemon
+    
+    store = SnapshotStore(SNAPSHOT_DB)
+    daemon = PipelineDaemon(
+        export=lambda snapshot: extract_and_save_stocks(OUTPUT_PATH, snapshot=snapshot),
+        interval=interval,
+        hours=MarketHours() if market_hours else None,
+        on_snapshot=store.append,
+    )
+    daemon.install_signal_handlers()
+    try:
+        daemon.run()
+    finally:
+        store.close()
+    return True
+
+
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    from cli import main as cli_main
+    sys.exit(cli_main(['run'] + sys.argv[1:]))
@@ -1,12 +1,89 @@
 """Fetch real-time market data for active stocks."""
 
 import requests
-from typing import List, Dict, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional
 import logging
 
+from http_cache import ResponseCache
+from metrics import timed
+from quotes import QuoteBatch, format_change
+from ranking import rank_quotes
+from rate_limit import TokenBucket
+from transport import Transport, client_transport
+from universe import TickerUniverse
+
 logger = logging.getLogger(__name__)
 
 
+def _parse_int(value) -> Optional[int]:
+    """Parse an integer field such as '50123000'; missing or malformed values give None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MarketSnapshot:
+    """A single fetched view of the market movers lists.
+    
+    One snapshot backs every most-active/gainers/losers lookup in a run, so
+    callers that need the same data share one upstream fetch.
+    """
+    
+    def __init__(self, data: Dict, fetched_at: Optional[float] = None):
+        """Initialize the snapshot.
+        
+        Args:
+            data: Movers data with 'most_active', 'gainers' and 'losers' lists
+            fetched_at: Epoch time of the fetch (defaults to now)
+        """
+        self.data = data
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self._batches: Dict[str, QuoteBatch] = {}
+    
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds elapsed since the snapshot was fetched."""
+        return (now if now is not None else time.time()) - self.fetched_at
+    
+    def is_stale(self, ttl: float, now: Optional[float] = None) -> bool:
+        """Check whether the snapshot is older than ``ttl`` seconds."""
+        return self.age(now) >= ttl
+    
+    def _section(self, key: str, limit: int) -> Optional[List[Dict]]:
+        if key not in self.data:
+            return None
+        return self.data[key][:limit]
+    
+    def quote_batch(self, key: str = 'most_active') -> QuoteBatch:
+        """Parsed, columnar form of one list (parsed once per snapshot).
+        
+        Args:
+            key: 'most_active', 'gainers' or 'losers'
+            
+        Returns:
+            QuoteBatch of the list in snapshot order
+        """
+        if key not in self._batches:
+            self._batches[key] = QuoteBatch.from_dicts(self.data.get(key))
+        return self._batches[key]
+    
+    def most_active(self, limit: int = 10) -> Optional[List[Dict]]:
+        """Most active stocks from this snapshot."""
+        return self._section('most_active', limit)
+    
+    def gainers(self, limit: int = 10) -> Optional[List[Dict]]:
+        """Top gainers from this snapshot."""
+        return self._section('gainers', limit)
+    
+    def losers(self, limit: int = 10) -> Optional[List[Dict]]:
+        """Top losers from this snapshot."""
+        return self._section('losers', limit)
+
+
 class MarketDataFetcher:
     """Fetches real-time market data and active stocks."""
     
@@ -14,17 +91,50 @@ class MarketDataFetcher:
     FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
     ALPHA_VANTAGE_BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, timeout: int = 10):
+    # Symbols per request, default quota (requests/second, burst) and API key variable
+    QUOTE_PROVIDERS = {
+        'finnhub': {'batch_size': 1, 'rate': 1.0, 'burst': 10, 'key_env': 'FINNHUB_API_KEY'},
+        'alpha_vantage': {'batch_size': 100, 'rate': 5 / 60, 'burst': 1, 'key_env': 'ALPHA_VANTAGE_API_KEY'},
+    }
+    
+    def __init__(self, timeout: int = 10, snapshot_ttl: float = 60.0,
+                 cache: Optional[ResponseCache] = None, provider: str = 'finnhub',
+                 api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 transport: Optional[Transport] = None, universe: Optional[TickerUniverse] = None):
         """Initialize the market data fetcher.
         
         Args:
             timeout: Request timeout in seconds
+            snapshot_ttl: Seconds a fetched snapshot is reused before refetching
+            cache: Optional on-disk response cache for quote requests (used
+                only when no transport is given)
+            provider: Quote backend, 'finnhub' or 'alpha_vantage'
+            api_key: Provider API key (defaults to the provider's environment variable)
+            rate_limiter: Quota shared by quote requests (defaults to the provider's free tier)
+            transport: HTTP transport to use (defaults to the process-wide
+                shared transport, or a private one wrapping ``cache``; a
+                cache is rejected while the shared transport records or
+                replays, since the private transport would bypass it)
+            universe: Known tickers; when given, unknown symbols are dropped
+                before spending quote quota and quotes gain a 'name'
         """
+        if provider not in self.QUOTE_PROVIDERS:
+            raise ValueError(f"Unknown quote provider {provider!r}")
+        config = self.QUOTE_PROVIDERS[provider]
+        self.provider = provider
+        self.api_key = api_key or os.environ.get(config['key_env'])
+        self.rate_limiter = rate_limiter or TokenBucket(rate=config['rate'], capacity=config['burst'])
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.snapshot_ttl = snapshot_ttl
+        self.universe = universe
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._owns_transport = transport is None and cache is not None
+        if transport is None:
+            transport = client_transport(cache)
+        self.transport = transport
+        self.session = transport.session
+        self.cache = transport.cache
     
     def get_market_movers(self) -> Optional[Dict]:
         """Fetch market movers (gainers and losers) from public sources.
@@ -37,12 +147,39 @@ class MarketDataFetcher:
             url = "https://api.example.com/movers"  # Placeholder
             
             # Alternative: Use Yahoo Finance indirectly
-            movers_data = self._fetch_from_yahoo_finance()
-            return movers_data
+            snapshot = self.get_snapshot()
+            return snapshot.data if snapshot else None
         except Exception as e:
             logger.error(f"Error fetching market movers: {e}")
             return None
     
+    @timed('fetcher.get_snapshot')
+    def get_snapshot(self, refresh: bool = False) -> Optional[MarketSnapshot]:
+        """Return the cached market snapshot, fetching it if missing or stale.
+        
+        Args:
+            refresh: Force a new upstream fetch even if the cache is fresh
+            
+        Returns:
+            Current MarketSnapshot or None if the fetch fails
+        """
+        with self._snapshot_lock:
+            if (refresh or self._snapshot is None
+                    or self._snapshot.is_stale(self.snapshot_ttl)):
+                data = self._fetch_from_yahoo_finance()
+                if data is None:
+                    return None
+                self._snapshot = MarketSnapshot(data)
+            return self._snapshot
+    
+    def refresh_snapshot(self) -> Optional[MarketSnapshot]:
+        """Force a new upstream fetch and replace the cached snapshot.
+        
+        Returns:
+            Fresh MarketSnapshot or None if the fetch fails
+        """
+        return self.get_snapshot(refresh=True)
+    
     def _fetch_from_yahoo_finance(self) -> Optional[Dict]:
         """Fetch data from StockTwits Most Active endpoint.
         
@@ -83,6 +220,7 @@ class MarketDataFetcher:
             logger.error(f"Error fetching from StockTwits: {e}")
             return None
     
+    @timed('fetcher.get_most_active_stocks')
     def get_most_active_stocks(self, limit: int = 10) -> Optional[List[Dict]]:
         """Get the most actively traded stocks.
         
@@ -93,14 +231,13 @@ class MarketDataFetcher:
             List of most active stocks with volume data
         """
         try:
-            data = self._fetch_from_yahoo_finance()
-            if data and 'most_active' in data:
-                return data['most_active'][:limit]
-            return None
+            snapshot = self.get_snapshot()
+            return snapshot.most_active(limit) if snapshot else None
         except Exception as e:
             logger.error(f"Error getting most active stocks: {e}")
             return None
     
+    @timed('fetcher.get_gainers')
     def get_gainers(self, limit: int = 10) -> Optional[List[Dict]]:
         """Get top gaining stocks.
         
@@ -111,14 +248,13 @@ class MarketDataFetcher:
             List of top gainers with price change
         """
         try:
-            data = self._fetch_from_yahoo_finance()
-            if data and 'gainers' in data:
-                return data['gainers'][:limit]
-            return None
+            snapshot = self.get_snapshot()
+            return snapshot.gainers(limit) if snapshot else None
         except Exception as e:
             logger.error(f"Error getting gainers: {e}")
             return None
     
+    @timed('fetcher.get_losers')
     def get_losers(self, limit: int = 10) -> Optional[List[Dict]]:
         """Get top losing stocks.
         
@@ -129,14 +265,13 @@ class MarketDataFetcher:
             List of top losers with price change
         """
         try:
-            data = self._fetch_from_yahoo_finance()
-            if data and 'losers' in data:
-                return data['losers'][:limit]
-            return None
+            snapshot = self.get_snapshot()
+            return snapshot.losers(limit) if snapshot else None
         except Exception as e:
             logger.error(f"Error getting losers: {e}")
             return None
     
+    @timed('fetcher.get_stock_price')
     def get_stock_price(self, symbol: str) -> Optional[Dict]:
         """Get current price for a stock.
         
@@ -147,18 +282,145 @@ class MarketDataFetcher:
             Stock price data or None
         """
         try:
-            # This would require an API key in production
-            price_data = {
+            price_data = self.get_stock_prices([symbol]).get(symbol.strip().upper())
+            if price_data:
+                return price_data
+            # No API key configured or lookup failed
+            return {
                 'symbol': symbol,
                 'price': None,
                 'change': None,
                 'volume': None
             }
-            return price_data
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             return None
     
+    @timed('fetcher.get_stock_prices')
+    def get_stock_prices(self, symbols: Iterable[str], max_workers: int = 4) -> Dict[str, Dict]:
+        """Get current prices for many stocks in provider-sized batches.
+        
+        Symbols are deduplicated and split into batches the provider accepts
+        per request; batches run concurrently within the rate limiter's
+        quota. Failed lookups are logged and left out, so the result may be
+        partial. With a ticker universe, symbols it does not list are
+        dropped up front and each quote is given the universe's 'name'.
+        
+        Args:
+            symbols: Stock ticker symbols
+            max_workers: Maximum concurrent provider requests
+            
+        Returns:
+            Dictionary mapping symbol to price data for successful lookups
+        """
+        unique = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if self.universe is not None:
+            unknown = [s for s in unique if s not in self.universe]
+            if unknown:
+                logger.warning(f"Skipping {len(unknown)} symbols not in the ticker universe: {', '.join(unknown[:10])}")
+                unique = [s for s in unique if s in self.universe]
+        if not unique:
+            return {}
+        if not self.api_key and not self.transport.replaying:
+            logger.warning(f"No API key configured for {self.provider}; skipping price lookup")
+            return {}
+        
+        batch_size = self.QUOTE_PROVIDERS[self.provider]['batch_size']
+        batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+        
+        results: Dict[str, Dict] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+            for batch_result in executor.map(self._fetch_quote_batch, batches):
+                results.update(batch_result)
+        
+        if self.universe is not None:
+            for symbol, quote in results.items():
+                info = self.universe.lookup(symbol)
+                if info is not None and info.name:
+                    quote.setdefault('name', info.name)
+        
+        if len(results) < len(unique):
+            logger.warning(f"Fetched {len(results)}/{len(unique)} prices")
+        return results
+    
+    @timed('fetcher.rank_stocks')
+    def rank_stocks(self, symbols: Iterable[str], limit: int = 10, weights: Optional[Dict[str, float]] = None,
+                    mentions: Optional[Dict[str, int]] = None, max_workers: int = 4) -> List[Dict]:
+        """Quote a symbol universe and return its top stocks by composite score.
+        
+        Unlike the movers lists, which arrive pre-ranked from the snapshot,
+        this ranks an arbitrary universe (see ranking.RankingEngine for the
+        features and weights).
+        
+        Args:
+            symbols: Stock ticker symbols to rank
+            limit: Number of stocks to return
+            weights: Feature weights (ranking.DEFAULT_WEIGHTS if omitted)
+            mentions: StockTwits mention counts by symbol
+            max_workers: Maximum concurrent provider requests
+            
+        Returns:
+            Quote dicts with a 'score', best first
+        """
+        quotes = self.get_stock_prices(symbols, max_workers=max_workers)
+        return rank_quotes(quotes.values(), k=limit, weights=weights, mentions=mentions)
+    
+    def _fetch_quote_batch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch one provider batch; returns {} if the request fails."""
+        try:
+            if not self.transport.replaying:
+                self.rate_limiter.acquire()
+            if self.provider == 'alpha_vantage':
+                params = {'function': 'BATCH_STOCK_QUOTES', 'symbols': ','.join(symbols), 'apikey': self.api_key}
+                response = self.session.get(self.ALPHA_VANTAGE_BASE_URL, params=params, timeout=self.timeout)
+            else:
+                params = {'symbol': symbols[0], 'token': self.api_key}
+                response = self.session.get(f"{self.FINNHUB_BASE_URL}/quote", params=params, timeout=self.timeout)
+            if not getattr(response, 'from_cache', False):
+                self.rate_limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error fetching prices for {','.join(symbols)}: {e}")
+            return {}
+        
+        if self.provider == 'alpha_vantage':
+            return self._parse_alpha_vantage(data)
+        return self._parse_finnhub(symbols[0], data)
+    
+    @staticmethod
+    def _parse_finnhub(symbol: str, data: Dict) -> Dict[str, Dict]:
+        """Parse a Finnhub /quote payload (unknown symbols come back all zero)."""
+        price = data.get('c')
+        if not price:
+            return {}
+        change_pct = data.get('dp')
+        return {symbol: {
+            'symbol': symbol,
+            'price': float(price),
+            'change': format_change(float(change_pct)) if change_pct is not None else None,
+            'volume': None
+        }}
+    
+    @staticmethod
+    def _parse_alpha_vantage(data: Dict) -> Dict[str, Dict]:
+        """Parse an Alpha Vantage BATCH_STOCK_QUOTES payload."""
+        results = {}
+        for quote in data.get('Stock Quotes', []):
+            symbol = quote.get('1. symbol', '').upper()
+            try:
+                price = float(quote.get('2. price'))
+            except (TypeError, ValueError):
+                continue
+            results[symbol] = {
+                'symbol': symbol,
+                'price': price,
+                'change': None,
+                'volume': _parse_int(quote.get('3. volume'))
+            }
+        return results
+    
     def close(self):
-        """Close the session."""
-        self.session.close()
+        """Close the session if this client owns it (the shared transport stays open)."""
+        if self._owns_transport:
+            self.transport.close()
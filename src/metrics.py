@@ -0,0 +1,330 @@
+"""Lightweight timing and HTTP latency metrics with JSON lines / Prometheus output."""
+
+import bisect
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds in seconds (Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Collapse per-symbol paths so each endpoint gets one series
+_SYMBOL_SEGMENT = re.compile(r'/symbols/(?!trending(?:/|$))[^/]+')
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> LabelKey:
+    return name, tuple(sorted(labels.items()))
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, cumulative count) pairs ending with '+Inf'."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append(('+Inf' if bound == float('inf') else f"{bound:g}", total))
+        return pairs
+
+
+class MetricsRegistry:
+    """Process-wide store of counters, gauges and latency histograms.
+
+    Disabled by default: timers, the ``timed`` decorator and the HTTP
+    adapter then do a single flag check and record nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profile_dir: Optional[str] = None
+        self.trace_memory = False
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+
+    def enable(self, profile_dir: Optional[str] = None, trace_memory: bool = False):
+        """Start recording.
+
+        Args:
+            profile_dir: Directory for per-stage cProfile (and tracemalloc) dumps
+            trace_memory: Record each stage's peak traced memory
+        """
+        self.enabled = True
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop everything recorded so far."""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge to ``value``."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def set_max(self, name: str, value: float, **labels):
+        """Raise a gauge to ``value`` if that is higher (a high-water mark)."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            current = self.gauges.get(key)
+            if current is None or value > current:
+                self.gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a latency sample in seconds."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Time a block into the ``<name>`` histogram."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage, optionally profiling it.
+
+        The duration goes to the ``stage_seconds`` histogram. With a profile
+        directory the stage is run under cProfile and dumped to
+        ``<name>.prof``; with memory tracing the largest peak seen for the
+        stage goes to the ``stage_peak_memory_bytes`` gauge and the top allocations to
+        ``<name>.mem.txt``.
+        """
+        if not self.enabled:
+            yield
+            return
+        profiler = cProfile.Profile() if self.profile_dir else None
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            self.observe('stage_seconds', time.perf_counter() - start, stage=name)
+            if profiler:
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+            if self.trace_memory:
+                self._record_memory(name)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def _record_memory(self, name: str):
+        _, peak = tracemalloc.get_traced_memory()
+        self.set_max('stage_peak_memory_bytes', peak, stage=name)
+        if self.profile_dir:
+            top = tracemalloc.take_snapshot().statistics('lineno')[:25]
+            with open(os.path.join(self.profile_dir, f"{name}.mem.txt"), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(str(stat) for stat in top))
+
+    def to_records(self) -> List[Dict]:
+        """Every series as a plain dict."""
+        with self._lock:
+            records = [{'type': 'counter', 'name': name, 'labels': dict(labels), 'value': value}
+                       for (name, labels), value in self.counters.items()]
+            records.extend({'type': 'gauge', 'name': name, 'labels': dict(labels), 'value': value}
+                           for (name, labels), value in self.gauges.items())
+            for (name, labels), histogram in self.histograms.items():
+                records.append({'type': 'histogram', 'name': name, 'labels': dict(labels),
+                                'count': histogram.count, 'sum': histogram.sum,
+                                'buckets': dict(histogram.cumulative())})
+        return records
+
+    def to_prometheus(self) -> str:
+        """Render in the Prometheus text exposition format."""
+        lines = []
+        declared = set()
+        for record in sorted(self.to_records(), key=lambda r: (r['name'], sorted(r['labels'].items()))):
+            name = record['name']
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {record['type']}")
+            if record['type'] in ('counter', 'gauge'):
+                lines.append(f"{name}{_labels(record['labels'])} {record['value']:g}")
+                continue
+            for bound, count in record['buckets'].items():
+                lines.append(f"{name}_bucket{_labels(dict(record['labels'], le=bound))} {count}")
+            lines.append(f"{name}_sum{_labels(record['labels'])} {record['sum']:.6f}")
+            lines.append(f"{name}_count{_labels(record['labels'])} {record['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write the metrics; '.prom' files get Prometheus text, anything else JSON lines.
+
+        JSON lines are appended, one record per series, each stamped with the
+        write time, so repeated runs build up a history.
+        """
+        if path.endswith('.prom'):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+        else:
+            now = time.time()
+            with open(path, 'a', encoding='utf-8') as f:
+                for record in self.to_records():
+                    f.write(json.dumps(dict(record, timestamp=now)) + '\n')
+        logger.info(f"Metrics written to {path}")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = (f'{k}="{_escape(str(v))}"' for k, v in sorted(labels.items()))
+    return '{' + ','.join(pairs) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """The process-wide registry."""
+    return REGISTRY
+
+
+def timed(name: str) -> Callable:
+    """Decorator recording each call's duration in the ``call_seconds`` histogram.
+
+    Args:
+        name: Value of the ``call`` label, e.g. 'fetcher.get_snapshot'
+    """
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe('call_seconds', time.perf_counter() - start, call=name)
+        return wrapper
+    return decorate
+
+
+def endpoint_label(url: str) -> str:
+    """Host and path of a URL with per-symbol segments collapsed."""
+    parsed = urlparse(url)
+    return parsed.netloc + _SYMBOL_SEGMENT.sub('/symbols/{symbol}', parsed.path)
+
+
+class MetricsAdapter(BaseAdapter):
+    """Transport adapter recording per-endpoint latency, bytes and errors.
+
+    Series: ``http_request_seconds`` (histogram), ``http_requests_total``
+    (by status), ``http_response_bytes_total`` and ``http_errors_total``
+    (connection errors and 4xx/5xx responses). Response sizes come from
+    ``Content-Length``; without it the body is measured, except for
+    streamed requests, whose bodies are left unread.
+    """
+
+    def __init__(self, adapter: BaseAdapter, registry: Optional[MetricsRegistry] = None):
+        """Initialize the adapter.
+
+        Args:
+            adapter: Adapter that performs the requests
+            registry: Registry to record into (the process-wide one by default)
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.registry = registry or REGISTRY
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        registry = self.registry
+        if not registry.enabled:
+            return self.adapter.send(request, **kwargs)
+        endpoint = endpoint_label(request.url)
+        start = time.perf_counter()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except Exception as e:
+            registry.observe('http_request_seconds', time.perf_counter() - start, endpoint=endpoint)
+            registry.inc('http_errors_total', endpoint=endpoint, reason=type(e).__name__)
+            raise
+        registry.observe('http_request_seconds', time.perf_counter() - start, endpoint=endpoint)
+        registry.inc('http_requests_total', endpoint=endpoint, status=str(response.status_code))
+        if response.status_code >= 400:
+            registry.inc('http_errors_total', endpoint=endpoint, reason=str(response.status_code))
+        size = response.headers.get('Content-Length')
+        if size is None and not kwargs.get('stream'):
+            # The session reads the body right after this anyway
+            size = len(response.content)
+        if size is not None:
+            registry.inc('http_response_bytes_total', int(size), endpoint=endpoint)
+        return response
+
+    def close(self):
+        """Close the wrapped adapter."""
+        self.adapter.close()
@@ -0,0 +1,139 @@
+"""Multi-core batch symbol analysis for large message corpora."""
+
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from analyzer import MentionCounter, SymbolAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Analyzer rebuilt once per worker process by _init_worker
+_worker_analyzer: Optional[SymbolAnalyzer] = None
+
+
+def _init_worker(min_length: int, max_length: int, universe: Optional[List[str]]):
+    """Build the worker's analyzer (runs once per process)."""
+    global _worker_analyzer
+    _worker_analyzer = SymbolAnalyzer(min_length=min_length, max_length=max_length, universe=universe)
+
+
+def _count_chunk(texts: List[str]) -> Tuple[Counter, int, int]:
+    """Count mentions in one chunk; returns (counts, total_mentions, total_texts).
+
+    Only the counts cross the process boundary; the counter's analyzer
+    (and its ticker trie) is not pickled back to the parent.
+    """
+    counter = MentionCounter(_worker_analyzer).update(texts)
+    return counter.counts, counter.total_mentions, counter.total_texts
+
+
+def _chunks(texts: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """Split an iterable into lists of at most ``chunk_size`` items."""
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _analyzer_config(analyzer: SymbolAnalyzer) -> Tuple[int, int, Optional[List[str]]]:
+    """Picklable settings needed to rebuild an analyzer in a worker."""
+    universe = sorted(analyzer.matcher) if analyzer.matcher is not None else None
+    return analyzer.min_length, analyzer.max_length, universe
+
+
+def parallel_count_mentions(texts: Iterable[str], workers: Optional[int] = None,
+                            chunk_size: int = 10000,
+                            analyzer: Optional[SymbolAnalyzer] = None) -> MentionCounter:
+    """Count symbol mentions on a process pool and merge the partial counts.
+
+    Chunks are streamed to the pool with a bounded number in flight and
+    merged in input order, so the result (including tie order) is identical
+    to ``SymbolAnalyzer.count_mentions`` on the same texts.
+
+    Args:
+        texts: Texts to analyze (any iterable, consumed once)
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        chunk_size: Texts per task sent to a worker
+        analyzer: Analyzer whose settings the workers reproduce
+
+    Returns:
+        MentionCounter over all texts
+    """
+    analyzer = analyzer or SymbolAnalyzer()
+    workers = workers or os.cpu_count() or 1
+    result = MentionCounter(analyzer)
+
+    if workers == 1:
+        return result.update(texts)
+
+    config = _analyzer_config(analyzer)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=config) as pool:
+        pending = deque()
+        for chunk in _chunks(texts, chunk_size):
+            pending.append(pool.submit(_count_chunk, chunk))
+            # Keep memory bounded: only a couple of chunks per worker in flight
+            if len(pending) >= workers * 2:
+                result.merge(_partial_counter(analyzer, pending.popleft().result()))
+        while pending:
+            result.merge(_partial_counter(analyzer, pending.popleft().result()))
+
+    logger.info(f"Counted {result.total_mentions} mentions in {result.total_texts} texts "
+                f"with {workers} workers")
+    return result
+
+
+def _partial_counter(analyzer: SymbolAnalyzer, partial: Tuple[Counter, int, int]) -> MentionCounter:
+    """Rebuild a worker's partial result as a MentionCounter for merging."""
+    counter = MentionCounter(analyzer)
+    counter.counts, counter.total_mentions, counter.total_texts = partial
+    return counter
+
+
+def iter_file_messages(path: str) -> Iterator[str]:
+    """Stream message texts from a file.
+
+    Plain text files yield one message per line. JSON-lines files (``.jsonl``)
+    yield each record's 'message' or 'body' field, so the output of
+    ``collect_community_data`` or raw StockTwits messages can be used as-is.
+
+    Args:
+        path: Path to the corpus file
+
+    Yields:
+        Message texts
+    """
+    is_jsonl = path.endswith('.jsonl')
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if is_jsonl:
+                record = json.loads(line)
+                yield record.get('message') or record.get('body') or ''
+            else:
+                yield line
+
+
+def parallel_count_file(path: str, workers: Optional[int] = None, chunk_size: int = 10000,
+                        analyzer: Optional[SymbolAnalyzer] = None) -> MentionCounter:
+    """Count symbol mentions in a corpus file on a process pool.
+
+    Args:
+        path: Text (one message per line) or JSON-lines corpus file
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Messages per task sent to a worker
+        analyzer: Analyzer whose settings the workers reproduce
+
+    Returns:
+        MentionCounter over all messages in the file
+    """
+    return parallel_count_mentions(iter_file_messages(path), workers=workers,
+                                   chunk_size=chunk_size, analyzer=analyzer)
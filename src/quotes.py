@@ -0,0 +1,228 @@
+"""Typed quote records and columnar quote batches."""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+import logging
+
+import numpy as np
+
+from ranking import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# Suffix multipliers used by StockTwits volume strings ('22.54M', '950K')
+VOLUME_SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+
+def parse_volume(value) -> float:
+    """Parse a volume such as '22.54M', '950K', '1.2B' or 1500000.
+
+    Args:
+        value: Volume string or number
+
+    Returns:
+        Share volume as a float, or NaN if missing ('N/A', None, '')
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    text = value.strip().replace(',', '').upper()
+    if not text:
+        return math.nan
+    multiplier = VOLUME_SUFFIXES.get(text[-1], 1.0)
+    if text[-1] in VOLUME_SUFFIXES:
+        text = text[:-1]
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return math.nan
+
+
+def parse_change(value) -> float:
+    """Parse a percent change such as '+231.11%' or -2.01.
+
+    Args:
+        value: Change string or number
+
+    Returns:
+        Percent change as a float, or NaN if missing
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    try:
+        return float(value.strip().rstrip('%').replace(',', ''))
+    except ValueError:
+        return math.nan
+
+
+def parse_price(value) -> float:
+    """Parse a price; zero, negative or missing prices become NaN."""
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return price if price > 0 else math.nan
+
+
+def format_volume(volume: float) -> str:
+    """Format a share volume the way StockTwits displays it ('22.54M')."""
+    if math.isnan(volume):
+        return 'N/A'
+    for suffix in ('T', 'B', 'M', 'K'):
+        if volume >= VOLUME_SUFFIXES[suffix]:
+            return f"{volume / VOLUME_SUFFIXES[suffix]:.2f}{suffix}"
+    return f"{volume:.0f}"
+
+
+def format_change(change_pct: float) -> str:
+    """Format a percent change with an explicit sign ('+231.11%')."""
+    if math.isnan(change_pct):
+        return 'N/A'
+    return f"{change_pct:+.2f}%"
+
+
+class Quote:
+    """Compact parsed quote; fields are parsed once at construction."""
+
+    __slots__ = ('symbol', 'name', 'price', 'change_pct', 'volume')
+
+    def __init__(self, symbol: str, name: str = '', price: float = math.nan,
+                 change_pct: float = math.nan, volume: float = math.nan):
+        """Initialize the quote.
+
+        Args:
+            symbol: Ticker symbol
+            name: Company name
+            price: Last price (NaN if unknown)
+            change_pct: Percent change (NaN if unknown)
+            volume: Share volume (NaN if unknown)
+        """
+        self.symbol = symbol
+        self.name = name
+        self.price = price
+        self.change_pct = change_pct
+        self.volume = volume
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Quote':
+        """Parse a raw quote dict as produced by MarketDataFetcher."""
+        return cls(
+            symbol=data.get('symbol', 'N/A'),
+            name=data.get('name', 'N/A'),
+            price=parse_price(data.get('price')),
+            change_pct=parse_change(data.get('change')),
+            volume=parse_volume(data.get('volume')),
+        )
+
+    def to_dict(self) -> Dict:
+        """Render back to the raw dict shape (display strings for change/volume)."""
+        return {
+            'symbol': self.symbol,
+            'name': self.name,
+            'price': 0.0 if math.isnan(self.price) else self.price,
+            'change': format_change(self.change_pct),
+            'volume': format_volume(self.volume),
+        }
+
+    def __repr__(self) -> str:
+        return (f"Quote({self.symbol!r}, price={self.price}, "
+                f"change_pct={self.change_pct}, volume={self.volume})")
+
+
+class QuoteBatch:
+    """Columnar batch of quotes backed by NumPy arrays.
+
+    Summaries and sorting run vectorized over the columns; missing values
+    are NaN and are skipped by totals/averages and sorted last.
+    """
+
+    NUMERIC_FIELDS = ('price', 'change_pct', 'volume')
+
+    def __init__(self, symbols: Sequence[str], names: Sequence[str],
+                 price: np.ndarray, change_pct: np.ndarray, volume: np.ndarray):
+        """Initialize the batch from aligned columns."""
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.change_pct = np.asarray(change_pct, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Quote]) -> 'QuoteBatch':
+        """Build a batch from Quote records."""
+        quotes = list(quotes)
+        return cls(
+            [q.symbol for q in quotes],
+            [q.name for q in quotes],
+            np.fromiter((q.price for q in quotes), np.float64, len(quotes)),
+            np.fromiter((q.change_pct for q in quotes), np.float64, len(quotes)),
+            np.fromiter((q.volume for q in quotes), np.float64, len(quotes)),
+        )
+
+    @classmethod
+    def from_dicts(cls, records: Optional[Iterable[Dict]]) -> 'QuoteBatch':
+        """Parse raw quote dicts into a batch."""
+        return cls.from_quotes(Quote.from_dict(r) for r in records or [])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, index: int) -> Quote:
+        return Quote(self.symbols[index], self.names[index], float(self.price[index]),
+                     float(self.change_pct[index]), float(self.volume[index]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, indices: np.ndarray) -> 'QuoteBatch':
+        """New batch with the rows at ``indices``, in that order."""
+        return QuoteBatch(self.symbols[indices], self.names[indices], self.price[indices],
+                          self.change_pct[indices], self.volume[indices])
+
+    def total_volume(self) -> float:
+        """Sum of known volumes."""
+        return float(np.nansum(self.volume))
+
+    def average_price(self) -> float:
+        """Mean of known (positive) prices, 0.0 if none."""
+        known = self.price[~np.isnan(self.price)]
+        return float(known.mean()) if known.size else 0.0
+
+    def sort_by(self, field: str = 'volume', descending: bool = True) -> 'QuoteBatch':
+        """Batch sorted by a numeric column; missing values go last.
+
+        Args:
+            field: One of 'price', 'change_pct', 'volume'
+            descending: Largest first when True
+
+        Returns:
+            Sorted QuoteBatch
+        """
+        if field not in self.NUMERIC_FIELDS:
+            raise ValueError(f"Cannot sort by {field!r}; expected one of {self.NUMERIC_FIELDS}")
+        column = getattr(self, field)
+        keys = -column if descending else column
+        # NaN sorts last in argsort either way; stable keeps ties in input order
+        return self.take(np.argsort(keys, kind='stable'))
+
+    def top(self, n: int, field: str = 'volume') -> 'QuoteBatch':
+        """The ``n`` largest rows by a numeric column, selected without a full sort."""
+        if field not in self.NUMERIC_FIELDS:
+            raise ValueError(f"Cannot rank by {field!r}; expected one of {self.NUMERIC_FIELDS}")
+        return self.take(top_k_indices(getattr(self, field), n))
+
+    def to_records(self) -> List[Dict]:
+        """Render rows back to raw quote dicts."""
+        return [quote.to_dict() for quote in self]
+
+    def to_dataframe(self):
+        """Columns as a pandas DataFrame."""
+        import pandas as pd
+        return pd.DataFrame({
+            'symbol': self.symbols, 'name': self.names, 'price': self.price,
+            'change_pct': self.change_pct, 'volume': self.volume,
+        })
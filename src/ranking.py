@@ -0,0 +1,436 @@
+"""Top-K ranking of large quote universes by single fields or composite scores."""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Ranking features and how each raw value is transformed before weighting.
+# Volumes and counts span orders of magnitude, so they are log-scaled; the
+# composite then uses each feature's percentile within the universe.
+FEATURES = ('volume', 'change_pct', 'abs_change_pct', 'relative_volume', 'mentions')
+
+# relative_volume needs an 'avg_volume' that neither quote provider returns
+# (Finnhub quotes carry no volume at all), so it is only weighted on request
+DEFAULT_WEIGHTS = {'volume': 1.0, 'abs_change_pct': 1.0, 'mentions': 0.5}
+
+
+def top_k_indices(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """Indices of the ``k`` largest (or smallest) values, best first.
+
+    Selects with ``argpartition`` (linear time) and sorts only the ``k``
+    winners, so the cost is O(n + k log k) rather than a full O(n log n)
+    sort. NaN values rank last; ties keep index order.
+
+    Args:
+        values: 1-D array of scores
+        k: Number of indices to return
+        descending: Largest first when True
+
+    Returns:
+        Array of at most ``k`` indices into ``values``
+    """
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = -values if descending else values.astype(np.float64, copy=True)
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    if k < n:
+        boundary = keys[np.argpartition(keys, k - 1)[k - 1]]
+        # argpartition breaks ties at the boundary arbitrarily; keep the earliest
+        better = np.flatnonzero(keys < boundary)
+        tied = np.flatnonzero(keys == boundary)[:k - len(better)]
+        candidates = np.concatenate([better, tied])
+    else:
+        candidates = np.arange(n)
+    # Order winners by key, then by index for stable ties
+    return candidates[np.lexsort((candidates, keys[candidates]))]
+
+
+class QuantileReference:
+    """Percentile lookup for one feature, fitted in linear time.
+
+    Fitting keeps about a hundred evenly spaced order statistics (cut
+    points) of the known values, found with one multi-pivot
+    ``np.partition`` over at most ``sample`` evenly strided values rather
+    than a full O(n log n) sort. Universes of up to ``points`` values keep
+    every value as a cut point.
+
+    Scoring avoids a binary search per value: the cut points' range is
+    split into equal buckets, and a value's bucket is computed
+    arithmetically. Cut points are bucketed by the same arithmetic, so a
+    bucket holding at most one distinct cut point answers with one
+    comparison against it; only values in buckets shared by several
+    distinct cut points (or above the second-highest one) fall back to
+    ``np.searchsorted``. Results are the exact mid-rank percentiles among
+    the cut points either way.
+    """
+
+    def __init__(self, values: np.ndarray, points: int = 101, sample: int = 10_000,
+                 buckets_per_point: int = 64):
+        """Fit the cut points and the bucket tables.
+
+        Args:
+            values: Feature values (NaN and infinities are ignored)
+            points: Number of cut points kept for large inputs
+            sample: Largest number of values partitioned when fitting
+            buckets_per_point: Buckets per cut point
+        """
+        known = values[np.isfinite(values)]
+        if len(known) > sample:
+            known = known[::len(known) // sample]
+        if len(known) > points:
+            kth = np.unique(np.linspace(0, len(known) - 1, points).round().astype(np.intp))
+            known = np.partition(known, kth)[kth]
+        self.cuts = cuts = np.sort(known)
+        m = len(cuts)
+        if not m:
+            return
+        # Buckets stop below the top cut point, so one outlier cannot widen them
+        self._low = cuts[0]
+        top = cuts[-2] if m > 1 and cuts[-2] > cuts[0] else cuts[-1]
+        self._buckets = buckets_per_point * m if top > self._low else 0
+        self._scale = self._buckets / (top - self._low) if top > self._low else 0.0
+        # Per bucket (0 is below the lowest cut, the last is the fallback):
+        # its cut point, and ranks for values below, equal to and above it
+        bucket = self._bucket(cuts)
+        ids = np.arange(self._buckets + 2)
+        first = np.searchsorted(bucket, ids, side='left')
+        end = np.searchsorted(bucket, ids, side='right')
+        has_cut = end > first
+        self._cut = np.where(has_cut, cuts[np.minimum(first, m - 1)], np.inf)
+        self._crowded = has_cut & (cuts[np.maximum(end - 1, 0)] != self._cut)
+        self._crowded[-1] = True
+        self._ranks = np.column_stack([2 * first, first + end, 2 * end]).ravel() / (2 * m)
+
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        if not self._buckets:
+            return (values >= self._low).astype(np.intp)
+        # Clipped to at least 0, so truncating to an integer rounds down
+        position = np.clip((values - self._low) * self._scale + 1, 0, self._buckets + 1)
+        return position.astype(np.intp)
+
+    def _exact(self, values: np.ndarray) -> np.ndarray:
+        below = np.searchsorted(self.cuts, values, side='left')
+        through = np.searchsorted(self.cuts, values, side='right')
+        return (below + through) / (2 * len(self.cuts))
+
+    def ranks(self, values: np.ndarray) -> np.ndarray:
+        """Mid-rank percentiles (0 to 1) of ``values`` among the cut points.
+
+        Values missing (NaN) get 0.5, the median; with no cut points every
+        value gets 0, so the feature cannot reorder anything.
+        """
+        if not len(self.cuts):
+            return np.zeros(len(values))
+        finite = np.isfinite(values)
+        known = values if finite.all() else np.where(finite, values, self._low)
+        bucket = self._bucket(known)
+        cut = self._cut.take(bucket)
+        # Each bucket's ranks for values below, equal to and above its cut
+        ranks = self._ranks.take(3 * bucket + (known >= cut) + (known > cut))
+        crowded = self._crowded.take(bucket)
+        if crowded.any():
+            ranks[crowded] = self._exact(known[crowded])
+        ranks[~finite] = 0.5
+        return ranks
+
+
+class RankingEngine:
+    """Incrementally maintained composite-score ranking over a quote universe.
+
+    Each symbol holds ``volume``, ``change_pct``, ``avg_volume`` and
+    ``mentions`` in NumPy columns, transformed into FEATURES:
+
+        volume           log10(1 + volume)
+        change_pct       percent change
+        abs_change_pct   |percent change|
+        relative_volume  log2(volume / avg_volume)
+        mentions         log10(1 + StockTwits mentions)
+
+    The composite score is the weighted sum of each feature's percentile
+    rank (0 to 1) within the universe, so features on different scales
+    weigh what their weights say and a single +231% mover cannot swamp
+    the rest. A missing value counts as the median. Percentiles are read
+    off about a hundred quantile cut points per feature (see
+    ``QuantileReference``), so fitting and scoring stay linear in the
+    universe size and nothing is fully sorted.
+
+    ``top`` selects with argpartition instead of sorting the universe and
+    caches its answer. The quantile references are fitted on the whole
+    universe and kept while quotes change; updating quotes rescores only
+    the changed rows against them, and the cached top-K is reused when none
+    of those rows enters or leaves it, so re-ranking after a partial update
+    costs O(changed) rather than O(n). Once more than
+    ``refit_after`` of the universe has changed since the last fit, the
+    next ranking refits and rescores everything.
+    """
+
+    COLUMNS = ('volume', 'change_pct', 'avg_volume', 'mentions')
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, capacity: int = 1024,
+                 refit_after: float = 0.25):
+        """Initialize the engine.
+
+        Args:
+            weights: Feature weights (see FEATURES); DEFAULT_WEIGHTS if omitted
+            capacity: Initial number of rows allocated (grows as needed)
+            refit_after: Fraction of the universe that may change before the
+                quantile references are refitted
+        """
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown ranking features {sorted(unknown)}; expected {FEATURES}")
+        self.weights = weights
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._columns = {name: np.full(capacity, np.nan) for name in self.COLUMNS}
+        self._scores = np.full(capacity, np.nan)
+        self.refit_after = refit_after
+        # Quantile cut points of each weighted feature, or None until fitted
+        self._reference: Optional[Dict[str, QuantileReference]] = None
+        self._changed_since_fit = 0
+        # Cached composite top-K: (k, indices, k-th score) or None
+        self._top: Optional[Tuple[int, np.ndarray, float]] = None
+        self.stats = {'rescored': 0, 'fits': 0, 'full_selections': 0, 'cached_selections': 0}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def _row(self, symbol: str) -> int:
+        index = self._index.get(symbol)
+        if index is not None:
+            return index
+        index = len(self.symbols)
+        if index == len(self._scores):
+            grow = max(len(self._scores), 1024)
+            for name, column in self._columns.items():
+                self._columns[name] = np.concatenate([column, np.full(grow, np.nan)])
+            self._scores = np.concatenate([self._scores, np.full(grow, np.nan)])
+        self.symbols.append(symbol)
+        self._index[symbol] = index
+        return index
+
+    def column(self, name: str) -> np.ndarray:
+        """A raw column ('volume', 'change_pct', 'avg_volume', 'mentions') over all symbols."""
+        return self._columns[name][:len(self.symbols)]
+
+    def feature(self, name: str) -> np.ndarray:
+        """A transformed feature (see FEATURES) over all symbols; NaN where unknown."""
+        return self._feature(name, slice(0, len(self.symbols)))
+
+    def _feature(self, name: str, rows) -> np.ndarray:
+        columns = self._columns
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if name == 'volume':
+                return np.log10(1 + columns['volume'][rows])
+            if name == 'change_pct':
+                return columns['change_pct'][rows]
+            if name == 'abs_change_pct':
+                return np.abs(columns['change_pct'][rows])
+            if name == 'relative_volume':
+                ratio = columns['volume'][rows] / columns['avg_volume'][rows]
+                return np.log2(np.where(ratio > 0, ratio, np.nan))
+            if name == 'mentions':
+                return np.log10(1 + columns['mentions'][rows])
+        raise ValueError(f"Unknown ranking feature {name!r}; expected one of {FEATURES}")
+
+    def _fit(self):
+        """Fit the quantile references on the whole universe and rescore it."""
+        n = len(self.symbols)
+        rows = slice(0, n)
+        self._reference = {name: QuantileReference(self._feature(name, rows)) for name in self.weights}
+        self._rescore(rows)
+        self._changed_since_fit = 0
+        self.stats['fits'] += 1
+        self.stats['rescored'] += n
+        self._top = None
+
+    def _rescore(self, rows):
+        """Recompute composite scores for ``rows`` (an index array or slice)."""
+        total = None
+        for name, weight in self.weights.items():
+            contribution = self._reference[name].ranks(self._feature(name, rows)) * weight
+            total = contribution if total is None else total + contribution
+        if total is None:
+            total = 0.0
+        self._scores[rows] = total
+
+    def update(self, symbol: str, volume: Optional[float] = None, change_pct: Optional[float] = None,
+               avg_volume: Optional[float] = None, mentions: Optional[float] = None):
+        """Set fields for one symbol (omitted fields keep their value)."""
+        self.update_many([{'symbol': symbol, 'volume': volume, 'change_pct': change_pct,
+                           'avg_volume': avg_volume, 'mentions': mentions}])
+
+    def update_many(self, records: Iterable[Dict]) -> int:
+        """Set fields for many symbols and rescore only those rows.
+
+        Args:
+            records: Dicts with 'symbol' and any of the COLUMNS (None or
+                missing keys leave the current value)
+
+        Returns:
+            Number of rows updated
+        """
+        rows = []
+        for record in records:
+            symbol = record.get('symbol')
+            if not symbol:
+                continue
+            row = self._row(symbol)
+            for name in self.COLUMNS:
+                value = record.get(name)
+                if value is not None:
+                    self._columns[name][row] = value
+            rows.append(row)
+        if rows:
+            self._invalidate(np.unique(np.asarray(rows, dtype=np.intp)))
+        return len(rows)
+
+    def set_mentions(self, counts: Dict[str, int]):
+        """Replace mention counts; symbols not in ``counts`` drop to zero mentions."""
+        previous = np.flatnonzero(self._columns['mentions'][:len(self.symbols)] > 0)
+        rows = np.fromiter((self._row(symbol) for symbol in counts), dtype=np.intp, count=len(counts))
+        # Fetched after _row, which may grow the columns
+        mentions = self._columns['mentions']
+        mentions[:len(self.symbols)] = 0
+        mentions[rows] = list(counts.values())
+        changed = np.union1d(previous, rows)
+        if len(changed):
+            self._invalidate(changed)
+
+    def _invalidate(self, rows: np.ndarray):
+        """Rescore ``rows`` and drop the cached top-K if they could change it."""
+        self._changed_since_fit += len(rows)
+        if self._reference is not None and self._changed_since_fit > self.refit_after * len(self.symbols):
+            self._reference = None
+        if self._reference is None:
+            # Refitted (and fully rescored) on the next ranking
+            self._top = None
+            return
+        self._rescore(rows)
+        self.stats['rescored'] += len(rows)
+        if self._top is None:
+            return
+        k, top, threshold = self._top
+        if len(top) < k or np.isin(rows, top).any():
+            self._top = None
+            return
+        # Rows outside the top-K only matter if they now reach its boundary
+        after = self._scores[rows]
+        if (after >= threshold).any():
+            self._top = None
+
+    def rescore(self):
+        """Refit the quantile references and recompute every score (e.g. after changing ``weights``)."""
+        self._fit()
+
+    def scores(self) -> np.ndarray:
+        """Composite scores aligned with ``symbols``."""
+        if self._reference is None:
+            self._fit()
+        return self._scores[:len(self.symbols)]
+
+    def top(self, k: int = 10, by: Optional[str] = None, descending: bool = True) -> List[Tuple[str, float]]:
+        """The ``k`` best symbols.
+
+        Args:
+            k: Number of symbols
+            by: Rank by this feature (see FEATURES) or raw column instead of
+                the composite score; symbols without a value are left out
+            descending: Largest first (False ranks ascending, e.g. losers
+                with ``by='change_pct'``)
+
+        Returns:
+            List of (symbol, value) pairs, best first
+        """
+        if by is None and descending:
+            indices = self._top_composite(k)
+            values = self._scores
+        elif by is None:
+            values = self.scores()
+            indices = top_k_indices(values, k, descending=descending)
+        else:
+            values = self.column(by) if by in self._columns else self.feature(by)
+            known = np.count_nonzero(~np.isnan(values))
+            indices = top_k_indices(values, min(k, known), descending=descending)
+        return [(self.symbols[i], float(values[i])) for i in indices]
+
+    def _top_composite(self, k: int) -> np.ndarray:
+        cached = self._top
+        if cached is not None and cached[0] >= k:
+            self.stats['cached_selections'] += 1
+            return cached[1][:k]
+        scores = self.scores()
+        self.stats['full_selections'] += 1
+        indices = top_k_indices(scores, k)
+        threshold = float(self._scores[indices[-1]]) if len(indices) else -math.inf
+        self._top = (k, indices, threshold)
+        return indices
+
+    def ranked_quotes(self, quotes: Dict[str, Dict], k: int = 10, **kwargs) -> List[Dict]:
+        """Top-K raw quote dicts, each with its 'score' (see ``top``).
+
+        Args:
+            quotes: Raw quote dicts by symbol
+            k: Number of quotes
+            **kwargs: Passed to ``top``
+
+        Returns:
+            Quote dicts, best first (symbols missing from ``quotes`` are skipped)
+        """
+        return [dict(quotes[symbol], score=score) for symbol, score in self.top(k, **kwargs)
+                if symbol in quotes]
+
+
+def rank_quotes(quotes: Iterable[Dict], k: int = 10, weights: Optional[Dict[str, float]] = None,
+                mentions: Optional[Dict[str, int]] = None, by: Optional[str] = None,
+                descending: bool = True) -> List[Dict]:
+    """One-shot composite ranking of raw quote dicts.
+
+    Args:
+        quotes: Raw quote dicts ('symbol', 'volume', 'change' and optionally
+            'avg_volume'), as produced by MarketDataFetcher
+        k: Number of quotes to return
+        weights: Feature weights (see FEATURES)
+        mentions: StockTwits mention counts by symbol
+        by: Rank by this feature or raw column instead of the composite score
+        descending: Largest first (False for e.g. losers by 'change_pct')
+
+    Returns:
+        Top ``k`` quote dicts with a 'score' (the ranked value), best first
+
+    Raises:
+        ValueError: For unknown features, or when ranking ``by`` a feature
+            none of the quotes has (e.g. 'relative_volume' without 'avg_volume')
+    """
+    from quotes import parse_change, parse_volume
+
+    by_symbol = {}
+    records = []
+    for quote in quotes:
+        symbol = quote.get('symbol')
+        if not symbol:
+            continue
+        by_symbol[symbol] = quote
+        records.append({
+            'symbol': symbol,
+            'volume': parse_volume(quote.get('volume')),
+            'change_pct': parse_change(quote.get('change', quote.get('change_pct'))),
+            'avg_volume': parse_volume(quote.get('avg_volume')),
+            'mentions': (mentions or {}).get(symbol, 0),
+        })
+    engine = RankingEngine(weights, capacity=max(len(records), 1))
+    engine.update_many(records)
+    ranked = engine.ranked_quotes(by_symbol, k, by=by, descending=descending)
+    if by is not None and records and k > 0 and not ranked:
+        raise ValueError(f"No quote has a value for {by!r}")
+    return ranked
@@ -0,0 +1,114 @@
+"""Token-bucket rate limiting driven by API rate-limit headers."""
+
+import threading
+import time
+from typing import Callable, Mapping, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that adapts to server rate-limit headers.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    After each response the bucket reads the ``X-RateLimit-Remaining`` /
+    ``X-RateLimit-Reset`` headers (and ``Retry-After`` on 429s), so an
+    exhausted server budget pauses every caller until the window resets.
+    """
+
+    REMAINING_HEADER = 'X-RateLimit-Remaining'
+    RESET_HEADER = 'X-RateLimit-Reset'
+    RETRY_AFTER_HEADER = 'Retry-After'
+
+    def __init__(self, rate: float = 2.0, capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+            clock: Monotonic clock used for refills
+            wall_clock: Epoch clock used to interpret reset headers
+            sleep: Sleep function used while waiting for tokens
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last refill."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available and consume them.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            Total seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Adjust the bucket from a response's rate-limit headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping from requests)
+        """
+        if not headers:
+            return
+
+        remaining = _parse_number(headers.get(self.REMAINING_HEADER))
+        reset = _parse_number(headers.get(self.RESET_HEADER))
+        retry_after = _parse_number(headers.get(self.RETRY_AFTER_HEADER))
+
+        with self._lock:
+            now = self._clock()
+            if remaining is not None:
+                # Never burst past what the server says is left
+                self._tokens = min(self._tokens, max(remaining, 0.0))
+                if remaining <= 0 and reset is not None:
+                    delay = max(0.0, reset - self._wall_clock())
+                    self._blocked_until = max(self._blocked_until, now + delay)
+                    logger.warning(f"Rate limit exhausted, pausing {delay:.1f}s until reset")
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                logger.warning(f"Server requested Retry-After {retry_after:.1f}s")
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric header value, returning None if absent or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,223 @@
+"""Record HTTP traffic to compressed JSON lines and replay it offline."""
+
+import base64
+import gzip
+import http.client
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import logging
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Query parameters carrying credentials; never written to a recording
+SECRET_PARAMS = frozenset({'token', 'apikey', 'api_key', 'access_token'})
+# Headers that describe the wire encoding rather than the stored body
+_WIRE_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'})
+
+
+class ReplayMissError(requests.ConnectionError):
+    """Raised when a replayed request has no recorded response left."""
+
+
+def request_key(method: str, url: str) -> str:
+    """Canonical form of a request: method plus URL with sorted, credential-free query."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SECRET_PARAMS)
+    return f"{method} {urlunsplit(parts._replace(query=urlencode(query), fragment=''))}"
+
+
+def _encode_body(body: bytes) -> Tuple[str, str]:
+    try:
+        return body.decode('utf-8'), 'text'
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode('ascii'), 'base64'
+
+
+def _decode_body(record: Dict) -> bytes:
+    if record.get('encoding') == 'base64':
+        return base64.b64decode(record['body'])
+    return record['body'].encode('utf-8')
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter that appends every exchange to a gzip JSON-lines file.
+
+    Each line holds the wall-clock time, the request (method and URL with
+    credentials stripped), and the response status, headers, body and
+    latency. Records are written as responses arrive, so a long run streams
+    to disk instead of accumulating in memory, and appending to an existing
+    file adds another gzip member that readers see as one stream.
+    """
+
+    def __init__(self, adapter: BaseAdapter, path: str, clock: Callable[[], float] = time.time):
+        """Initialize the adapter.
+
+        Args:
+            adapter: Adapter that performs the requests
+            path: Recording file (``.jsonl.gz``), appended to
+            clock: Wall clock (epoch seconds), injectable for tests
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self.recorded = 0
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        started = self._clock()
+        start = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        body, encoding = _encode_body(response.content)
+        record = {
+            't': started,
+            'key': request_key(request.method, request.url),
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS},
+            'body': body,
+            'encoding': encoding,
+            'elapsed': round(time.perf_counter() - start, 6),
+        }
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self.recorded += 1
+        return response
+
+    def flush(self):
+        """Flush buffered records so the file is readable while still recording."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """Finish the gzip stream and close the wrapped adapter."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.adapter.close()
+
+
+def iter_recordings(paths: Union[str, Iterable[str]]) -> Iterator[Dict]:
+    """Stream records from one or more recording files, in file order.
+
+    Args:
+        paths: Recording file or files (oldest first)
+
+    Yields:
+        Record dictionaries as written by RecordingAdapter
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except EOFError:
+            # A recorder that was killed leaves a truncated final member
+            logger.warning(f"Recording {path} is truncated; replaying what was complete")
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers requests from recorded traffic.
+
+    Requests are matched on method and canonical URL; repeated requests for
+    the same URL (polls) get the recorded responses in order. The recording
+    is read lazily, only as far as needed to find the next match, so a
+    client that asks in roughly the recorded order replays weeks of
+    traffic with a small lookahead buffer.
+
+    With ``speed=None`` responses are served as fast as they are asked
+    for. Otherwise each response is held until its recorded offset from the
+    first request, divided by ``speed``, has elapsed (``speed=1.0`` replays
+    in real time, ``10.0`` ten times faster).
+    """
+
+    def __init__(self, paths: Union[str, Iterable[str]], speed: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize the adapter.
+
+        Args:
+            paths: Recording file or files (oldest first)
+            speed: Replay speed multiplier, or None for no pacing
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        super().__init__()
+        self.speed = speed
+        self._clock = clock
+        self._sleep = sleep
+        self._records = iter_recordings(paths)
+        self._pending: Dict[str, Deque[Dict]] = {}
+        self._lock = threading.Lock()
+        self._origin: Optional[Tuple[float, float]] = None
+        self.stats = {'replayed': 0, 'misses': 0, 'buffered': 0}
+
+    def _next_for(self, key: str) -> Optional[Dict]:
+        """Pop the next recorded response for ``key``, reading ahead as needed (lock held)."""
+        queue = self._pending.get(key)
+        while not queue:
+            record = next(self._records, None)
+            if record is None:
+                return None
+            self._pending.setdefault(record['key'], deque()).append(record)
+            self.stats['buffered'] += 1
+            queue = self._pending.get(key)
+        self.stats['buffered'] -= 1
+        return queue.popleft()
+
+    def _delay(self, recorded_at: float) -> float:
+        """Seconds to hold a response recorded at ``recorded_at`` (lock held)."""
+        if self.speed is None:
+            return 0.0
+        now = self._clock()
+        if self._origin is None:
+            self._origin = (now, recorded_at)
+        started, first_recorded = self._origin
+        return started + (recorded_at - first_recorded) / self.speed - now
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        key = request_key(request.method, request.url)
+        with self._lock:
+            record = self._next_for(key)
+            if record is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['replayed'] += 1
+                delay = self._delay(record['t'])
+        if record is None:
+            raise ReplayMissError(f"No recorded response left for {key}", request=request)
+        if delay > 0:
+            self._sleep(delay)
+
+        response = Response()
+        response.status_code = record['status']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = _decode_body(record)
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.reason = http.client.responses.get(record['status'], '')
+        return response
+
+    def close(self):
+        """Stop reading the recording."""
+        self._records.close()
@@ -1,9 +1,18 @@
 """Scraper for fetching StockTwits community posts."""
 
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
-import time
+
+from cursor_store import CursorStore
+from dedup import SeenSet
+from http_cache import ResponseCache
+from metrics import timed
+from rate_limit import TokenBucket
+from timestamps import parse_timestamp
+from transport import Transport, client_transport
+from universe import TickerUniverse
 
 logger = logging.getLogger(__name__)
 
@@ -14,18 +23,78 @@ class StockTwitsScraper:
     BASE_URL = "https://api.stocktwits.com/api/v3"
     WEB_URL = "https://stocktwits.com"
     
-    def __init__(self, timeout: int = 10):
+    # Default freshness lifetimes (seconds) per endpoint when a cache is used
+    CACHE_TTLS = {
+        r'/trending/symbols': 60,
+        r'/symbols/trending': 60,
+        r'/symbols/[^/]+/sentiment': 300,
+        r'/symbols/[^/]+/messages': 15,
+    }
+    
+    def __init__(self, timeout: int = 10, rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[ResponseCache] = None, transport: Optional[Transport] = None,
+                 seen: Optional[SeenSet] = None, universe: Optional[TickerUniverse] = None):
         """Initialize the scraper.
         
         Args:
             timeout: Request timeout in seconds
+            rate_limiter: Shared token bucket for all API calls (defaults to
+                2 requests/second, which matches the old fixed 0.5s sleep)
+            cache: Optional response cache; fresh hits skip the network and
+                the rate limiter, stale entries are revalidated (used only
+                when no transport is given)
+            transport: HTTP transport to use (defaults to the process-wide
+                shared transport, or a private one wrapping ``cache``; a
+                cache is rejected while the shared transport records or
+                replays, since the private transport would bypass it)
+            seen: Message ids already collected; when given, repeat
+                messages (across symbols and polls) are dropped from
+                ``collect_community_data`` results
+            universe: Known tickers; when given, ``collect_community_data``
+                skips trending symbols it does not list (crypto pairs,
+                delisted names) instead of requesting their streams, and
+                tags the rest with their exchange and type
         """
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.seen = seen
+        self.universe = universe
+        self.rate_limiter = rate_limiter or TokenBucket(rate=2.0, capacity=1.0)
+        self._owns_transport = transport is None and cache is not None
+        if transport is None:
+            transport = client_transport(cache)
+        self.transport = transport
+        self.session = transport.session
+        self.cache = transport.cache
+        if self.cache is not None:
+            self.cache.set_default_ttls(self.CACHE_TTLS)
+    
+    def _get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """Issue a rate-limited GET and feed the response headers back to the limiter.
+        
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            
+        Returns:
+            Successful response
+        """
+        if not self.transport.replaying and not self._is_cached(url, params):
+            self.rate_limiter.acquire()
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        # Cached headers describe an old quota, not this (unsent) request
+        if not getattr(response, 'from_cache', False):
+            self.rate_limiter.update_from_headers(response.headers)
+        response.raise_for_status()
+        return response
+    
+    def _is_cached(self, url: str, params: Optional[Dict]) -> bool:
+        """Check whether a GET would be answered from the fresh cache."""
+        if self.cache is None:
+            return False
+        prepared = requests.Request('GET', url, params=params).prepare()
+        return self.cache.is_fresh(prepared.url)
     
+    @timed('scraper.get_trending_symbols')
     def get_trending_symbols(self) -> Optional[List[Dict]]:
         """Fetch trending symbols from StockTwits.
         
@@ -34,14 +103,14 @@ class StockTwitsScraper:
         """
         try:
             url = f"{self.BASE_URL}/trending/symbols"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get(url)
             data = response.json()
             return data.get("symbols", [])
         except requests.RequestException as e:
             logger.error(f"Error fetching trending symbols: {e}")
             return None
     
+    @timed('scraper.get_symbol_sentiment')
     def get_symbol_sentiment(self, symbol: str) -> Optional[Dict]:
         """Fetch sentiment data for a symbol.
         
@@ -53,13 +122,13 @@ class StockTwitsScraper:
         """
         try:
             url = f"{self.BASE_URL}/symbols/{symbol}/sentiment"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get(url)
             return response.json()
         except requests.RequestException as e:
             logger.error(f"Error fetching sentiment for {symbol}: {e}")
             return None
     
+    @timed('scraper.get_most_mentioned_symbols')
     def get_most_mentioned_symbols(self, limit: int = 30) -> Optional[List[Dict]]:
         """Fetch most mentioned symbols from the community.
         
@@ -72,14 +141,14 @@ class StockTwitsScraper:
         try:
             url = f"{self.BASE_URL}/symbols/trending"
             params = {'limit': limit}
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get(url, params=params)
             data = response.json()
             return data.get("symbols", [])
         except requests.RequestException as e:
             logger.error(f"Error fetching most mentioned symbols: {e}")
             return None
     
+    @timed('scraper.get_recent_posts')
     def get_recent_posts(self, symbol: str, limit: int = 30) -> Optional[List[Dict]]:
         """Fetch recent posts for a specific symbol.
         
@@ -93,19 +162,225 @@ class StockTwitsScraper:
         try:
             url = f"{self.BASE_URL}/symbols/{symbol}/messages"
             params = {'limit': limit}
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
+            response = self._get(url, params=params)
             data = response.json()
             return data.get("messages", [])
         except requests.RequestException as e:
             logger.error(f"Error fetching posts for {symbol}: {e}")
             return None
     
-    def collect_community_data(self, num_symbols: int = 20) -> Dict[str, List]:
+    def _fetch_messages_page(self, symbol: str, params: Dict) -> Optional[Dict]:
+        """Fetch one raw page of the symbol message stream.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            params: Query parameters ('limit', 'max', 'since')
+            
+        Returns:
+            Response payload with 'messages' and 'cursor', or None if request fails
+        """
+        try:
+            url = f"{self.BASE_URL}/symbols/{symbol}/messages"
+            return self._get(url, params=params).json()
+        except requests.RequestException as e:
+            logger.error(f"Error fetching message page for {symbol}: {e}")
+            return None
+    
+    def iter_message_pages(self, symbol: str, limit: int = 30, max_id: Optional[int] = None,
+                           since_id: Optional[int] = None, max_pages: Optional[int] = None,
+                           max_messages: Optional[int] = None,
+                           until: Optional[float] = None) -> Iterator[List[Dict]]:
+        """Lazily page backwards through a symbol's message stream.
+        
+        Each page holds messages newest-first. Paging follows the API's
+        'max' cursor and stops when the stream is exhausted or any bound is
+        reached. Pages are only requested as the caller iterates.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            limit: Messages per page
+            max_id: Only return messages with id <= max_id (resume point)
+            since_id: Only return messages with id > since_id (incremental poll)
+            max_pages: Stop after this many pages
+            max_messages: Stop after this many messages
+            until: Stop at messages created before this epoch time
+            
+        Yields:
+            Lists of raw message dicts
+        """
+        pages = 0
+        yielded = 0
+        cursor_max = max_id
+        
+        while max_pages is None or pages < max_pages:
+            params = {'limit': limit}
+            if cursor_max is not None:
+                params['max'] = cursor_max
+            if since_id is not None:
+                params['since'] = since_id
+            
+            data = self._fetch_messages_page(symbol, params)
+            if not data:
+                return
+            messages = data.get('messages', [])
+            if since_id is not None:
+                messages = [m for m in messages if m.get('id', 0) > since_id]
+            if not messages:
+                return
+            pages += 1
+            
+            done = False
+            if until is not None:
+                kept = [m for m in messages if (parse_timestamp(m.get('created_at')) or until) >= until]
+                done = len(kept) < len(messages)
+                messages = kept
+            if max_messages is not None and yielded + len(messages) >= max_messages:
+                messages = messages[:max_messages - yielded]
+                done = True
+            
+            if messages:
+                yielded += len(messages)
+                yield messages
+            
+            cursor = data.get('cursor') or {}
+            if done or cursor.get('more') is False:
+                return
+            next_max = cursor.get('max') or min(m.get('id', 0) for m in data['messages']) - 1
+            if cursor_max is not None and next_max >= cursor_max:
+                return
+            cursor_max = next_max
+    
+    def backfill_messages(self, symbol: str, cursors: CursorStore, limit: int = 30,
+                          max_pages: Optional[int] = None, max_messages: Optional[int] = None,
+                          until: Optional[float] = None) -> Iterator[List[Dict]]:
+        """Page deeper into history, resuming below the oldest message already read.
+        
+        The cursor store is updated after every page, so an interrupted
+        backfill continues where it stopped.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            cursors: Persisted per-symbol cursors
+            limit: Messages per page
+            max_pages: Stop after this many pages
+            max_messages: Stop after this many messages
+            until: Stop at messages created before this epoch time
+            
+        Yields:
+            Lists of raw message dicts, newest-first
+        """
+        oldest = cursors.oldest(symbol)
+        max_id = oldest - 1 if oldest is not None else None
+        for page in self.iter_message_pages(symbol, limit=limit, max_id=max_id, max_pages=max_pages,
+                                            max_messages=max_messages, until=until):
+            ids = [m['id'] for m in page if 'id' in m]
+            if ids:
+                cursors.record(symbol, newest=max(ids), oldest=min(ids))
+            yield page
+    
+    @timed('scraper.poll_new_messages')
+    def poll_new_messages(self, symbol: str, cursors: CursorStore, limit: int = 30,
+                          max_pages: Optional[int] = None) -> List[Dict]:
+        """Fetch only messages newer than the last one seen for a symbol.
+        
+        When ``max_pages`` stops a poll before it reaches the last seen
+        message, the skipped id range is kept as a gap in ``cursors``; later
+        polls read the gap (sharing the same page cap) before asking for
+        anything newer, so no message is lost to the cap.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            cursors: Persisted per-symbol cursors
+            limit: Messages per page
+            max_pages: Cap on pages per poll (first poll with no cursor
+                defaults to a single page)
+            
+        Returns:
+            New raw message dicts, newest-first
+        """
+        since_id = cursors.newest(symbol)
+        if since_id is None and max_pages is None:
+            max_pages = 1
+        
+        older = []
+        gap = cursors.gap(symbol)
+        if gap is not None:
+            after, through = gap
+            older, pages = self._read_pages(symbol, limit=limit, max_id=through, since_id=after,
+                                            max_pages=max_pages)
+            if max_pages is not None and pages >= max_pages:
+                # Out of pages: shrink the gap and leave newer messages for later
+                ids = [m['id'] for m in older if 'id' in m]
+                if ids:
+                    remaining = min(ids) - 1
+                    cursors.set_gap(symbol, (after, remaining) if remaining > after else None)
+                return older
+            cursors.set_gap(symbol, None)
+            if max_pages is not None:
+                max_pages -= pages
+        
+        messages, pages = self._read_pages(symbol, limit=limit, since_id=since_id, max_pages=max_pages)
+        ids = [m['id'] for m in messages if 'id' in m]
+        if ids:
+            cursors.record(symbol, newest=max(ids), oldest=None if since_id is not None else min(ids))
+            capped = since_id is not None and max_pages is not None and pages >= max_pages
+            if capped and min(ids) - 1 > since_id:
+                cursors.set_gap(symbol, (since_id, min(ids) - 1))
+        return messages + older
+    
+    def _read_pages(self, symbol: str, **kwargs) -> Tuple[List[Dict], int]:
+        """All messages from ``iter_message_pages`` and the number of pages they took."""
+        messages = []
+        pages = 0
+        for page in self.iter_message_pages(symbol, **kwargs):
+            messages.extend(page)
+            pages += 1
+        return messages, pages
+    
+    def _collect_symbol_messages(self, symbol: str) -> List[Dict]:
+        """Fetch recent posts for one symbol and flatten them into message records.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            
+        Returns:
+            List of message records for the symbol
+        """
+        logger.info(f"Fetching posts for {symbol}...")
+        posts = self.get_recent_posts(symbol, limit=10)
+        
+        messages = []
+        for post in posts or []:
+            message = post.get('body', '')
+            if message:
+                messages.append({
+                    'id': post.get('id'),
+                    'symbol': symbol,
+                    'message': message,
+                    'timestamp': post.get('created_at', ''),
+                    'sentiment': self._message_sentiment(post)
+                })
+        return messages
+    
+    @staticmethod
+    def _message_sentiment(post: Dict) -> Optional[str]:
+        """The author's 'Bullish'/'Bearish' tag on a post, or None if untagged."""
+        sentiment = (post.get('entities') or {}).get('sentiment') or {}
+        return sentiment.get('basic')
+    
+    @timed('scraper.collect_community_data')
+    def collect_community_data(self, num_symbols: int = 20, max_workers: int = 1) -> Dict[str, List]:
         """Collect data from top trending symbols and their recent posts.
         
+        Requests are paced by ``self.rate_limiter``; with ``max_workers > 1``
+        up to that many symbol requests are in flight at once. Messages are
+        always returned in trending-symbol order.
+        With a seen-set, each message is returned at most once: under the
+        first trending symbol it appears for, and not again on later polls.
+        
         Args:
             num_symbols: Number of trending symbols to analyze
+            max_workers: Maximum number of concurrent post requests
             
         Returns:
             Dictionary with symbols and their post messages
@@ -122,35 +397,54 @@ class StockTwitsScraper:
             logger.info(f"Found {len(trending)} trending symbols")
             result['symbols'] = trending
             
+            if self.universe is not None:
+                trending = self._filter_known(trending)
+                result['symbols'] = trending
+            
+            symbols = [s.get('symbol', '') for s in trending if s.get('symbol', '')]
+            
             # Collect recent posts from each symbol
-            for symbol_data in trending:
-                symbol = symbol_data.get('symbol', '')
-                if not symbol:
-                    continue
-                
-                logger.info(f"Fetching posts for {symbol}...")
-                posts = self.get_recent_posts(symbol, limit=10)
-                
-                if posts:
-                    for post in posts:
-                        message = post.get('body', '')
-                        if message:
-                            result['messages'].append({
-                                'symbol': symbol,
-                                'message': message,
-                                'timestamp': post.get('created_at', '')
-                            })
-                
-                # Rate limiting
-                time.sleep(0.5)
+            if max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    batches = list(executor.map(self._collect_symbol_messages, symbols))
+            else:
+                batches = [self._collect_symbol_messages(symbol) for symbol in symbols]
+            
+            # Dedup after gathering, in trending order, so results do not
+            # depend on which worker finished first
+            duplicates = 0
+            for messages in batches:
+                for message in messages:
+                    if self.seen is not None and self.seen.check(message.get('id')):
+                        duplicates += 1
+                        continue
+                    result['messages'].append(message)
             
             logger.info(f"Collected {len(result['messages'])} messages")
+            if self.seen is not None:
+                self.seen.save()
+                logger.info(f"Skipped {duplicates} duplicate messages "
+                            f"(dedup rate {self.seen.dedup_rate:.1%}, {len(self.seen)} ids remembered)")
             return result
             
         except Exception as e:
             logger.error(f"Error collecting community data: {e}")
             return result
     
+    def _filter_known(self, trending: List[Dict]) -> List[Dict]:
+        """Keep trending entries listed in the universe, annotated with its metadata."""
+        known = []
+        for entry in trending:
+            info = self.universe.lookup(entry.get('symbol') or '')
+            if info is None:
+                logger.debug(f"Skipping {entry.get('symbol')!r}: not in the ticker universe")
+                continue
+            known.append(dict(entry, exchange=info.exchange, type=info.type))
+        if len(known) < len(trending):
+            logger.info(f"Skipped {len(trending) - len(known)} trending symbols not in the ticker universe")
+        return known
+    
     def close(self):
-        """Close the session."""
-        self.session.close()
+        """Close the session if this client owns it (the shared transport stays open)."""
+        if self._owns_transport:
+            self.transport.close()
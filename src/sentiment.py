@@ -0,0 +1,91 @@
+"""Per-symbol sentiment aggregation over collected StockTwits messages."""
+
+from typing import Dict, Iterable, Optional, Union
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_COLUMNS = ['id', 'symbol', 'timestamp', 'sentiment']
+SENTIMENT_COLUMNS = ['messages', 'bullish', 'bearish', 'bullish_ratio', 'bearish_ratio',
+                     'velocity', 'momentum']
+
+
+def messages_frame(messages: Iterable[Dict]) -> pd.DataFrame:
+    """Load message records (as produced by ``collect_community_data``) into a frame.
+
+    Args:
+        messages: Dicts with 'symbol', 'timestamp' and 'sentiment' (and 'id')
+
+    Returns:
+        DataFrame with one row per message and a UTC ``timestamp`` column
+        (NaT where the time is missing or unparseable)
+    """
+    frame = pd.DataFrame.from_records(list(messages), columns=MESSAGE_COLUMNS)
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True, errors='coerce')
+    return frame
+
+
+def aggregate_sentiment(messages: Union[pd.DataFrame, Iterable[Dict]], window_seconds: float = 3600.0,
+                        now: Optional[float] = None) -> pd.DataFrame:
+    """Compute per-symbol sentiment statistics in one grouped pass.
+
+    Only messages their authors tagged Bullish or Bearish count toward the
+    ratios and momentum; untagged messages still count toward volume and
+    velocity.
+
+    Args:
+        messages: Message records or a frame from ``messages_frame``
+        window_seconds: Length of the recent window used for velocity and momentum
+        now: End of the recent window as epoch seconds (defaults to the
+            newest message, so archived corpora aggregate the same way)
+
+    Returns:
+        DataFrame indexed by symbol, busiest first, with columns:
+        messages, bullish, bearish (counts), bullish_ratio, bearish_ratio
+        (share of tagged messages, NaN if none are tagged), velocity
+        (messages per hour in the recent window) and momentum (mean net
+        sentiment, +1 bullish / -1 bearish, in the recent window minus the
+        window before it; NaN if either window has no tagged messages)
+    """
+    frame = messages if isinstance(messages, pd.DataFrame) else messages_frame(messages)
+    if frame.empty:
+        return pd.DataFrame(columns=SENTIMENT_COLUMNS, index=pd.Index([], name='symbol'))
+
+    end = pd.Timestamp(now, unit='s', tz='UTC') if now is not None else frame['timestamp'].max()
+    age = (end - frame['timestamp']).dt.total_seconds()
+    bullish = frame['sentiment'].eq('Bullish')
+    bearish = frame['sentiment'].eq('Bearish')
+    tagged = bullish | bearish
+    score = bullish.astype('int8') - bearish.astype('int8')
+    recent = (age >= 0) & (age < window_seconds)
+    previous = (age >= window_seconds) & (age < 2 * window_seconds)
+
+    grouped = pd.DataFrame({
+        'symbol': frame['symbol'],
+        'bullish': bullish,
+        'bearish': bearish,
+        'recent': recent,
+        'recent_score': score.where(recent & tagged),
+        'previous_score': score.where(previous & tagged),
+    }).groupby('symbol', sort=False).agg(
+        messages=('bullish', 'size'),
+        bullish=('bullish', 'sum'),
+        bearish=('bearish', 'sum'),
+        recent=('recent', 'sum'),
+        recent_score=('recent_score', 'mean'),
+        previous_score=('previous_score', 'mean'),
+    )
+
+    total_tagged = (grouped['bullish'] + grouped['bearish']).where(lambda n: n > 0)
+    result = pd.DataFrame({
+        'messages': grouped['messages'],
+        'bullish': grouped['bullish'],
+        'bearish': grouped['bearish'],
+        'bullish_ratio': grouped['bullish'] / total_tagged,
+        'bearish_ratio': grouped['bearish'] / total_tagged,
+        'velocity': grouped['recent'] / (window_seconds / 3600.0),
+        'momentum': grouped['recent_score'] - grouped['previous_score'],
+    })
+    return result.sort_values('messages', ascending=False, kind='stable')
@@ -0,0 +1,162 @@
+"""Append-only historical store of market snapshots."""
+
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import logging
+
+from market_data import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_LISTS = ('most_active', 'gainers', 'losers')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    captured_at REAL NOT NULL UNIQUE,
+    snapshot_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quotes (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    captured_at REAL NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    list_name TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    name TEXT,
+    price REAL,
+    change_pct REAL,
+    volume REAL
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_symbol_time ON quotes (symbol, captured_at);
+CREATE INDEX IF NOT EXISTS idx_quotes_list_time ON quotes (list_name, captured_at);
+CREATE INDEX IF NOT EXISTS idx_quotes_date ON quotes (snapshot_date);
+"""
+
+
+def _nullable(value: float) -> Optional[float]:
+    """Store NaN as NULL."""
+    return None if math.isnan(value) else value
+
+
+class SnapshotStore:
+    """SQLite store that keeps every MarketSnapshot with full quote fields.
+
+    Rows are indexed by (symbol, time), (list, time) and calendar date, so
+    "symbol X over the last N days" and "most-active list at time T" only
+    read the index range they need rather than the whole history.
+    Appending the same snapshot twice is a no-op.
+    """
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def append(self, snapshot: MarketSnapshot) -> bool:
+        """Record a snapshot.
+
+        Args:
+            snapshot: Snapshot to store
+
+        Returns:
+            True if stored, False if this snapshot was already recorded
+        """
+        captured_at = snapshot.fetched_at
+        snapshot_date = datetime.fromtimestamp(captured_at, timezone.utc).strftime('%Y-%m-%d')
+        rows = []
+        for list_name in SNAPSHOT_LISTS:
+            for rank, quote in enumerate(snapshot.quote_batch(list_name), 1):
+                rows.append((captured_at, snapshot_date, list_name, rank, quote.symbol, quote.name,
+                             _nullable(quote.price), _nullable(quote.change_pct), _nullable(quote.volume)))
+
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO snapshots (captured_at, snapshot_date) VALUES (?, ?)",
+                    (captured_at, snapshot_date)
+                )
+            except sqlite3.IntegrityError:
+                return False
+            snapshot_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO quotes (snapshot_id, captured_at, snapshot_date, list_name, rank,"
+                " symbol, name, price, change_pct, volume) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(snapshot_id,) + row for row in rows]
+            )
+            self._conn.commit()
+        logger.info(f"Stored snapshot {snapshot_id} ({len(rows)} quotes)")
+        return True
+
+    def symbol_history(self, symbol: str, days: float = 30, list_name: Optional[str] = None,
+                       now: Optional[float] = None) -> List[Dict]:
+        """Quotes for one symbol over the last ``days`` days, oldest first.
+
+        Args:
+            symbol: Ticker symbol
+            days: Look-back window in days
+            list_name: Restrict to one list ('most_active', 'gainers', 'losers')
+            now: End of the window as epoch seconds (defaults to now)
+
+        Returns:
+            List of quote rows as dicts
+        """
+        end = now if now is not None else time.time()
+        query = "SELECT * FROM quotes WHERE symbol = ? AND captured_at BETWEEN ? AND ?"
+        params = [symbol, end - days * 86400, end]
+        if list_name is not None:
+            query += " AND list_name = ?"
+            params.append(list_name)
+        query += " ORDER BY captured_at, list_name"
+        return self._fetch(query, params)
+
+    def list_at(self, at: float, list_name: str = 'most_active') -> List[Dict]:
+        """A list as it stood in the latest snapshot taken at or before ``at``.
+
+        Args:
+            at: Epoch seconds
+            list_name: 'most_active', 'gainers' or 'losers'
+
+        Returns:
+            Quote rows ordered by rank (empty if no snapshot precedes ``at``)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(captured_at) FROM quotes WHERE list_name = ? AND captured_at <= ?",
+                (list_name, at)
+            ).fetchone()
+        if row[0] is None:
+            return []
+        return self._fetch(
+            "SELECT * FROM quotes WHERE list_name = ? AND captured_at = ? ORDER BY rank",
+            (list_name, row[0])
+        )
+
+    def snapshot_times(self, since: Optional[float] = None, until: Optional[float] = None) -> List[float]:
+        """Capture times of stored snapshots in a range, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT captured_at FROM snapshots WHERE captured_at BETWEEN ? AND ? ORDER BY captured_at",
+                (since if since is not None else 0, until if until is not None else math.inf)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def _fetch(self, query: str, params) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params).fetchall()]
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
@@ -0,0 +1,163 @@
+"""Trie-based symbol matching against a known ticker universe."""
+
+import csv
+import re
+from typing import Iterable, List, Set
+import logging
+
+from universe import TickerUniverse, is_compiled_universe
+
+logger = logging.getLogger(__name__)
+
+# Marks a trie node that completes a ticker
+_END = None
+
+# Shape of an explicit $CASHTAG (e.g. $AAPL, $GOOGL, $BOB.X, $BRK.B)
+CASHTAG_SHAPE = re.compile(r'[A-Z]{1,5}(?:\.[A-Z]{1,2})?')
+
+# A share-class or exchange suffix after a ticker's dot (the X in BOB.X)
+TICKER_SUFFIX = re.compile(r'[A-Z]{1,2}')
+
+
+class SymbolMatcher:
+    """Recognizes tickers from a fixed universe plus explicit $CASHTAGs.
+
+    Tickers are stored in a character trie. A single regex pass locates the
+    word-start positions where a ticker could begin (an uppercase word or a
+    ``$`` cashtag); from each one the trie is walked for the longest ticker
+    that ends on a word boundary (whole-word hits short-circuit through a
+    set lookup). Since a symbol can never start mid-word, no Aho-Corasick
+    failure transitions are needed and every character is visited a
+    bounded number of times, so matching is linear in the text.
+
+    Unlike the ``\\b[A-Z]{1,4}\\b`` regex path this accepts 5-letter tickers
+    (GOOGL) and dotted ones (BOB.X, BRK.B), and rejects capitalized words
+    that are not in the universe.
+    """
+
+    # Candidate starts: a $cashtag (any case) or an uppercase word. The
+    # possessive quantifiers never give characters back, so a token running
+    # into lowercase letters or digits (IPOs, AAPLx, $AAPL123) is rejected
+    # whole instead of matching a shorter prefix of it.
+    CANDIDATE_PATTERN = re.compile(
+        r'(?<![A-Za-z0-9_$.])(?:\$([A-Za-z][A-Za-z.]*+)|([A-Z][A-Z0-9.]*+))(?![A-Za-z0-9_])'
+    )
+
+    def __init__(self, symbols: Iterable[str], accept_unknown_cashtags: bool = True,
+                 stop_words: Iterable[str] = ()):
+        """Build the trie.
+
+        Args:
+            symbols: Ticker universe (e.g. 'AAPL', 'GOOGL', 'BOB.X')
+            accept_unknown_cashtags: Accept well-formed $CASHTAGs that are
+                not in the universe
+            stop_words: Words never matched bare (e.g. 'ALL', 'ON'); they are
+                still recognized when written as a cashtag
+        """
+        self.accept_unknown_cashtags = accept_unknown_cashtags
+        self.stop_words = frozenset(stop_words)
+        self._root: dict = {}
+        self._symbols: Set[str] = set()
+        for symbol in symbols:
+            self.add(symbol)
+
+    def add(self, symbol: str):
+        """Add a ticker to the universe."""
+        symbol = symbol.strip().upper()
+        if not symbol:
+            return
+        node = self._root
+        for ch in symbol:
+            node = node.setdefault(ch, {})
+        node[_END] = symbol
+        self._symbols.add(symbol)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def __iter__(self):
+        return iter(self._symbols)
+
+    def _longest_match(self, token: str) -> str:
+        """Longest universe ticker that prefixes ``token`` and ends on a boundary.
+
+        A dot only ends a ticker when what follows it is not a ticker
+        suffix, so "AAPL." matches AAPL but "BOB.X" does not match BOB.
+        """
+        node = self._root
+        best = ''
+        last = len(token) - 1
+        for i, ch in enumerate(token):
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node and (i == last or (token[i + 1] == '.' and not
+                                               TICKER_SUFFIX.fullmatch(token[i + 2:].split('.', 1)[0]))):
+                best = node[_END]
+        return best
+
+    def find(self, text: str) -> List[str]:
+        """Extract ticker mentions from text in order of appearance.
+
+        Args:
+            text: Input text to search
+
+        Returns:
+            List of matched symbols (duplicates preserved)
+        """
+        if not text:
+            return []
+
+        known = self._symbols
+        symbols = []
+        for cashtag, word in self.CANDIDATE_PATTERN.findall(text):
+            if cashtag:
+                token = cashtag.upper().rstrip('.')
+                if token in known:
+                    symbols.append(token)
+                elif self.accept_unknown_cashtags and CASHTAG_SHAPE.fullmatch(token):
+                    symbols.append(token)
+                else:
+                    symbol = self._longest_match(token)
+                    if symbol:
+                        symbols.append(symbol)
+            else:
+                # Whole-word hits are the common case; walk the trie only
+                # for tokens with a trailing or dotted suffix
+                symbol = word if word in known else self._longest_match(word)
+                if symbol and symbol not in self.stop_words:
+                    symbols.append(symbol)
+        return symbols
+
+
+def load_universe(path: str) -> Iterable[str]:
+    """Load a ticker universe from a file.
+
+    Accepts either one symbol per line, a CSV whose first column is the
+    symbol (a header row named 'symbol' is skipped), or an index compiled
+    by ``universe.compile_universe``, which is memory-mapped rather than read.
+
+    Args:
+        path: Path to the universe file
+
+    Returns:
+        Set of upper-case ticker symbols, or a TickerUniverse for a
+        compiled index (which the caller closes)
+    """
+    if is_compiled_universe(path):
+        universe = TickerUniverse(path)
+        logger.info(f"Mapped {len(universe)} symbols from {path}")
+        return universe
+    symbols = set()
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            symbol = row[0].strip().upper()
+            if symbol and symbol != 'SYMBOL':
+                symbols.add(symbol)
+    logger.info(f"Loaded {len(symbols)} symbols from {path}")
+    return symbols
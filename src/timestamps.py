@@ -0,0 +1,25 @@
+"""Timestamp parsing shared by the scraper and the trending counters."""
+
+from datetime import datetime
+from typing import Optional
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Convert a StockTwits ``created_at`` value to epoch seconds.
+
+    Args:
+        value: ISO-8601 string (e.g. '2025-11-28T15:30:00Z'), datetime or number
+
+    Returns:
+        Epoch seconds or None if the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
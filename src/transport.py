@@ -0,0 +1,338 @@
+"""Shared HTTP transport with connection pooling, retries and circuit breaking."""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+
+from http_cache import CachingAdapter, ResponseCache
+from metrics import MetricsAdapter
+from recording import RecordingAdapter, ReplayAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After ``threshold`` consecutive failures a host is rejected for
+    ``cooldown`` seconds; the first request after that is let through as a
+    trial and either closes the circuit or re-opens it. Other requests are
+    rejected while the trial is in flight (or until it has taken a full
+    ``cooldown``, in case its outcome is never recorded).
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the breaker.
+
+        Args:
+            threshold: Consecutive failures that open a host's circuit
+            cooldown: Seconds an open circuit rejects requests
+            clock: Monotonic clock, injectable for tests
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        # Hosts with a half-open trial in flight, mapped to when it lapses
+        self._probing: Dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        """Check whether a request to ``host`` may proceed."""
+        with self._lock:
+            now = self._clock()
+            probe_until = self._probing.get(host)
+            if probe_until is not None:
+                if now < probe_until:
+                    return False
+                del self._probing[host]
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return True
+            if now >= open_until:
+                # Half-open: let one trial through, re-open if it fails
+                del self._open_until[host]
+                self._failures[host] = self.threshold - 1
+                self._probing[host] = now + self.cooldown
+                return True
+            return False
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._probing.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            self._probing.pop(host, None)
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._open_until[host] = self._clock() + self.cooldown
+                logger.warning(f"Circuit opened for {host} after {failures} failures")
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return host in self._open_until and self._clock() < self._open_until[host]
+
+
+class ResilientAdapter(HTTPAdapter):
+    """HTTPAdapter with retries, jittered exponential backoff and a circuit breaker.
+
+    Idempotent requests that fail with a connection error or a retryable
+    status (429/5xx) are retried up to ``max_retries`` times. The delay
+    honors ``Retry-After`` when present and otherwise uses full-jitter
+    exponential backoff. A 429 is not a circuit failure: the host is up
+    and rate limiting is handled by honoring ``Retry-After``.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RATE_LIMITED_STATUS = 429
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+    def __init__(self, pool_size: int = 20, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 jitter: Callable[[], float] = random.random):
+        """Initialize the adapter.
+
+        Args:
+            pool_size: Connections kept alive per host
+            max_retries: Retries after the first attempt
+            backoff_base: Backoff ceiling for the first retry in seconds
+            backoff_max: Largest delay between attempts in seconds
+            breaker: Circuit breaker shared across hosts
+            sleep: Sleep function, injectable for tests
+            jitter: Uniform [0, 1) source used for full jitter
+        """
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.retry_limit = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._jitter = jitter
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'attempts': 0, 'retries': 0, 'failures': 0, 'circuit_rejections': 0}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _delay(self, attempt: int, response: Optional[Response]) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return self._jitter() * ceiling
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send with retries, failing fast while the host's circuit is open."""
+        host = urlparse(request.url).netloc
+        self._count('requests')
+        if not self.breaker.allow(host):
+            self._count('circuit_rejections')
+            raise CircuitOpenError(f"Circuit open for {host}", request=request)
+
+        retryable = request.method in self.IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self._count('attempts')
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not retryable or attempt >= self.retry_limit:
+                    self._count('failures')
+                    self.breaker.record_failure(host)
+                    raise
+                delay = self._delay(attempt, None)
+                logger.warning(f"{request.method} {host} failed ({e}); retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    return response
+                if not retryable or attempt >= self.retry_limit:
+                    self._count('failures')
+                    if response.status_code == self.RATE_LIMITED_STATUS:
+                        self.breaker.record_success(host)
+                    else:
+                        self.breaker.record_failure(host)
+                    return response
+                delay = self._delay(attempt, response)
+                logger.warning(f"{request.method} {host} returned {response.status_code}; "
+                               f"retrying in {delay:.2f}s")
+                response.close()
+
+            self._count('retries')
+            self._sleep(delay)
+            attempt += 1
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connections opened versus requests served across this adapter's pools."""
+        opened = served = 0
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+        return {'connections_opened': opened, 'pool_requests': served,
+                'connections_reused': max(served - opened, 0)}
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After as delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class Transport:
+    """A pooled, retrying ``requests.Session`` shared by the API clients."""
+
+    def __init__(self, pool_size: int = 20, max_retries: int = 3, backoff_base: float = 0.5,
+                 breaker_threshold: int = 5, breaker_cooldown: float = 30.0,
+                 cache: Optional[ResponseCache] = None, user_agent: str = DEFAULT_USER_AGENT,
+                 record_path: Optional[str] = None, replay: Optional[ReplayAdapter] = None):
+        """Initialize the transport.
+
+        Args:
+            pool_size: Connections kept alive per host
+            max_retries: Retries for transient failures (429/5xx/connection errors)
+            backoff_base: Backoff ceiling for the first retry in seconds
+            breaker_threshold: Consecutive failures that open a host's circuit
+            breaker_cooldown: Seconds an open circuit rejects requests
+            cache: Optional response cache layered above the retrying adapter
+            user_agent: User-Agent header sent with every request
+            record_path: Append every exchange to this gzip JSON-lines file
+            replay: Serve requests from a recording instead of the network
+                (the retry, circuit and cache layers are bypassed)
+        """
+        self.adapter = ResilientAdapter(
+            pool_size=pool_size, max_retries=max_retries, backoff_base=backoff_base,
+            breaker=CircuitBreaker(breaker_threshold, breaker_cooldown)
+        )
+        self.replay = replay
+        self.cache = cache if replay is None else None
+        if replay is not None:
+            mounted = replay
+        elif cache is not None:
+            mounted = CachingAdapter(cache, adapter=self.adapter)
+        else:
+            mounted = self.adapter
+        # Record what the clients see, after caching and retries
+        self.recorder = RecordingAdapter(mounted, record_path) if record_path else None
+        if self.recorder is not None:
+            mounted = self.recorder
+        # Outermost, so latency metrics (when enabled) include cache hits and retries
+        mounted = MetricsAdapter(mounted)
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent})
+        self.session.mount('https://', mounted)
+        self.session.mount('http://', mounted)
+
+    def stats(self) -> Dict[str, int]:
+        """Retry, circuit, pool-reuse and (if enabled) cache counters."""
+        stats = dict(self.adapter.stats)
+        stats.update(self.adapter.pool_stats())
+        if self.cache is not None:
+            stats.update({f"cache_{k}": v for k, v in self.cache.stats.items()})
+        if self.replay is not None:
+            stats.update({f"replay_{k}": v for k, v in self.replay.stats.items()})
+        if self.recorder is not None:
+            stats['recorded'] = self.recorder.recorded
+        return stats
+
+    @property
+    def replaying(self) -> bool:
+        """True when requests are answered from a recording (no quota is spent)."""
+        return self.replay is not None
+
+    @property
+    def recording(self) -> bool:
+        """True when every exchange is appended to a recording."""
+        return self.recorder is not None
+
+    def close(self):
+        """Close the session and its pooled connections (finishing any recording)."""
+        self.session.close()
+
+
+_shared_transport: Optional[Transport] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport() -> Transport:
+    """Process-wide transport used by clients that are not given their own."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = Transport()
+        return _shared_transport
+
+
+def client_transport(cache: Optional[ResponseCache] = None) -> Transport:
+    """Transport for an API client that was not given one.
+
+    Without a cache this is the shared transport. A cache gets a private
+    transport wrapping it, which would silently bypass a recording or
+    replaying shared transport, so that combination is rejected.
+
+    Args:
+        cache: The client's own response cache, if any
+
+    Returns:
+        The shared transport, or a new one wrapping ``cache``
+
+    Raises:
+        ValueError: If ``cache`` is given while the shared transport records or replays
+    """
+    if cache is None:
+        return get_shared_transport()
+    with _shared_lock:
+        shared = _shared_transport
+    if shared is not None and (shared.recording or shared.replaying):
+        raise ValueError("A client cache would bypass the shared transport's recording/replay; "
+                         "set the cache on the shared transport (--cache) instead")
+    return Transport(cache=cache)
+
+
+def set_shared_transport(transport: Optional[Transport]) -> Optional[Transport]:
+    """Replace the process-wide transport (e.g. with a recording or replaying one).
+
+    Args:
+        transport: New shared transport, or None to build a default one on next use
+
+    Returns:
+        The previous shared transport, which the caller may close
+    """
+    global _shared_transport
+    with _shared_lock:
+        previous, _shared_transport = _shared_transport, transport
+        return previous
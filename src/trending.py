@@ -0,0 +1,162 @@
+"""Time-bucketed sliding-window trending counts for symbol mentions."""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from analyzer import SymbolAnalyzer
+from timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowCounter:
+    """Ring buffer of per-bucket mention counts over a fixed time window.
+
+    Mentions land in the bucket for their timestamp (e.g. 1-minute buckets
+    over 1 hour). A running total over all live buckets is kept, so the
+    whole-window top-N is a single ``most_common`` call. Moving the window
+    forward subtracts each expired bucket from the total once, so adding a
+    mention and expiring it are both O(1) amortized.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, num_buckets: int = 60,
+                 half_life: Optional[float] = None, analyzer: Optional[SymbolAnalyzer] = None):
+        """Initialize the counter.
+
+        Args:
+            bucket_seconds: Width of each time bucket in seconds
+            num_buckets: Number of buckets in the window
+            half_life: Optional exponential decay half-life in seconds
+                applied by ``top`` (newer buckets weigh more)
+            analyzer: Analyzer used for symbol extraction from texts
+        """
+        if bucket_seconds <= 0 or num_buckets <= 0:
+            raise ValueError("bucket_seconds and num_buckets must be positive")
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.half_life = half_life
+        self.analyzer = analyzer or SymbolAnalyzer()
+        self._buckets: List[Counter] = [Counter() for _ in range(num_buckets)]
+        self._bucket_ids: List[Optional[int]] = [None] * num_buckets
+        self._totals: Counter = Counter()
+        self._head: Optional[int] = None
+        self.dropped = 0
+
+    @property
+    def window_seconds(self) -> int:
+        """Length of the whole window in seconds."""
+        return self.bucket_seconds * self.num_buckets
+
+    def _expire(self, slot: int):
+        """Subtract a bucket from the running totals and empty it."""
+        bucket = self._buckets[slot]
+        totals = self._totals
+        for symbol, count in bucket.items():
+            remaining = totals[symbol] - count
+            if remaining > 0:
+                totals[symbol] = remaining
+            else:
+                del totals[symbol]
+        self._buckets[slot] = Counter()
+        self._bucket_ids[slot] = None
+
+    def advance(self, timestamp: float):
+        """Move the window forward so that it ends at ``timestamp``.
+
+        Args:
+            timestamp: Epoch seconds of the newest point in the window
+        """
+        bucket_id = int(timestamp // self.bucket_seconds)
+        if self._head is None:
+            self._head = bucket_id
+            return
+        if bucket_id <= self._head:
+            return
+        # Expire every slot the window slides past (at most one full lap)
+        start = max(self._head + 1, bucket_id - self.num_buckets + 1)
+        for expired in range(start, bucket_id + 1):
+            slot = expired % self.num_buckets
+            if self._bucket_ids[slot] is not None:
+                self._expire(slot)
+        self._head = bucket_id
+
+    def add(self, symbols: Iterable[str], timestamp: float):
+        """Record mentions that occurred at ``timestamp``.
+
+        Mentions older than the window are dropped.
+
+        Args:
+            symbols: Symbols mentioned (duplicates count separately)
+            timestamp: Epoch seconds of the mention
+        """
+        self.advance(timestamp)
+        bucket_id = int(timestamp // self.bucket_seconds)
+        if bucket_id <= self._head - self.num_buckets:
+            self.dropped += 1
+            return
+        slot = bucket_id % self.num_buckets
+        self._bucket_ids[slot] = bucket_id
+        bucket = self._buckets[slot]
+        for symbol in symbols:
+            bucket[symbol] += 1
+            self._totals[symbol] += 1
+
+    def add_text(self, text: str, timestamp: float):
+        """Extract symbols from a text and record them."""
+        self.add(self.analyzer.extract_symbols(text), timestamp)
+
+    def add_messages(self, messages: Iterable[Dict]) -> int:
+        """Record message records as produced by ``collect_community_data``.
+
+        Args:
+            messages: Dicts with 'message' and 'timestamp' keys
+
+        Returns:
+            Number of messages recorded (unparseable timestamps are skipped)
+        """
+        added = 0
+        for record in messages:
+            timestamp = parse_timestamp(record.get('timestamp'))
+            if timestamp is None:
+                continue
+            self.add_text(record.get('message', ''), timestamp)
+            added += 1
+        return added
+
+    def top(self, n: int = 10, minutes: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Most mentioned symbols in the recent part of the window.
+
+        Args:
+            n: Number of symbols to return
+            minutes: Only count the last ``minutes`` of the window (whole
+                window if omitted)
+
+        Returns:
+            List of (symbol, count) tuples; counts are decayed weights when
+            a half-life is configured
+        """
+        if self._head is None:
+            return []
+        span = self.num_buckets
+        if minutes is not None:
+            span = min(span, max(1, int(-(-minutes * 60 // self.bucket_seconds))))
+        if span == self.num_buckets and self.half_life is None:
+            return self._totals.most_common(n)
+
+        scores: Counter = Counter()
+        for age in range(span):
+            bucket_id = self._head - age
+            slot = bucket_id % self.num_buckets
+            if self._bucket_ids[slot] != bucket_id:
+                continue
+            weight = 1.0
+            if self.half_life is not None:
+                weight = 0.5 ** (age * self.bucket_seconds / self.half_life)
+            for symbol, count in self._buckets[slot].items():
+                scores[symbol] += count * weight
+        return scores.most_common(n)
+
+    def __len__(self) -> int:
+        """Number of distinct symbols currently in the window."""
+        return len(self._totals)
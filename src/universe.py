@@ -0,0 +1,202 @@
+"""Compiled, memory-mapped ticker universe with per-symbol metadata."""
+
+import bisect
+import csv
+import mmap
+import os
+import struct
+import tempfile
+from collections import namedtuple
+from typing import Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TKUX'
+VERSION = 1
+# magic, version, symbol count, fixed symbol key width
+_HEADER = struct.Struct('<4sIII')
+_OFFSET = struct.Struct('<I')
+_FIELD_SEPARATOR = '\x1f'
+
+TickerInfo = namedtuple('TickerInfo', ['symbol', 'name', 'exchange', 'type'])
+
+
+def read_master_list(path: str) -> List[TickerInfo]:
+    """Read a master-list CSV with 'symbol', 'name', 'exchange' and 'type' columns.
+
+    Missing columns are left empty. When a symbol repeats, its last row wins.
+    Rows whose symbol is not ASCII (the index stores fixed-width ASCII keys)
+    are skipped with a warning.
+
+    Args:
+        path: CSV file with a header row
+
+    Returns:
+        TickerInfo records sorted by symbol
+    """
+    records = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row = {(k or '').strip().lower(): (v or '').strip() for k, v in row.items()}
+            symbol = row.get('symbol', '').upper()
+            if not symbol:
+                continue
+            if not symbol.isascii():
+                logger.warning(f"Skipping non-ASCII symbol {symbol!r} in {path}")
+                continue
+            records[symbol] = TickerInfo(symbol, row.get('name', ''), row.get('exchange', ''), row.get('type', ''))
+    return [records[symbol] for symbol in sorted(records)]
+
+
+def compile_universe(source: str, output: str) -> int:
+    """Compile a master-list CSV into the binary index read by TickerUniverse.
+
+    Layout: header, then the symbols as sorted fixed-width ASCII keys (for
+    binary search in place), then ``count + 1`` offsets into a UTF-8 blob
+    holding each symbol's name, exchange and type.
+
+    Args:
+        source: Master-list CSV (see read_master_list)
+        output: Index file to write (replaced atomically)
+
+    Returns:
+        Number of symbols written
+    """
+    records = read_master_list(source)
+    keys = [r.symbol.encode('ascii') for r in records]
+    width = max((len(k) for k in keys), default=1)
+
+    blobs = [_FIELD_SEPARATOR.join((r.name, r.exchange, r.type)).encode('utf-8') for r in records]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(records), width))
+            f.write(b''.join(k.ljust(width, b'\0') for k in keys))
+            f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            f.write(b''.join(blobs))
+        os.replace(tmp_path, output)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    logger.info(f"Compiled {len(records)} symbols from {source} into {output}")
+    return len(records)
+
+
+def is_compiled_universe(path: str) -> bool:
+    """Check whether a file is a compiled index (rather than a text/CSV list)."""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class _Keys:
+    """Read-only sequence view of the fixed-width keys, for ``bisect``."""
+
+    def __init__(self, buffer, start: int, count: int, width: int):
+        self._buffer = buffer
+        self._start = start
+        self._count = count
+        self._width = width
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        offset = self._start + index * self._width
+        return self._buffer[offset:offset + self._width]
+
+
+class TickerUniverse:
+    """Memory-mapped ticker index: O(log n) membership and metadata lookups.
+
+    Opening maps the file without parsing it, so loading takes about the
+    same time for ten symbols or a hundred thousand; pages are read as
+    lookups touch them. Iterating yields the symbols in sorted order, so
+    an index can be passed anywhere a symbol list is accepted (e.g.
+    ``SymbolAnalyzer(universe=...)``).
+    """
+
+    def __init__(self, path: str):
+        """Open an index written by compile_universe.
+
+        Args:
+            path: Index file
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a ticker index")
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a ticker index")
+        magic, version, count, width = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} ticker index")
+        self._count = count
+        self._width = width
+        self._keys = _Keys(self._map, _HEADER.size, count, width)
+        self._offsets_start = _HEADER.size + count * width
+        self._blob_start = self._offsets_start + (count + 1) * _OFFSET.size
+
+    def _index(self, symbol: str) -> Optional[int]:
+        try:
+            key = symbol.strip().upper().encode('ascii')
+        except (AttributeError, UnicodeEncodeError):
+            return None
+        if not key or len(key) > self._width:
+            return None
+        key = key.ljust(self._width, b'\0')
+        index = bisect.bisect_left(self._keys, key)
+        if index < self._count and self._keys[index] == key:
+            return index
+        return None
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._index(symbol) is not None
+
+    def lookup(self, symbol: str) -> Optional[TickerInfo]:
+        """Metadata for a symbol.
+
+        Args:
+            symbol: Ticker symbol (case-insensitive)
+
+        Returns:
+            TickerInfo, or None if the symbol is not in the universe
+        """
+        index = self._index(symbol)
+        if index is None:
+            return None
+        start, end = struct.unpack_from('<II', self._map, self._offsets_start + index * _OFFSET.size)
+        fields = self._map[self._blob_start + start:self._blob_start + end].decode('utf-8')
+        name, exchange, kind = fields.split(_FIELD_SEPARATOR)
+        return TickerInfo(self._symbol_at(index), name, exchange, kind)
+
+    def _symbol_at(self, index: int) -> str:
+        return self._keys[index].rstrip(b'\0').decode('ascii')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._symbol_at(index)
+
+    def close(self):
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'TickerUniverse':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -6,7 +6,7 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from analyzer import SymbolAnalyzer
+from analyzer import MentionCounter, SymbolAnalyzer
 
 
 def test_extract_symbols():
@@ -58,8 +58,57 @@ def test_statistics():
     print(f"✓ Statistics test passed: {stats}")
 
 
+def test_universe_matcher():
+    """Test universe-based extraction of 5-letter, dotted and cashtag symbols."""
+    analyzer = SymbolAnalyzer(universe=['AAPL', 'MSFT', 'GOOGL', 'BOB.X', 'ALL'])
+    
+    text = "$AAPL and GOOGL up, BOB.X trending. CEO says ALL in on $tmdx"
+    symbols = analyzer.extract_symbols(text)
+    
+    assert symbols == ['AAPL', 'GOOGL', 'BOB.X', 'TMDX']
+    print(f"✓ Universe matcher test passed: {symbols}")
+
+
+def test_universe_matcher_boundaries():
+    """Test that universe symbols only match as whole words."""
+    analyzer = SymbolAnalyzer(universe=['AAPL', 'BOB'])
+    
+    assert analyzer.extract_symbols("AAPLX and xAAPL and AAPL.") == ['AAPL']
+    assert analyzer.extract_symbols("BOB.X vs BOB") == ['BOB']
+    assert analyzer.extract_symbols("BOB.X. Next up: BOB.") == ['BOB']
+    print("✓ Universe boundary test passed")
+
+
+def test_universe_matcher_rejects_suffixed_words():
+    """Test that plurals and suffixed tokens never match a ticker prefix."""
+    analyzer = SymbolAnalyzer(universe=['AAPL', 'AAP', 'IP', 'CE', 'ET', 'TSLA'])
+    
+    text = "IPOs and CEOs love ETFs, AAPLx and $AAPL123 too; TSLA and $TSLA hold"
+    assert analyzer.extract_symbols(text) == ['TSLA', 'TSLA']
+    print("✓ Suffixed word test passed")
+
+
+def test_mention_counter_streaming():
+    """Test that batched streaming updates match one-shot analysis."""
+    analyzer = SymbolAnalyzer()
+    texts = ["Buy AAPL and MSFT", "AAPL is good", "MSFT MSFT MSFT", "nothing here"]
+    
+    counter = MentionCounter(analyzer)
+    counter.update(text for text in texts[:2])
+    counter.update(iter(texts[2:]))
+    
+    assert counter.most_common(5) == analyzer.analyze_mentions(texts, top_n=5)
+    assert counter.statistics() == analyzer.get_statistics(texts)
+    assert counter.statistics()['average_mentions_per_text'] == 1.5
+    print(f"✓ Streaming counter test passed: {counter.statistics()}")
+
+
 if __name__ == "__main__":
     test_extract_symbols()
     test_analyze_mentions()
     test_statistics()
+    test_universe_matcher()
+    test_universe_matcher_boundaries()
+    test_universe_matcher_rejects_suffixed_words()
+    test_mention_counter_streaming()
     print("\n✓ All tests passed!")
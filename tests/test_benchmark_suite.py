@@ -0,0 +1,62 @@
+"""Tests for the benchmark suite's baseline comparison."""
+
+import sys
+import os
+import json
+
+# Add src and benchmarks directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from suite import Result, compare, main
+
+
+def _baseline(**values):
+    return {'results': {name: {'value': value, 'unit': 's', 'higher_is_better': False, 'seconds': value}
+                        for name, value in values.items()}}
+
+
+def test_compare_applies_threshold_and_noise_floor():
+    """Test slowdowns are flagged only past both the threshold and the noise floor."""
+    baseline = _baseline(tiny=0.0002, slow=1.0, steady=1.0)
+    baseline['results']['rate'] = {'value': 1000.0, 'unit': 'msgs/s', 'higher_is_better': True,
+                                   'seconds': 10.0}
+    results = [
+        Result('tiny', 0.0006, 's', higher_is_better=False),
+        Result('slow', 1.5, 's', higher_is_better=False),
+        Result('steady', 1.05, 's', higher_is_better=False),
+        Result('rate', 500.0, 'msgs/s', higher_is_better=True, seconds=20.0),
+        Result('new', 1.0, 's', higher_is_better=False),
+    ]
+    rows = {row['name']: row for row in compare(results, baseline, threshold=0.10, min_delta=0.005)}
+
+    assert rows['tiny']['change'] < -0.5 and not rows['tiny']['regressed']
+    assert rows['slow']['regressed'] and rows['rate']['regressed']
+    assert not rows['steady']['regressed']
+    assert rows['new']['baseline'] is None and not rows['new']['regressed']
+    assert compare(results[:1], baseline, threshold=0.10, min_delta=0.0)[0]['regressed']
+    print("✓ Baseline comparison test passed")
+
+
+def test_exit_status_reflects_regressions(tmp_path):
+    """Test the suite exits 1 against a much faster baseline and 0 against a slower one."""
+    names = ['ranking.top[n=10000,k=20]', 'ranking.update_top[n=10000,k=20,changed=50]',
+             'ranking.top[n=100000,k=20]', 'ranking.update_top[n=100000,k=20,changed=50]']
+    fast = tmp_path / 'fast.json'
+    fast.write_text(json.dumps(_baseline(**{name: 1e-9 for name in names})), encoding='utf-8')
+    slow = tmp_path / 'slow.json'
+    slow.write_text(json.dumps(_baseline(**{name: 1000.0 for name in names})), encoding='utf-8')
+    args = ['--only', 'ranking', '--repeat', '1', '--baseline']
+
+    assert main(args + [str(fast), '--min-delta', '0']) == 1
+    assert main(args + [str(slow)]) == 0
+    assert main(args + [str(tmp_path / 'missing.json')]) == 0
+    print("✓ Regression exit status test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_compare_applies_threshold_and_noise_floor()
+    test_exit_status_reflects_regressions(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
@@ -0,0 +1,69 @@
+"""Tests for the unified command line."""
+
+import sys
+import os
+import subprocess
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+CLI = os.path.join(os.path.dirname(__file__), '..', 'src', 'cli.py')
+SRC = os.path.dirname(CLI)
+
+# Budget for importing cli and building its parser in a fresh interpreter;
+# about 7 ms locally, while importing numpy and requests alone takes ~140 ms
+STARTUP_BUDGET_SECONDS = 0.050
+
+
+def _startup_seconds(runs=5):
+    """Best in-process time to import cli and render --help, each in a fresh interpreter."""
+    script = (
+        f"import sys, time; sys.path.insert(0, {SRC!r}); start = time.perf_counter(); "
+        "import cli; cli.build_parser().format_help(); print(time.perf_counter() - start)"
+    )
+    return min(float(subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                    check=True).stdout) for _ in range(runs))
+
+
+def test_help_starts_within_budget():
+    """Test importing the CLI and building its help stays within the startup budget."""
+    elapsed = _startup_seconds()
+    assert elapsed < STARTUP_BUDGET_SECONDS, (
+        f"import cli + build_parser took {elapsed * 1000:.1f} ms "
+        f"(budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms)")
+    print(f"✓ Startup budget test passed ({elapsed * 1000:.1f} ms)")
+
+
+def test_parsing_does_not_import_subsystems():
+    """Test building the parser loads none of the heavy modules."""
+    script = (
+        f"import sys; sys.path.insert(0, {SRC!r}); import cli; "
+        "cli.build_parser().parse_args(['analyze', 'corpus.txt']); "
+        "heavy = {'requests', 'numpy', 'pandas', 'scraper', 'market_data', 'analyzer', "
+        "'transport', 'http_cache', 'recording', 'metrics'}; "
+        "print(sorted(heavy & set(sys.modules)))"
+    )
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
+    print("✓ Lazy import test passed")
+
+
+def test_analyze_command(tmp_path, capsys):
+    """Test the analyze subcommand on a JSON-lines corpus."""
+    import json
+    from cli import main
+
+    corpus = tmp_path / 'messages.jsonl'
+    corpus.write_text('\n'.join(json.dumps({'message': text}) for text in
+                                ['AAPL to the moon', '$TSLA and AAPL', 'nothing here']), encoding='utf-8')
+    assert main(['analyze', str(corpus), '--top', '1', '--log-level', 'WARNING']) == 0
+    output = capsys.readouterr().out
+    assert 'AAPL' in output and 'TSLA' not in output.split('\n✓')[0]
+    assert '3 mentions of 2 symbols in 3 messages' in output
+    print("✓ Analyze command test passed")
+
+
+if __name__ == "__main__":
+    test_help_starts_within_budget()
+    test_parsing_does_not_import_subsystems()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,61 @@
+"""Tests for the co-mention graph."""
+
+import sys
+import os
+import random
+from collections import Counter
+from itertools import combinations
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from co_mentions import CoMentionGraph
+
+
+def test_related_and_strongest_pairs():
+    """Test neighbor and pair queries on a small corpus."""
+    analyzer = SymbolAnalyzer(universe=['AAPL', 'MSFT', 'GOOGL', 'SPY', 'DIA', 'QQQ', 'NVDA'])
+    graph = CoMentionGraph(analyzer).update([
+        "$AAPL $MSFT $GOOGL these mega caps driving overall sentiment",
+        "AAPL showing bullish signals, MSFT consolidating",
+        "Trading SPY today, keeping eyes on DIA and QQQ",
+        "AAPL AAPL and MSFT again",
+        "NVDA alone",
+    ])
+
+    assert graph.related('AAPL') == [('MSFT', 3), ('GOOGL', 1)]
+    assert graph.weight('MSFT', 'AAPL') == 3 and graph.weight('AAPL', 'NVDA') == 0
+    assert graph.mentions('AAPL') == 3
+    assert graph.strongest_pairs(1) == [('AAPL', 'MSFT', 3)]
+    assert graph.related('TSLA') == []
+    # 3 pairs from the mega-cap post + 3 from SPY/DIA/QQQ
+    assert graph.num_pairs == 6 and len(graph) == 7
+    print("✓ Co-mention query test passed")
+
+
+def test_tracked_top_pairs_match_full_count():
+    """Test the incrementally tracked top pairs agree with a brute-force count."""
+    rng = random.Random(3)
+    universe = [f"S{i}" for i in range(60)]
+    weights = [1.0 / (rank + 1) for rank in range(len(universe))]
+    graph = CoMentionGraph(top_capacity=20)
+    expected = Counter()
+    for _ in range(3000):
+        symbols = set(rng.choices(universe, weights=weights, k=rng.randint(1, 4)))
+        graph.add_symbols(symbols)
+        for a, b in combinations(sorted(symbols), 2):
+            expected[(a, b)] += 1
+
+    for n in (1, 5, 19, 20, 40):
+        got = graph.strongest_pairs(n)
+        assert [count for _, _, count in got] == sorted(expected.values(), reverse=True)[:n]
+        assert all(expected[tuple(sorted((a, b)))] == count for a, b, count in got)
+    assert graph.num_pairs == len(expected)
+    print("✓ Tracked top pairs test passed")
+
+
+if __name__ == "__main__":
+    test_related_and_strongest_pairs()
+    test_tracked_top_pairs_match_full_count()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,72 @@
+"""Tests for the scheduler/daemon mode."""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from daemon import MarketHours, PipelineDaemon
+from market_data import MarketSnapshot
+
+
+class ScriptedFetcher:
+    """Fetcher returning one most-active list per refresh."""
+
+    def __init__(self, lists):
+        self.lists = list(lists)
+        self.closed = False
+
+    def refresh_snapshot(self):
+        symbols = self.lists.pop(0)
+        return MarketSnapshot({'most_active': [{'symbol': s} for s in symbols]})
+
+    def close(self):
+        self.closed = True
+
+
+def test_market_hours():
+    """Test session boundaries, weekends and time until the next open."""
+    hours = MarketHours()
+    
+    assert hours.is_open(datetime(2025, 11, 28, 15, 0, tzinfo=timezone.utc))       # Fri 10:00 ET
+    assert not hours.is_open(datetime(2025, 11, 28, 21, 5, tzinfo=timezone.utc))   # Fri 16:05 ET
+    assert not hours.is_open(datetime(2025, 11, 29, 15, 0, tzinfo=timezone.utc))   # Saturday
+    friday_close = datetime(2025, 11, 28, 21, 0, tzinfo=timezone.utc)
+    assert hours.seconds_until_open(friday_close) == (2 * 24 + 17.5) * 3600
+    print("✓ Market hours test passed")
+
+
+def test_exports_only_when_set_changes():
+    """Test that the export step runs only when the most-active set changes."""
+    exported = []
+    fetcher = ScriptedFetcher([['SPY', 'NVDA'], ['NVDA', 'SPY'], ['SPY', 'TSLA'], ['SPY', 'TSLA']])
+    daemon = PipelineDaemon(export=lambda snap: exported.append(snap) or True,
+                            fetcher=fetcher, interval=0)
+    
+    daemon.run(max_cycles=4)
+    
+    assert daemon.cycles == 4 and len(exported) == 2
+    assert [s['symbol'] for s in exported[1].most_active()] == ['SPY', 'TSLA']
+    assert fetcher.closed
+    print("✓ Change-triggered export test passed")
+
+
+def test_stop_ends_loop():
+    """Test that stop() (as called from the SIGTERM handler) exits the loop."""
+    fetcher = ScriptedFetcher([['SPY']] * 10)
+    daemon = PipelineDaemon(export=lambda snap: True, fetcher=fetcher, interval=0)
+    daemon.on_snapshot = lambda snap: daemon.stop() if daemon.cycles == 2 else None
+    
+    daemon.run()
+    
+    assert daemon.cycles == 2 and daemon.stopped
+    print("✓ Graceful stop test passed")
+
+
+if __name__ == "__main__":
+    test_market_hours()
+    test_exports_only_when_set_changes()
+    test_stop_ends_loop()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,75 @@
+"""Tests for message-id deduplication."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dedup import SeenSet
+from rate_limit import TokenBucket
+from scraper import StockTwitsScraper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_764_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_seen_set_expires_bounds_and_persists(tmp_path):
+    """Test TTL expiry, the entry cap and the save/load round trip."""
+    clock = FakeClock()
+    path = str(tmp_path / 'seen.json')
+    seen = SeenSet(path, ttl=3600, max_entries=3, clock=clock)
+
+    assert not seen.check(1) and seen.check(1)
+    assert not seen.check(None) and not seen.check(None)
+    for message_id in (2, 3, 4):
+        seen.check(message_id)
+    assert len(seen) == 3 and 1 not in seen
+    assert seen.stats['evicted'] == 1
+
+    clock.now += 1800
+    seen.check(4)
+    seen.save()
+
+    clock.now += 2400
+    reloaded = SeenSet(path, ttl=3600, max_entries=3, clock=clock)
+    assert list(reloaded._seen) == [4]
+    assert reloaded.check(4) and not reloaded.check(2)
+    assert abs(seen.dedup_rate - 2 / 6) < 1e-9
+    print("✓ Seen-set test passed")
+
+
+def test_collect_skips_repeated_messages(tmp_path):
+    """Test messages repeated across symbols and polls are returned once."""
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0),
+                                seen=SeenSet(str(tmp_path / 'seen.json')))
+    scraper.get_most_mentioned_symbols = lambda limit=30: [{'symbol': 'AAPL'}, {'symbol': 'MSFT'}]
+    streams = {
+        'AAPL': [{'id': 3, 'body': '$AAPL $MSFT mega caps'}, {'id': 1, 'body': '$AAPL'}],
+        'MSFT': [{'id': 3, 'body': '$AAPL $MSFT mega caps'}, {'id': 2, 'body': '$MSFT'}],
+    }
+    scraper.get_recent_posts = lambda symbol, limit=30: streams[symbol]
+
+    first = scraper.collect_community_data(num_symbols=2, max_workers=2)
+    assert [(m['symbol'], m['id']) for m in first['messages']] == [('AAPL', 3), ('AAPL', 1), ('MSFT', 2)]
+
+    streams['MSFT'].insert(0, {'id': 4, 'body': '$MSFT new'})
+    second = scraper.collect_community_data(num_symbols=2)
+    assert [m['id'] for m in second['messages']] == [4]
+    assert scraper.seen.report()['duplicates'] == 5
+    assert os.path.exists(tmp_path / 'seen.json')
+    scraper.close()
+    print("✓ Collection dedup test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_seen_set_expires_bounds_and_persists(pathlib.Path(tempfile.mkdtemp()))
+    test_collect_skips_repeated_messages(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
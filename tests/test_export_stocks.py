@@ -0,0 +1,103 @@
+"""Tests for the change-aware stock export."""
+
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_data import MarketSnapshot
+from export_stocks import extract_and_save_stocks, plan_export
+
+
+def _snapshot(symbols):
+    return MarketSnapshot({'most_active': [{'symbol': s} for s in symbols]})
+
+
+def _stub_command(marker):
+    """A stub automation that copies the exported file to ``marker``.
+
+    The copy is moved into place atomically, so a waiting test never reads
+    a partly written marker.
+    """
+    script = ("import os, shutil, sys; shutil.copy(sys.argv[1], sys.argv[2] + '.part'); "
+              "os.replace(sys.argv[2] + '.part', sys.argv[2])")
+    return lambda output: [sys.executable, '-c', script, str(output), str(marker)]
+
+
+def _wait_for(path, timeout=10.0):
+    deadline = time.time() + timeout
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.02)
+    return path.read_text(encoding='utf-8').split('\n') if path.exists() else None
+
+
+def test_export_hands_off_only_new_symbols(tmp_path):
+    """Test the unchanged list is skipped and a changed list hands off only additions."""
+    output = tmp_path / 'stock_symbols.txt'
+    marker = tmp_path / 'handed_off.txt'
+    command = _stub_command(marker)(output)
+
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY', 'NVDA']), launch_command=command)
+    assert _wait_for(marker) == ['SPY', 'NVDA']
+    assert not list(tmp_path.glob('*.tmp'))
+
+    marker.unlink()
+    result = extract_and_save_stocks(str(output), _snapshot(['NVDA', 'SPY']), launch_command=command)
+    assert result and result.handed_off == []
+    time.sleep(0.3)
+    assert not marker.exists()
+
+    result = extract_and_save_stocks(str(output), _snapshot(['SPY', 'TSLA', 'NVDA']), launch_command=command)
+    assert result.handed_off == ['TSLA']
+    assert _wait_for(marker) == ['TSLA']
+    assert output.read_text(encoding='utf-8') == 'TSLA'
+    print("✓ Incremental hand-off test passed")
+
+
+def test_export_skips_recently_analyzed_symbols(tmp_path):
+    """Test symbols that drop out and return within the TTL are not re-analyzed."""
+    state = {'symbols': ['SPY'], 'analyzed': {'NVDA': 9000.0, 'TSLA': 0.0}}
+    assert plan_export(['SPY', 'NVDA', 'TSLA', 'AMD'], state, ttl_seconds=3600, now=10000.0) == ['TSLA', 'AMD']
+
+    output = tmp_path / 'stock_symbols.txt'
+    marker = tmp_path / 'handed_off.txt'
+    command = _stub_command(marker)(output)
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY', 'NVDA']), launch_command=command)
+    assert _wait_for(marker) == ['SPY', 'NVDA']
+
+    marker.unlink()
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY']), launch_command=command)
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY', 'NVDA']), launch_command=command)
+    time.sleep(0.3)
+    assert not marker.exists()
+
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY']), launch_command=command)
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY', 'NVDA']), launch_command=command,
+                                   analysis_ttl_hours=0)
+    assert _wait_for(marker) == ['NVDA']
+    print("✓ Analysis TTL test passed")
+
+
+def test_missing_automation_keeps_symbols_pending(tmp_path):
+    """Test a failed launch leaves the symbols to be handed off next run."""
+    output = tmp_path / 'stock_symbols.txt'
+    missing = [str(tmp_path / 'no_such_program')]
+    result = extract_and_save_stocks(str(output), _snapshot(['SPY']), launch_command=missing)
+    assert result and result.handed_off == []
+    assert output.read_text(encoding='utf-8') == 'SPY'
+
+    marker = tmp_path / 'handed_off.txt'
+    assert extract_and_save_stocks(str(output), _snapshot(['SPY']), launch_command=_stub_command(marker)(output))
+    assert _wait_for(marker) == ['SPY']
+    print("✓ Missing automation test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_export_hands_off_only_new_symbols(pathlib.Path(tempfile.mkdtemp()))
+    test_export_skips_recently_analyzed_symbols(pathlib.Path(tempfile.mkdtemp()))
+    test_missing_automation_keeps_symbols_pending(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
@@ -0,0 +1,112 @@
+"""Tests for the streaming snapshot exporters."""
+
+import sys
+import os
+import csv
+import io
+import json
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from exporters import CsvExporter, Exporter, ParquetExporter, export_records, export_snapshot, print_quote_table
+from market_data import MarketSnapshot
+
+
+def _snapshot():
+    return MarketSnapshot({
+        'most_active': [
+            {'symbol': 'SPY', 'name': 'SPDR S&P 500', 'price': 683.58, 'change': '+0.57%', 'volume': '49.21M'},
+            {'symbol': 'NAIL', 'name': 'Direxion Daily', 'price': 0.00, 'change': '-0.36%', 'volume': 'N/A'},
+        ],
+        'gainers': [{'symbol': 'SMX', 'name': 'SMX Security Inc', 'price': 49.02, 'change': '+231.11%',
+                     'volume': '22.54M'}],
+    }, fetched_at=1_764_000_000.0)
+
+
+def test_snapshot_exports_to_every_format(tmp_path):
+    """Test one pass writes matching CSV and JSON-lines rows."""
+    paths = export_snapshot(_snapshot(), str(tmp_path / 'out'), basename='snap')
+    assert sorted(paths) == ['csv', 'jsonl']
+
+    with open(paths['jsonl'], encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [(r['list_name'], r['rank'], r['symbol']) for r in rows] == [
+        ('most_active', 1, 'SPY'), ('most_active', 2, 'NAIL'), ('gainers', 1, 'SMX')]
+    assert rows[1]['price'] is None and rows[1]['volume'] is None
+    assert rows[0]['volume'] == pytest.approx(49.21e6)
+
+    with open(paths['csv'], newline='', encoding='utf-8') as f:
+        table = list(csv.DictReader(f))
+    assert [r['symbol'] for r in table] == ['SPY', 'NAIL', 'SMX']
+    assert table[1]['price'] == '' and table[2]['change_pct'] == '231.11'
+    assert not [name for name in os.listdir(tmp_path / 'out') if name.endswith('.tmp')]
+    print("✓ Multi-format export test passed")
+
+
+def test_failed_export_keeps_previous_file(tmp_path):
+    """Test an export that fails midway leaves the old file and no temp files."""
+    path = tmp_path / 'quotes.csv'
+    path.write_text('old\n', encoding='utf-8')
+
+    def records():
+        yield {'symbol': 'AAPL'}
+        raise RuntimeError("feed dropped")
+
+    with pytest.raises(RuntimeError):
+        with CsvExporter(str(path)) as exporter:
+            exporter.write_many(records())
+    with pytest.raises(ValueError):
+        export_records([{'symbol': 'AAPL'}], str(tmp_path), 'quotes', formats=['csv', 'xlsx'])
+    assert path.read_text(encoding='utf-8') == 'old\n'
+    assert os.listdir(tmp_path) == ['quotes.csv']
+    print("✓ Atomic export test passed")
+
+
+def test_parquet_export(tmp_path):
+    """Test Parquet output round-trips (needs pyarrow)."""
+    pq = pytest.importorskip('pyarrow.parquet')
+    paths = export_snapshot(_snapshot(), str(tmp_path), formats=['parquet'], basename='snap')
+    table = pq.read_table(paths['parquet'])
+    assert table.column('symbol').to_pylist() == ['SPY', 'NAIL', 'SMX']
+    assert table.column('price').to_pylist()[1] is None
+    print("✓ Parquet export test passed")
+
+
+def test_parquet_without_pyarrow_fails_cleanly(tmp_path, monkeypatch):
+    """Test a missing pyarrow raises a clear ImportError and leaves no temporary file."""
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow.parquet', None)
+    with pytest.raises(ImportError, match='pip install pyarrow'):
+        ParquetExporter(str(tmp_path / 'snap.parquet'))
+    assert os.listdir(tmp_path) == []
+    print("✓ Missing pyarrow test passed")
+
+
+def test_exporter_requires_write(tmp_path):
+    """Test an exporter without ``write`` cannot be instantiated."""
+    class Incomplete(Exporter):
+        extension = 'txt'
+
+    with pytest.raises(TypeError):
+        Incomplete(str(tmp_path / 'out.txt'))
+    assert os.listdir(tmp_path) == []
+    print("✓ Abstract exporter test passed")
+
+
+def test_console_quote_table():
+    """Test the quote table layout used by the movers display."""
+    stream = io.StringIO()
+    print_quote_table(_snapshot().most_active(), rule_width=30, stream=stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split() == ['Rank', 'Symbol', 'Company', 'Name', 'Price', '%', 'Change', 'Volume']
+    assert lines[1] == '-' * 30
+    assert lines[2].split() == ['1', 'SPY', 'SPDR', 'S&P', '500', '$683.58', '+0.57%', '49.21M']
+    assert lines[3].startswith('2      NAIL     Direxion Daily            $0.00 ')
+    print("✓ Console table test passed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-q'])
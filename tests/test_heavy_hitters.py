@@ -0,0 +1,66 @@
+"""Tests for approximate heavy hitters against exact counts."""
+
+import sys
+import os
+import random
+from collections import Counter
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from heavy_hitters import SpaceSaving
+
+
+def zipf_stream(length, universe_size=5000, exponent=1.1, seed=3):
+    """Generate a Zipf-distributed stream of synthetic symbols."""
+    rng = random.Random(seed)
+    symbols = [f"S{i}" for i in range(universe_size)]
+    weights = [1.0 / (rank + 1) ** exponent for rank in range(universe_size)]
+    return rng.choices(symbols, weights=weights, k=length)
+
+
+def test_space_saving_matches_exact_top_n():
+    """Test that the approximate top-N equals the exact top-N on a Zipf corpus."""
+    stream = zipf_stream(200_000)
+    exact = Counter(stream)
+    summary = SpaceSaving(capacity=200).update(stream)
+    
+    assert len(summary) == 200
+    assert [s for s, _ in summary.most_common(10)] == [s for s, _ in exact.most_common(10)]
+    for symbol, count in summary.most_common(50):
+        assert exact[symbol] <= count <= exact[symbol] + summary.error_bound
+    print(f"✓ Space-Saving top-N test passed (error bound {summary.error_bound:.0f})")
+
+
+def test_merged_shards_match_exact_top_n():
+    """Test that summaries merged across shards keep the exact top-N."""
+    stream = zipf_stream(200_000, seed=5)
+    exact = Counter(stream)
+    shards = [SpaceSaving(capacity=200).update(stream[i::4]) for i in range(4)]
+    
+    merged = shards[0]
+    for shard in shards[1:]:
+        merged = merged.merge(shard)
+    
+    assert merged.total == len(stream)
+    assert [s for s, _ in merged.guaranteed(10)] == [s for s, _ in exact.most_common(10)]
+    for symbol, count in merged.most_common(20):
+        assert exact[symbol] <= count <= exact[symbol] + merged.error_bound
+    print("✓ Merged shard test passed")
+
+
+def test_analyzer_approximate_mode():
+    """Test the analyzer's bounded-memory mode on real text."""
+    analyzer = SymbolAnalyzer()
+    texts = ["AAPL is great. I love AAPL.", "MSFT is good.", "AAPL and MSFT are both good."]
+    
+    assert analyzer.analyze_mentions(texts, top_n=2, capacity=10) == analyzer.analyze_mentions(texts, top_n=2)
+    print("✓ Analyzer approximate mode test passed")
+
+
+if __name__ == "__main__":
+    test_space_saving_matches_exact_top_n()
+    test_merged_shards_match_exact_top_n()
+    test_analyzer_approximate_mode()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,178 @@
+"""Tests for the HTTP response cache."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from http_cache import CachingAdapter, ResponseCache
+from scraper import StockTwitsScraper
+
+
+class FakeServerAdapter(BaseAdapter):
+    """Adapter answering with a fixed ETag'd body, or 304 when revalidated."""
+
+    def __init__(self, body=b'{"symbols": []}', etag_header='ETag'):
+        super().__init__()
+        self.body = body
+        self.etag_header = etag_header
+        self.calls = []
+
+    def send(self, request, **kwargs):
+        self.calls.append(dict(request.headers))
+        response = Response()
+        response.request = request
+        response.url = request.url
+        if request.headers.get('If-None-Match') == '"v1"':
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = self.body
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict({self.etag_header: '"v1"', 'Content-Type': 'application/json'})
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _session(cache, server):
+    session = requests.Session()
+    session.mount('http://', CachingAdapter(cache, adapter=server))
+    return session
+
+
+def test_fresh_hit_and_revalidation():
+    """Test TTL hits skip the network and stale entries revalidate via ETag."""
+    clock = FakeClock()
+    cache = ResponseCache(ttls={r'/trending': 60}, clock=clock)
+    server = FakeServerAdapter()
+    session = _session(cache, server)
+    url = 'http://stub/api/v3/trending/symbols'
+    
+    assert session.get(url).json() == {'symbols': []}
+    assert session.get(url).json() == {'symbols': []}
+    assert len(server.calls) == 1
+    
+    clock.now += 120
+    response = session.get(url)
+    assert response.status_code == 200 and response.json() == {'symbols': []}
+    assert server.calls[-1]['If-None-Match'] == '"v1"'
+    assert cache.stats['hits'] == 1 and cache.stats['revalidated'] == 1 and cache.stats['misses'] == 1
+    print(f"✓ Cache revalidation test passed: {cache.stats}")
+
+
+def test_revalidation_ignores_header_case():
+    """Test a lowercase etag is revalidated and merged without duplicating it."""
+    clock = FakeClock()
+    cache = ResponseCache(ttls={r'/trending': 60}, clock=clock)
+    server = FakeServerAdapter(etag_header='etag')
+    session = _session(cache, server)
+    url = 'http://stub/api/v3/trending/symbols'
+
+    session.get(url)
+    clock.now += 120
+    server.etag_header = 'ETag'
+    assert session.get(url).json() == {'symbols': []}
+    assert server.calls[-1]['If-None-Match'] == '"v1"'
+    assert cache.stats['revalidated'] == 1
+    assert [k for k in cache.get(url).headers if k.lower() == 'etag'] == ['ETag']
+    print("✓ Header case revalidation test passed")
+
+
+def test_lru_eviction_bounds_size():
+    """Test that the least recently used entries are evicted first."""
+    clock = FakeClock()
+    cache = ResponseCache(max_bytes=25, clock=clock)
+    
+    cache.put('a', 200, {}, b'x' * 10)
+    clock.now += 1
+    cache.put('b', 200, {}, b'x' * 10)
+    clock.now += 1
+    cache.get('a')
+    clock.now += 1
+    cache.put('c', 200, {}, b'x' * 10)
+    
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.get('b') is None
+    assert cache.stats['evictions'] == 1
+    print("✓ LRU eviction test passed")
+
+
+def test_cache_persists_to_disk(tmp_path):
+    """Test that entries survive reopening the cache file."""
+    path = str(tmp_path / 'responses.db')
+    cache = ResponseCache(path)
+    cache.put('http://stub/x', 200, {'ETag': '"v1"'}, b'body')
+    cache.close()
+    
+    reopened = ResponseCache(path)
+    assert reopened.get('http://stub/x').body == b'body'
+    reopened.close()
+    print("✓ Cache persistence test passed")
+
+
+class RecordingLimiter:
+    """Rate limiter stub counting acquires and header updates."""
+
+    def __init__(self):
+        self.acquired = 0
+        self.updates = []
+
+    def acquire(self):
+        self.acquired += 1
+        return 0.0
+
+    def update_from_headers(self, headers):
+        self.updates.append(dict(headers))
+
+
+def test_hits_skip_disk_writes_and_rate_limiter():
+    """Test cache hits neither commit access times nor replay stale quota headers."""
+    clock = FakeClock()
+    cache = ResponseCache(ttls={r'/trending': 60}, clock=clock)
+    limiter = RecordingLimiter()
+    scraper = StockTwitsScraper(rate_limiter=limiter, cache=cache)
+    scraper.session.mount('http://', CachingAdapter(cache, adapter=FakeServerAdapter()))
+    url = 'http://stub/api/v3/trending/symbols'
+
+    scraper._get(url)
+    writes = cache._conn.total_changes
+    clock.now += 1
+    for _ in range(5):
+        assert scraper._get(url).from_cache
+    assert cache._conn.total_changes == writes
+    assert limiter.acquired == 1 and len(limiter.updates) == 1
+
+    clock.now += 1
+    cache.put('http://stub/other', 200, {}, b'x')
+    last_access = cache._conn.execute("SELECT last_access FROM responses WHERE url = ?", (url,)).fetchone()[0]
+    assert last_access == 1001.0
+    scraper.close()
+    print("✓ Cache hit side-effect test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_fresh_hit_and_revalidation()
+    test_revalidation_ignores_header_case()
+    test_lru_eviction_bounds_size()
+    test_cache_persists_to_disk(pathlib.Path(tempfile.mkdtemp()))
+    test_hits_skip_disk_writes_and_rate_limiter()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,150 @@
+"""Tests for the market data fetcher."""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_data import MarketDataFetcher, MarketSnapshot
+from rate_limit import TokenBucket
+from transport import Transport
+
+
+class QuoteStubHandler(BaseHTTPRequestHandler):
+    """Finnhub / Alpha Vantage stand-in; symbols starting with 'BAD' fail with 500.
+
+    Alpha Vantage quotes for symbols starting with 'ODD' carry a malformed volume.
+    """
+
+    requests_seen = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        QuoteStubHandler.requests_seen.append((url.path, query))
+        if url.path == '/finnhub/quote':
+            if query['symbol'].startswith('BAD'):
+                self.send_error(500)
+                return
+            payload = {'c': 100.0 + len(query['symbol']), 'dp': 1.5}
+        else:
+            payload = {'Stock Quotes': [
+                {'1. symbol': s, '2. price': '10.50', '3. volume': 'n/a' if s.startswith('ODD') else '1200'}
+                for s in query['symbols'].split(',') if not s.startswith('BAD')
+            ]}
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _stub_fetcher(server, provider):
+    host, port = server.server_address[:2]
+    fetcher = MarketDataFetcher(provider=provider, api_key='test',
+                                rate_limiter=TokenBucket(rate=1000.0, capacity=100.0),
+                                transport=Transport(max_retries=0))
+    fetcher.FINNHUB_BASE_URL = f"http://{host}:{port}/finnhub"
+    fetcher.ALPHA_VANTAGE_BASE_URL = f"http://{host}:{port}/query"
+    return fetcher
+
+
+def _counting_fetcher(**kwargs):
+    """Build a fetcher that counts upstream fetches."""
+    fetcher = MarketDataFetcher(**kwargs)
+    fetch = fetcher._fetch_from_yahoo_finance
+    fetcher.fetch_count = 0
+    
+    def counted():
+        fetcher.fetch_count += 1
+        return fetch()
+    
+    fetcher._fetch_from_yahoo_finance = counted
+    return fetcher
+
+
+def test_snapshot_shared_across_calls():
+    """Test that one snapshot serves most active, gainers and losers."""
+    fetcher = _counting_fetcher()
+    
+    active = fetcher.get_most_active_stocks(limit=10)
+    gainers = fetcher.get_gainers(limit=5)
+    losers = fetcher.get_losers(limit=5)
+    
+    assert fetcher.fetch_count == 1
+    assert len(active) == 10 and gainers[0]['symbol'] == 'SMX' and losers[0]['symbol'] == 'NVDA'
+    fetcher.close()
+    print("✓ Shared snapshot test passed")
+
+
+def test_snapshot_ttl_and_refresh():
+    """Test that stale snapshots and explicit refreshes refetch."""
+    fetcher = _counting_fetcher(snapshot_ttl=0)
+    fetcher.get_most_active_stocks()
+    fetcher.get_gainers()
+    assert fetcher.fetch_count == 2
+    
+    fetcher.snapshot_ttl = 3600
+    first = fetcher.get_snapshot()
+    assert fetcher.get_snapshot() is first
+    assert fetcher.refresh_snapshot() is not first
+    assert fetcher.fetch_count == 3
+    fetcher.close()
+    print("✓ Snapshot TTL test passed")
+
+
+def test_snapshot_staleness():
+    """Test snapshot age bookkeeping."""
+    snapshot = MarketSnapshot({'most_active': []}, fetched_at=100.0)
+    
+    assert not snapshot.is_stale(60, now=159.0)
+    assert snapshot.is_stale(60, now=160.0)
+    assert snapshot.gainers() is None
+    print("✓ Snapshot staleness test passed")
+
+
+def test_bulk_prices_against_stub_server():
+    """Test batching, dedup and partial results against a local HTTP stub."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), QuoteStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        QuoteStubHandler.requests_seen.clear()
+        fetcher = _stub_fetcher(server, 'finnhub')
+        prices = fetcher.get_stock_prices(['AAPL', 'msft', 'AAPL', 'BADX', 'NVDA'])
+        
+        assert sorted(prices) == ['AAPL', 'MSFT', 'NVDA']
+        assert prices['AAPL']['price'] == 104.0 and prices['AAPL']['change'] == '+1.50%'
+        assert len(QuoteStubHandler.requests_seen) == 4
+        assert fetcher.get_stock_price('BADX')['price'] is None
+        fetcher.close()
+        
+        QuoteStubHandler.requests_seen.clear()
+        fetcher = _stub_fetcher(server, 'alpha_vantage')
+        symbols = [f"S{i}" for i in range(249)] + ['BADY', 'ODDZ']
+        prices = fetcher.get_stock_prices(symbols)
+        
+        assert len(prices) == 250 and prices['S0']['volume'] == 1200
+        assert prices['ODDZ']['price'] == 10.5 and prices['ODDZ']['volume'] is None
+        assert len(QuoteStubHandler.requests_seen) == 3
+        fetcher.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✓ Bulk price test passed")
+
+
+if __name__ == "__main__":
+    test_snapshot_shared_across_calls()
+    test_snapshot_ttl_and_refresh()
+    test_snapshot_staleness()
+    test_bulk_prices_against_stub_server()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,126 @@
+"""Tests for the timing and HTTP metrics registry."""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import MetricsAdapter, MetricsRegistry, endpoint_label
+from transport import ResilientAdapter
+
+
+class SymbolHandler(BaseHTTPRequestHandler):
+    """Serves /symbols/<symbol>/messages; 'BAD' answers 404, 'TSLA' omits Content-Length."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        status = 404 if '/BAD/' in self.path else 200
+        body = b'{"messages": []}'
+        self.send_response(status)
+        if '/TSLA/' in self.path:
+            # Close-delimited body, so the adapter has to measure it
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = True
+            return
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_disabled_registry_records_nothing():
+    """Test timers, stages and counters are no-ops until enabled."""
+    registry = MetricsRegistry()
+    with registry.timer('work_seconds'):
+        pass
+    with registry.stage('fetch'):
+        pass
+    registry.inc('events_total')
+    assert registry.to_records() == []
+
+    registry.enable()
+    with registry.timer('work_seconds', step='one'):
+        pass
+    registry.inc('events_total', 2, kind='x')
+    assert {r['name'] for r in registry.to_records()} == {'work_seconds', 'events_total'}
+    print("✓ Disabled registry test passed")
+
+
+def test_prometheus_and_jsonl_output(tmp_path):
+    """Test both export formats carry the same series."""
+    registry = MetricsRegistry()
+    registry.enable()
+    for value in (0.003, 0.2, 20.0):
+        registry.observe('http_request_seconds', value, endpoint='api/symbols/{symbol}/messages')
+    registry.inc('http_errors_total', endpoint='api/quote', reason='500')
+    for peak in (300, 900, 500):
+        registry.set_max('stage_peak_memory_bytes', peak, stage='fetch')
+
+    text = registry.to_prometheus()
+    assert '# TYPE http_request_seconds histogram' in text
+    assert 'http_request_seconds_bucket{endpoint="api/symbols/{symbol}/messages",le="0.005"} 1' in text
+    assert 'http_request_seconds_bucket{endpoint="api/symbols/{symbol}/messages",le="0.25"} 2' in text
+    assert 'http_request_seconds_bucket{endpoint="api/symbols/{symbol}/messages",le="+Inf"} 3' in text
+    assert 'http_request_seconds_count{endpoint="api/symbols/{symbol}/messages"} 3' in text
+    assert 'http_errors_total{endpoint="api/quote",reason="500"} 1' in text
+    assert '# TYPE stage_peak_memory_bytes gauge' in text
+    assert 'stage_peak_memory_bytes{stage="fetch"} 900' in text
+
+    path = tmp_path / 'metrics.jsonl'
+    registry.write(str(path))
+    registry.write(str(path))
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert len(records) == 6
+    histogram = next(r for r in records if r['type'] == 'histogram')
+    assert histogram['count'] == 3 and histogram['buckets']['+Inf'] == 3
+    print("✓ Export format test passed")
+
+
+def test_adapter_records_latency_bytes_and_errors():
+    """Test per-endpoint HTTP metrics recorded by MetricsAdapter."""
+    import requests
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SymbolHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    base = f"http://{host}:{port}/api/v3/symbols"
+
+    registry = MetricsRegistry()
+    registry.enable()
+    session = requests.Session()
+    session.mount('http://', MetricsAdapter(ResilientAdapter(max_retries=0), registry=registry))
+    for symbol in ('AAPL', 'TSLA', 'BAD'):
+        session.get(f"{base}/{symbol}/messages", timeout=5)
+    session.close()
+    server.shutdown()
+    server.server_close()
+
+    endpoint = endpoint_label(f"{base}/AAPL/messages")
+    assert endpoint == f"{host}:{port}/api/v3/symbols/{{symbol}}/messages"
+    assert endpoint_label(f"{base}/trending") == f"{host}:{port}/api/v3/symbols/trending"
+    counters = {(r['name'], tuple(sorted(r['labels'].items()))): r['value']
+                for r in registry.to_records() if r['type'] == 'counter'}
+    assert counters[('http_requests_total', (('endpoint', endpoint), ('status', '200')))] == 2
+    assert counters[('http_errors_total', (('endpoint', endpoint), ('reason', '404')))] == 1
+    assert counters[('http_response_bytes_total', (('endpoint', endpoint),))] == 3 * len(b'{"messages": []}')
+    histogram = next(r for r in registry.to_records() if r['name'] == 'http_request_seconds')
+    assert histogram['count'] == 3
+    print("✓ HTTP adapter metrics test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_disabled_registry_records_nothing()
+    test_prometheus_and_jsonl_output(pathlib.Path(tempfile.mkdtemp()))
+    test_adapter_records_latency_bytes_and_errors()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,52 @@
+"""Tests for multi-core batch analysis."""
+
+import sys
+import os
+import json
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from parallel import parallel_count_file, parallel_count_mentions
+
+TEXTS = [
+    "AAPL is great. I love AAPL.",
+    "MSFT is good, TSLA too",
+    "TSLA and MSFT are both good.",
+    "nothing here",
+    "$GOOGL BOB.X and SPY",
+] * 50
+
+
+def test_parallel_matches_serial():
+    """Test that pooled counting is identical to the serial path, ties included."""
+    analyzer = SymbolAnalyzer()
+    serial = analyzer.count_mentions(TEXTS)
+    
+    result = parallel_count_mentions(iter(TEXTS), workers=2, chunk_size=7, analyzer=analyzer)
+    
+    assert list(result.counts.items()) == list(serial.counts.items())
+    assert result.statistics() == serial.statistics()
+    print(f"✓ Parallel/serial equivalence test passed: {result.most_common(3)}")
+
+
+def test_parallel_universe_and_file(tmp_path):
+    """Test file input and that workers rebuild the universe matcher."""
+    analyzer = SymbolAnalyzer(universe=['AAPL', 'GOOGL', 'BOB.X'])
+    path = tmp_path / 'messages.jsonl'
+    path.write_text('\n'.join(json.dumps({'message': text}) for text in TEXTS), encoding='utf-8')
+    
+    result = parallel_count_file(str(path), workers=2, chunk_size=20, analyzer=analyzer)
+    
+    assert result.most_common() == analyzer.analyze_mentions(TEXTS)
+    assert dict(result.most_common())['BOB.X'] == 50
+    print("✓ Parallel file analysis test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_parallel_matches_serial()
+    test_parallel_universe_and_file(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
@@ -0,0 +1,55 @@
+"""Tests for parsed quotes and columnar quote batches."""
+
+import sys
+import os
+import math
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from quotes import Quote, QuoteBatch, format_volume, parse_change, parse_volume
+
+
+def test_parse_fields():
+    """Test volume and change parsing, including suffixes and N/A."""
+    assert parse_volume('22.54M') == 22_540_000
+    assert parse_volume('950K') == 950_000
+    assert parse_volume('1.2B') == 1_200_000_000
+    assert math.isnan(parse_volume('N/A'))
+    assert parse_change('+231.11%') == 231.11
+    assert parse_change('-0.00%') == 0.0
+    assert format_volume(22_540_000) == '22.54M'
+    print("✓ Field parsing test passed")
+
+
+def test_batch_summaries_and_sorting():
+    """Test vectorized totals, averages and NaN-last sorting."""
+    batch = QuoteBatch.from_dicts([
+        {'symbol': 'SPY', 'name': 'SPDR', 'price': 683.58, 'volume': '49.21M', 'change': '+0.57%'},
+        {'symbol': 'TINY', 'name': 'Tiny', 'price': 1.00, 'volume': '950K', 'change': '+3.00%'},
+        {'symbol': 'NAIL', 'name': 'Direxion', 'price': 0.00, 'volume': 'N/A', 'change': '-0.36%'},
+        {'symbol': 'NVDA', 'name': 'NVIDIA', 'price': 176.64, 'volume': '1.2B', 'change': '-2.01%'},
+    ])
+    
+    assert batch.total_volume() == 49_210_000 + 950_000 + 1_200_000_000
+    assert abs(batch.average_price() - (683.58 + 1.00 + 176.64) / 3) < 1e-9
+    assert list(batch.sort_by('volume').symbols) == ['NVDA', 'SPY', 'TINY', 'NAIL']
+    assert list(batch.top(2, 'change_pct').symbols) == ['TINY', 'SPY']
+    assert batch[2].to_dict()['volume'] == 'N/A'
+    print("✓ Batch summary test passed")
+
+
+def test_quote_is_compact():
+    """Test that quotes use slots instead of a per-instance dict."""
+    quote = Quote.from_dict({'symbol': 'AAPL', 'price': 1.5, 'change': '+1%', 'volume': '1M'})
+    
+    assert not hasattr(quote, '__dict__')
+    assert quote.volume == 1_000_000
+    print("✓ Compact quote test passed")
+
+
+if __name__ == "__main__":
+    test_parse_fields()
+    test_batch_summaries_and_sorting()
+    test_quote_is_compact()
+    print("\n✓ All tests passed!")
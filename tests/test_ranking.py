@@ -0,0 +1,140 @@
+"""Tests for top-K selection and the composite ranking engine."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_data import MarketDataFetcher
+from ranking import QuantileReference, RankingEngine, rank_quotes, top_k_indices
+
+
+def test_top_k_matches_stable_sort():
+    """Test partial selection returns what a stable full sort would, NaN last."""
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        values = rng.integers(0, 6, rng.integers(1, 40)).astype(float)
+        values[rng.random(len(values)) < 0.2] = np.nan
+        k = int(rng.integers(0, 45))
+        for descending in (True, False):
+            expected = np.argsort(-values if descending else values, kind='stable')[:k]
+            assert list(top_k_indices(values, k, descending)) == list(expected)
+    print("✓ Top-K selection test passed")
+
+
+def test_quantile_reference_matches_binary_search():
+    """Test bucketed percentile lookup equals a binary search over the cut points."""
+    rng = np.random.default_rng(3)
+    samples = [rng.normal(0, 4, 5000), np.abs(rng.standard_cauchy(5000)) ** 3,
+               np.log10(1 + rng.poisson(0.05, 5000)), rng.integers(0, 3, 50).astype(float), np.array([2.0])]
+    for values in samples:
+        values[rng.random(len(values)) < 0.1] = np.nan
+        reference = QuantileReference(values)
+        cuts = reference.cuts
+        assert len(cuts) <= 101
+        probes = np.concatenate([values, cuts, np.nextafter(cuts, np.inf), np.nextafter(cuts, -np.inf),
+                                 rng.normal(0, 50, 100), [np.inf, -np.inf]])
+        expected = (np.searchsorted(cuts, probes, 'left') + np.searchsorted(cuts, probes, 'right')) / (2 * len(cuts))
+        expected[~np.isfinite(probes)] = 0.5
+        assert np.array_equal(reference.ranks(probes), expected)
+    assert list(QuantileReference(np.array([np.nan])).ranks(np.array([1.0, np.nan]))) == [0.0, 0.0]
+    print("✓ Quantile reference test passed")
+
+
+def test_incremental_reranking_matches_full_ranking():
+    """Test cached top-K stays exact as a few quotes change at a time."""
+    rng = np.random.default_rng(2)
+    symbols = [f"S{i}" for i in range(400)]
+    engine = RankingEngine(capacity=16)
+    engine.update_many({'symbol': s, 'volume': float(v), 'change_pct': float(c), 'avg_volume': float(a)}
+                       for s, v, c, a in zip(symbols, rng.lognormal(12, 2, 400), rng.normal(0, 3, 400),
+                                             rng.lognormal(12, 1, 400)))
+    for step in range(200):
+        k = int(rng.integers(1, 25))
+        expected = np.argsort(-engine.scores(), kind='stable')[:k]
+        assert [symbol for symbol, _ in engine.top(k)] == [symbols[i] for i in expected]
+        changed = rng.choice(len(symbols), size=3, replace=False)
+        engine.update_many({'symbol': symbols[i], 'volume': float(rng.lognormal(12, 2))} for i in changed)
+        if step % 40 == 0:
+            engine.set_mentions({symbols[int(rng.integers(400))]: 500})
+    stats = engine.stats
+    assert stats['cached_selections'] > 0 and stats['fits'] <= 8
+    assert stats['rescored'] - stats['fits'] * 400 < 200 * 4
+    print(f"✓ Incremental ranking test passed: {engine.stats}")
+
+
+def test_rank_quotes_weights_and_fields():
+    """Test composite weights, single-field ranking and fetcher integration."""
+    quotes = [
+        {'symbol': 'SPY', 'price': 683.58, 'change': '+0.57%', 'volume': '49.21M', 'avg_volume': '60M'},
+        {'symbol': 'SMX', 'price': 49.02, 'change': '+231.11%', 'volume': '22.54M', 'avg_volume': '0.5M'},
+        {'symbol': 'NVDA', 'price': 176.64, 'change': '-2.01%', 'volume': '121.33M', 'avg_volume': '120M'},
+    ]
+    assert [q['symbol'] for q in rank_quotes(quotes, 3, weights={'volume': 1.0})] == ['NVDA', 'SPY', 'SMX']
+    assert rank_quotes(quotes, 1, weights={'relative_volume': 1.0})[0]['symbol'] == 'SMX'
+    assert rank_quotes(quotes, 1, weights={'mentions': 1.0}, mentions={'SPY': 40})[0]['symbol'] == 'SPY'
+    losers = rank_quotes(quotes, 2, by='change_pct', descending=False)
+    assert [(q['symbol'], q['score']) for q in losers] == [('NVDA', -2.01), ('SPY', 0.57)]
+    try:
+        RankingEngine({'beta': 1.0})
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    fetcher = MarketDataFetcher(api_key='test')
+    fetcher.get_stock_prices = lambda symbols, max_workers=4: {q['symbol']: q for q in quotes}
+    assert [q['symbol'] for q in fetcher.rank_stocks(['SPY', 'SMX', 'NVDA'], limit=2,
+                                                      weights={'abs_change_pct': 1.0})] == ['SMX', 'NVDA']
+    print("✓ Quote ranking test passed")
+
+
+def test_rank_stocks_on_provider_quotes():
+    """Test default ranking on real Finnhub and Alpha Vantage quote shapes."""
+    def finnhub_fetcher(moves):
+        fetcher = MarketDataFetcher(api_key='test')
+        quotes = {}
+        for symbol, (price, change_pct) in moves.items():
+            quotes.update(MarketDataFetcher._parse_finnhub(symbol, {'c': price, 'dp': change_pct, 'pc': price}))
+        fetcher.get_stock_prices = lambda symbols, max_workers=4: quotes
+        return fetcher
+
+    moves = {'SPY': (683.58, 0.57), 'SMX': (49.02, 231.11), 'NVDA': (176.64, -2.01),
+             'TSLA': (402.0, 3.5), 'GONE': (0, 0)}
+    mentions = {'SPY': 400, 'NVDA': 90, 'TSLA': 12}
+    ranked = finnhub_fetcher(moves).rank_stocks(list(moves), limit=4, mentions=mentions)
+    # Volume is unknown for every Finnhub quote, so it ranks nobody
+    assert [(q['symbol'], q['score']) for q in ranked] == [
+        ('SMX', 0.9375), ('TSLA', 0.8125), ('NVDA', 0.6875), ('SPY', 0.5625)]
+    # Percentile features: the outlier's size does not matter, only its rank
+    moves['SMX'] = (49.02, 4.0)
+    calmer = finnhub_fetcher(moves).rank_stocks(list(moves), limit=4, mentions=mentions)
+    assert [(q['symbol'], q['score']) for q in calmer] == [(q['symbol'], q['score']) for q in ranked]
+    try:
+        rank_quotes(ranked, by='relative_volume')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    fetcher = MarketDataFetcher(api_key='test', provider='alpha_vantage')
+    quotes = MarketDataFetcher._parse_alpha_vantage({'Stock Quotes': [
+        {'1. symbol': 'aapl', '2. price': '270.10', '3. volume': '50123000'},
+        {'1. symbol': 'F', '2. price': '11.30', '3. volume': '91000000'},
+        {'1. symbol': 'IBM', '2. price': '301.00', '3. volume': '-'},
+    ]})
+    fetcher.get_stock_prices = lambda symbols, max_workers=4: quotes
+    ranked = fetcher.rank_stocks(['AAPL', 'F', 'IBM'], limit=3)
+    assert [q['symbol'] for q in ranked] == ['F', 'IBM', 'AAPL']
+    assert all(np.isfinite(q['score']) for q in ranked)
+    print("✓ Provider quote ranking test passed")
+
+
+if __name__ == "__main__":
+    test_top_k_matches_stable_sort()
+    test_quantile_reference_matches_binary_search()
+    test_incremental_reranking_matches_full_ranking()
+    test_rank_quotes_weights_and_fields()
+    test_rank_stocks_on_provider_quotes()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,153 @@
+"""Tests for HTTP traffic recording and replay."""
+
+import sys
+import os
+import gzip
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from http_cache import ResponseCache
+from market_data import MarketDataFetcher
+from rate_limit import TokenBucket
+from recording import ReplayAdapter, ReplayMissError, request_key
+from scraper import StockTwitsScraper
+from transport import Transport, set_shared_transport
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    """StockTwits/Finnhub stand-in; every message poll returns a newer message."""
+
+    polls = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/finnhub/quote'):
+            payload = {'c': 101.5, 'dp': 2.0}
+        else:
+            StreamHandler.polls += 1
+            payload = {'messages': [{'id': StreamHandler.polls, 'body': f'$AAPL poll {StreamHandler.polls}'}]}
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@contextmanager
+def _serving():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StreamHandler.polls = 0
+    host, port = server.server_address[:2]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server_url():
+    with _serving() as url:
+        yield url
+
+
+def _clients(transport, base_url):
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0), transport=transport)
+    scraper.BASE_URL = base_url
+    fetcher = MarketDataFetcher(api_key='secret', transport=transport,
+                                rate_limiter=TokenBucket(rate=1000.0, capacity=100.0))
+    fetcher.FINNHUB_BASE_URL = f"{base_url}/finnhub"
+    return scraper, fetcher
+
+
+def test_record_then_replay_offline(server_url, tmp_path):
+    """Test a recorded session replays identically with the server gone."""
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    transport = Transport(max_retries=0, record_path=path)
+    scraper, fetcher = _clients(transport, server_url)
+    live = [scraper.get_recent_posts('AAPL') for _ in range(3)]
+    live_price = fetcher.get_stock_price('AAPL')
+    transport.close()
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 4 and transport.stats()['recorded'] == 4
+    assert all('secret' not in record['key'] for record in records)
+
+    replay = ReplayAdapter(path)
+    transport = Transport(replay=replay)
+    scraper, fetcher = _clients(transport, server_url)
+    polls = StreamHandler.polls
+    assert fetcher.get_stock_price('AAPL') == live_price
+    assert [scraper.get_recent_posts('AAPL') for _ in range(3)] == live
+    assert StreamHandler.polls == polls
+    # The recording is exhausted: the client sees a failed request
+    assert scraper.get_recent_posts('AAPL') is None
+    with pytest.raises(ReplayMissError):
+        transport.session.get(f"{server_url}/symbols/AAPL/messages?limit=30")
+    assert transport.stats()['replay_replayed'] == 4
+    transport.close()
+    print("✓ Record/replay test passed")
+
+
+def test_replay_time_scaling(tmp_path):
+    """Test paced replay holds responses at their recorded offsets divided by speed."""
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for t in (1000.0, 1010.0, 1040.0):
+            f.write(json.dumps({'t': t, 'key': request_key('GET', 'http://x/poll?token=abc'),
+                                'status': 200, 'headers': {}, 'body': str(t)}) + '\n')
+
+    now = [50.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    transport = Transport(replay=ReplayAdapter(path, speed=10.0, clock=lambda: now[0], sleep=sleep))
+    bodies = [transport.session.get('http://x/poll').text for _ in range(3)]
+    assert bodies == ['1000.0', '1010.0', '1040.0']
+    assert sleeps == pytest.approx([1.0, 3.0])
+    transport.close()
+    print("✓ Replay pacing test passed")
+
+
+def test_client_cache_rejected_while_recording(tmp_path):
+    """Test a client-private cache cannot silently bypass a recording shared transport."""
+    shared = Transport(record_path=str(tmp_path / 'traffic.jsonl.gz'))
+    previous = set_shared_transport(shared)
+    try:
+        with pytest.raises(ValueError):
+            StockTwitsScraper(cache=ResponseCache())
+        with pytest.raises(ValueError):
+            MarketDataFetcher(api_key='secret', cache=ResponseCache())
+        assert StockTwitsScraper().transport is shared
+    finally:
+        set_shared_transport(previous)
+        shared.close()
+    scraper = StockTwitsScraper(cache=ResponseCache())
+    assert scraper.transport is not shared and scraper.cache is not None
+    scraper.close()
+    print("✓ Cache/recording conflict test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with _serving() as url:
+        test_record_then_replay_offline(url, pathlib.Path(tempfile.mkdtemp()))
+    test_replay_time_scaling(pathlib.Path(tempfile.mkdtemp()))
+    test_client_cache_rejected_while_recording(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
@@ -0,0 +1,176 @@
+"""Tests for the StockTwits scraper and its rate limiter."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cursor_store import CursorStore
+from rate_limit import TokenBucket
+from scraper import StockTwitsScraper
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping just moves time forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests():
+    """Test that an empty bucket waits for the refill interval."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=clock, wall_clock=clock, sleep=clock.sleep)
+    
+    assert bucket.acquire() == 0
+    assert abs(bucket.acquire() - 0.5) < 1e-9
+    print("✓ Token bucket pacing test passed")
+
+
+def test_token_bucket_honors_rate_limit_headers():
+    """Test that an exhausted server budget blocks until the reset time."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100.0, capacity=10.0, clock=clock, wall_clock=clock, sleep=clock.sleep)
+    
+    bucket.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(clock.now + 30)})
+    waited = bucket.acquire()
+    
+    assert 30 <= waited < 30.1
+    print(f"✓ Rate-limit header test passed: waited {waited:.2f}s")
+
+
+def test_concurrent_collection_preserves_order():
+    """Test that concurrent collection returns the same structure as serial."""
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0))
+    trending = [{'symbol': s} for s in ['AAPL', 'MSFT', 'TSLA', 'NVDA']]
+    scraper.get_most_mentioned_symbols = lambda limit=30: trending[:limit]
+    scraper.get_recent_posts = lambda symbol, limit=30: [
+        {'body': f"{symbol} post {i}", 'created_at': '2025-11-28T15:30:00Z'} for i in range(3)
+    ]
+    
+    serial = scraper.collect_community_data(num_symbols=4)
+    concurrent = scraper.collect_community_data(num_symbols=4, max_workers=4)
+    scraper.close()
+    
+    assert serial == concurrent
+    assert len(concurrent['messages']) == 12
+    assert [m['symbol'] for m in concurrent['messages'][::3]] == ['AAPL', 'MSFT', 'TSLA', 'NVDA']
+    print("✓ Concurrent collection test passed")
+
+
+def test_collection_keeps_message_sentiment():
+    """Test collected records carry the message id and the author's sentiment tag."""
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0))
+    scraper.get_most_mentioned_symbols = lambda limit=30: [{'symbol': 'NVDA'}]
+    scraper.get_recent_posts = lambda symbol, limit=30: [
+        {'id': 2, 'body': 'NVDA up', 'created_at': '2025-11-28T15:30:00Z',
+         'entities': {'sentiment': {'basic': 'Bullish'}}},
+        {'id': 1, 'body': 'NVDA meh', 'created_at': '2025-11-28T15:29:00Z', 'entities': {'sentiment': None}},
+    ]
+    messages = scraper.collect_community_data(num_symbols=1)['messages']
+    scraper.close()
+    
+    assert [(m['id'], m['sentiment']) for m in messages] == [(2, 'Bullish'), (1, None)]
+    print("✓ Sentiment retention test passed")
+
+
+def _paged_scraper(newest_id):
+    """Scraper whose message stream holds ids newest_id..1, one per minute."""
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0))
+    scraper.requests_made = []
+    
+    def fetch_page(symbol, params):
+        scraper.requests_made.append(dict(params))
+        top = min(params.get('max', newest_id), newest_id)
+        ids = list(range(top, params.get('since', 0), -1))[:params['limit']]
+        return {
+            'messages': [{'id': i, 'body': f"${symbol} #{i}",
+                          'created_at': f"2025-11-28T{10 + i // 60:02d}:{i % 60:02d}:00Z"} for i in ids],
+            'cursor': {'more': bool(ids) and ids[-1] > 1, 'max': ids[-1] - 1 if ids else None},
+        }
+    
+    scraper._fetch_messages_page = fetch_page
+    return scraper
+
+
+def test_paginated_backfill_resumes_from_cursor(tmp_path):
+    """Test lazy paging, message bounds and resuming from a persisted cursor."""
+    path = str(tmp_path / 'cursors.json')
+    scraper = _paged_scraper(newest_id=100)
+    
+    pages = scraper.backfill_messages('AAPL', CursorStore(path), limit=30, max_messages=45)
+    assert scraper.requests_made == []
+    ids = [m['id'] for page in pages for m in page]
+    assert ids == list(range(100, 55, -1))
+    
+    resumed = [m['id'] for page in scraper.backfill_messages('AAPL', CursorStore(path), limit=30) for m in page]
+    assert resumed == list(range(55, 0, -1))
+    print("✓ Paginated backfill test passed")
+
+
+def test_poll_fetches_only_new_messages(tmp_path):
+    """Test that incremental polls ask only for messages after the last seen id."""
+    cursors = CursorStore(str(tmp_path / 'cursors.json'))
+    scraper = _paged_scraper(newest_id=40)
+    assert len(scraper.poll_new_messages('AAPL', cursors, limit=30)) == 30
+    
+    newer = _paged_scraper(newest_id=75)
+    fresh = newer.poll_new_messages('AAPL', cursors, limit=30)
+    
+    assert [m['id'] for m in fresh] == list(range(75, 40, -1))
+    assert all(r['since'] == 40 for r in newer.requests_made)
+    assert newer.poll_new_messages('AAPL', cursors) == []
+    print("✓ Incremental poll test passed")
+
+
+def test_capped_poll_keeps_skipped_messages(tmp_path):
+    """Test a page-capped poll leaves a gap that later polls read before newer messages."""
+    cursors = CursorStore(str(tmp_path / 'cursors.json'))
+    _paged_scraper(newest_id=40).poll_new_messages('AAPL', cursors, limit=30)
+    
+    scraper = _paged_scraper(newest_id=150)
+    first = [m['id'] for m in scraper.poll_new_messages('AAPL', cursors, limit=30, max_pages=1)]
+    assert first == list(range(150, 120, -1))
+    assert cursors.newest('AAPL') == 150 and cursors.gap('AAPL') == (40, 120)
+    
+    second = [m['id'] for m in scraper.poll_new_messages('AAPL', cursors, limit=30, max_pages=2)]
+    assert second == list(range(120, 60, -1))
+    assert CursorStore(str(tmp_path / 'cursors.json')).gap('AAPL') == (40, 60)
+    
+    newer = _paged_scraper(newest_id=160)
+    third = [m['id'] for m in newer.poll_new_messages('AAPL', cursors, limit=30, max_pages=2)]
+    assert third == list(range(160, 150, -1)) + list(range(60, 40, -1))
+    assert cursors.gap('AAPL') is None and cursors.newest('AAPL') == 160
+    print("✓ Capped poll test passed")
+
+
+def test_backfill_stops_at_time_bound():
+    """Test the created_at lower bound."""
+    scraper = _paged_scraper(newest_id=100)
+    until = 1764324000.0 + 70 * 60  # 2025-11-28T11:10:00Z
+    
+    ids = [m['id'] for page in scraper.iter_message_pages('AAPL', until=until) for m in page]
+    
+    assert ids == list(range(100, 69, -1))
+    print("✓ Time-bounded backfill test passed")
+
+
+if __name__ == "__main__":
+    test_token_bucket_paces_requests()
+    test_token_bucket_honors_rate_limit_headers()
+    test_concurrent_collection_preserves_order()
+    test_collection_keeps_message_sentiment()
+    import tempfile
+    import pathlib
+    test_paginated_backfill_resumes_from_cursor(pathlib.Path(tempfile.mkdtemp()))
+    test_poll_fetches_only_new_messages(pathlib.Path(tempfile.mkdtemp()))
+    test_capped_poll_keeps_skipped_messages(pathlib.Path(tempfile.mkdtemp()))
+    test_backfill_stops_at_time_bound()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,61 @@
+"""Tests for per-symbol sentiment aggregation."""
+
+import sys
+import os
+import math
+from datetime import datetime, timezone
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sentiment import aggregate_sentiment
+from timestamps import parse_timestamp
+
+NOW = parse_timestamp('2025-11-28T16:00:00Z')
+
+
+def _message(symbol, minutes_ago, sentiment=None):
+    created = datetime.fromtimestamp(NOW - minutes_ago * 60, timezone.utc)
+    return {'id': None, 'symbol': symbol, 'sentiment': sentiment,
+            'timestamp': created.strftime('%Y-%m-%dT%H:%M:%SZ')}
+
+
+def test_ratios_velocity_and_momentum():
+    """Test bullish/bearish ratios, messages per hour and momentum per symbol."""
+    messages = [
+        # NVDA turns bullish: bearish an hour ago, bullish now
+        _message('NVDA', 90, 'Bearish'), _message('NVDA', 80, 'Bearish'), _message('NVDA', 70, 'Bullish'),
+        _message('NVDA', 30, 'Bullish'), _message('NVDA', 20, 'Bullish'), _message('NVDA', 10),
+        # SPY: untagged chatter only
+        _message('SPY', 5), _message('SPY', 100),
+        {'id': 9, 'symbol': 'SPY', 'timestamp': 'not a time', 'sentiment': 'Bearish'},
+    ]
+    table = aggregate_sentiment(messages, window_seconds=3600, now=NOW)
+
+    assert list(table.index) == ['NVDA', 'SPY']
+    nvda = table.loc['NVDA']
+    assert nvda['messages'] == 6 and nvda['bullish'] == 3 and nvda['bearish'] == 2
+    assert abs(nvda['bullish_ratio'] - 0.6) < 1e-9 and abs(nvda['bearish_ratio'] - 0.4) < 1e-9
+    assert nvda['velocity'] == 3.0
+    # Recent hour averages +1, the hour before (-1, -1, +1) averages -1/3
+    assert abs(nvda['momentum'] - 4 / 3) < 1e-9
+
+    spy = table.loc['SPY']
+    assert spy['messages'] == 3 and spy['bearish'] == 1 and spy['bullish_ratio'] == 0.0
+    assert spy['velocity'] == 1.0 and math.isnan(spy['momentum'])
+    print("✓ Sentiment aggregation test passed")
+
+
+def test_window_defaults_to_newest_message():
+    """Test the recent window ends at the newest message when no time is given."""
+    messages = [_message('TSLA', 240, 'Bullish'), _message('TSLA', 250, 'Bearish')]
+    table = aggregate_sentiment(messages, window_seconds=1800)
+    assert table.loc['TSLA', 'velocity'] == 4.0
+    assert aggregate_sentiment([]).empty
+    print("✓ Default window test passed")
+
+
+if __name__ == "__main__":
+    test_ratios_velocity_and_momentum()
+    test_window_defaults_to_newest_message()
+    print("\n✓ All tests passed!")
@@ -0,0 +1,49 @@
+"""Tests for the historical snapshot store."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_data import MarketSnapshot
+from snapshot_store import SnapshotStore
+
+DAY = 86400
+
+
+def _snapshot(fetched_at, active):
+    return MarketSnapshot({
+        'most_active': [{'symbol': s, 'name': s, 'price': p, 'change': '+1.00%', 'volume': '1M'} for s, p in active],
+        'gainers': [{'symbol': 'SMX', 'name': 'SMX', 'price': 49.02, 'change': '+231.11%', 'volume': '22.54M'}],
+        'losers': [{'symbol': 'NAIL', 'name': 'Direxion', 'price': 0.0, 'change': '-0.36%', 'volume': 'N/A'}],
+    }, fetched_at=fetched_at)
+
+
+def test_symbol_history_and_list_at(tmp_path):
+    """Test per-symbol range queries and point-in-time list lookups."""
+    store = SnapshotStore(str(tmp_path / 'snapshots.db'))
+    base = 1_764_000_000.0
+    assert store.append(_snapshot(base, [('SPY', 680.0), ('NVDA', 170.0)]))
+    assert store.append(_snapshot(base + 2 * DAY, [('NVDA', 176.0), ('SPY', 683.0)]))
+    assert store.append(_snapshot(base + 10 * DAY, [('TSLA', 430.0)]))
+    assert not store.append(_snapshot(base, [('SPY', 680.0)]))
+    
+    history = store.symbol_history('NVDA', days=5, now=base + 3 * DAY)
+    assert [row['price'] for row in history] == [170.0, 176.0]
+    assert store.symbol_history('NVDA', days=5, now=base + 10 * DAY) == []
+    
+    listing = store.list_at(base + 5 * DAY)
+    assert [row['symbol'] for row in listing] == ['NVDA', 'SPY']
+    assert store.list_at(base - 1) == []
+    assert store.list_at(base, list_name='losers')[0]['volume'] is None
+    assert len(store.snapshot_times()) == 3
+    store.close()
+    print("✓ Snapshot store test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_symbol_history_and_list_at(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")
@@ -0,0 +1,124 @@
+"""Tests for the shared retrying HTTP transport."""
+
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from transport import CircuitBreaker, CircuitOpenError, Transport
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers with the next status from ``script`` (200 once it runs out)."""
+
+    protocol_version = 'HTTP/1.1'
+    script = []
+    hits = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        ScriptedHandler.hits += 1
+        status = ScriptedHandler.script.pop(0) if ScriptedHandler.script else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '7')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ScriptedHandler.script, ScriptedHandler.hits = [], 0
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _transport(**kwargs):
+    transport = Transport(**kwargs)
+    transport.adapter.sleeps = []
+    transport.adapter._sleep = transport.adapter.sleeps.append
+    transport.adapter._jitter = lambda: 0.5
+    return transport
+
+
+def test_retries_with_backoff_and_retry_after(server_url):
+    """Test transient 5xx/429 retries, Retry-After and jittered backoff."""
+    transport = _transport(max_retries=3, backoff_base=1.0)
+    ScriptedHandler.script = [503, 429, 502]
+    
+    response = transport.session.get(server_url)
+    
+    assert response.status_code == 200
+    assert transport.adapter.sleeps == [0.5, 7.0, 2.0]
+    stats = transport.stats()
+    assert stats['retries'] == 3 and stats['attempts'] == 4
+    assert stats['connections_reused'] >= 1
+    transport.close()
+    print(f"✓ Retry test passed: {stats}")
+
+
+def test_circuit_breaker_fails_fast(server_url):
+    """Test that repeated failures open the host circuit until the cooldown ends."""
+    transport = _transport(max_retries=0, breaker_threshold=2, breaker_cooldown=60)
+    ScriptedHandler.script = [500, 500]
+    
+    assert transport.session.get(server_url).status_code == 500
+    assert transport.session.get(server_url).status_code == 500
+    with pytest.raises(CircuitOpenError):
+        transport.session.get(server_url)
+    
+    assert ScriptedHandler.hits == 2
+    assert transport.stats()['circuit_rejections'] == 1
+    transport.close()
+    print("✓ Circuit breaker test passed")
+
+
+def test_rate_limiting_does_not_open_circuit(server_url):
+    """Test that 429 responses leave the circuit closed."""
+    transport = _transport(max_retries=0, breaker_threshold=2, breaker_cooldown=60)
+    ScriptedHandler.script = [429, 429, 429]
+    
+    for _ in range(3):
+        assert transport.session.get(server_url).status_code == 429
+    assert transport.session.get(server_url).status_code == 200
+    assert transport.stats()['circuit_rejections'] == 0
+    transport.close()
+    print("✓ Rate-limit breaker test passed")
+
+
+def test_breaker_half_opens_after_cooldown():
+    """Test that a trial request is allowed once the cooldown passes."""
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=1, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure('api')
+    assert not breaker.allow('api')
+    
+    now[0] = 10.0
+    assert breaker.allow('api')
+    assert not breaker.allow('api'), "only one trial while half-open"
+    breaker.record_failure('api')
+    assert breaker.is_open('api') and not breaker.allow('api')
+    
+    now[0] = 20.0
+    assert breaker.allow('api')
+    assert not breaker.allow('api')
+    breaker.record_success('api')
+    assert breaker.allow('api') and breaker.allow('api')
+    print("✓ Half-open test passed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-q'])
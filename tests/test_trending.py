@@ -0,0 +1,65 @@
+"""Tests for sliding-window trending counts."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from timestamps import parse_timestamp
+from trending import SlidingWindowCounter
+
+
+def test_window_expires_old_buckets():
+    """Test that mentions leave the window once their bucket expires."""
+    counter = SlidingWindowCounter(bucket_seconds=60, num_buckets=5)
+    
+    counter.add(['AAPL', 'AAPL'], 0)
+    counter.add(['MSFT'], 120)
+    assert counter.top(5) == [('AAPL', 2), ('MSFT', 1)]
+    
+    counter.add(['TSLA'], 300)
+    assert dict(counter.top(5)) == {'MSFT': 1, 'TSLA': 1}
+    
+    counter.add(['NVDA'], 10_000)
+    assert counter.top(5) == [('NVDA', 1)]
+    print("✓ Window expiry test passed")
+
+
+def test_top_last_minutes_and_decay():
+    """Test partial-window queries and exponential decay."""
+    counter = SlidingWindowCounter(bucket_seconds=60, num_buckets=60)
+    counter.add(['AAPL'] * 3, 0)
+    counter.add(['MSFT'] * 2, 600)
+    
+    assert counter.top(5, minutes=5) == [('MSFT', 2)]
+    assert counter.top(1) == [('AAPL', 3)]
+    
+    decayed = SlidingWindowCounter(bucket_seconds=60, num_buckets=60, half_life=300)
+    decayed.add(['AAPL'] * 3, 0)
+    decayed.add(['MSFT'] * 2, 600)
+    top = dict(decayed.top(5))
+    assert top['MSFT'] == 2 and abs(top['AAPL'] - 0.75) < 1e-9
+    print("✓ Partial window and decay test passed")
+
+
+def test_add_messages_from_collected_data():
+    """Test ingesting collect_community_data message records."""
+    counter = SlidingWindowCounter()
+    added = counter.add_messages([
+        {'symbol': 'AAPL', 'message': 'AAPL breaking out', 'timestamp': '2025-11-28T15:30:00Z'},
+        {'symbol': 'AAPL', 'message': 'AAPL and MSFT', 'timestamp': '2025-11-28T15:31:10Z'},
+        {'symbol': 'AAPL', 'message': 'no timestamp AAPL', 'timestamp': ''},
+    ])
+    
+    assert added == 2
+    assert counter.top(2) == [('AAPL', 2), ('MSFT', 1)]
+    assert parse_timestamp('2025-11-28T15:30:00Z') == 1764343800.0
+    print("✓ Message ingestion test passed")
+
+
+if __name__ == "__main__":
+    test_window_expires_old_buckets()
+    test_top_last_minutes_and_decay()
+    test_add_messages_from_collected_data()
+    print("\n✓ All tests passed!")
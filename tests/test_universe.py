@@ -0,0 +1,91 @@
+"""Tests for the compiled ticker universe."""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import SymbolAnalyzer
+from market_data import MarketDataFetcher
+from rate_limit import TokenBucket
+from scraper import StockTwitsScraper
+from symbol_matcher import load_universe
+from universe import TickerInfo, TickerUniverse, compile_universe
+
+MASTER_LIST = """Symbol,Name,Exchange,Type
+msft,Microsoft Corp,NASDAQ,Equity
+AAPL,Apple Inc,NASDAQ,Equity
+SPY,SPDR S&P 500 ETF,NYSE Arca,ETF
+BRK.B,Berkshire Hathaway Inc,NYSE,Equity
+GOOGL,Alphabet Inc,NASDAQ,Equity
+AAPL,Apple Inc.,NASDAQ,Equity
+ÄPFEL,Äpfel AG,XETRA,Equity
+"""
+
+
+def _compile(tmp_path) -> str:
+    source = tmp_path / 'master.csv'
+    source.write_text(MASTER_LIST, encoding='utf-8')
+    index = str(tmp_path / 'tickers.idx')
+    assert compile_universe(str(source), index) == 5
+    return index
+
+
+def test_compiled_lookups(tmp_path):
+    """Test membership, metadata and ordering read back from the index."""
+    with TickerUniverse(_compile(tmp_path)) as universe:
+        assert len(universe) == 5
+        assert list(universe) == ['AAPL', 'BRK.B', 'GOOGL', 'MSFT', 'SPY']
+        assert 'msft' in universe and 'BRK.B' in universe
+        assert 'MSF' not in universe and 'MSFTX' not in universe and 'TOOLONG' not in universe
+        assert universe.lookup('AAPL') == TickerInfo('AAPL', 'Apple Inc.', 'NASDAQ', 'Equity')
+        assert universe.lookup('spy').type == 'ETF'
+        assert universe.lookup('ZZZ') is None and universe.lookup('') is None
+
+    bogus = tmp_path / 'plain.txt'
+    bogus.write_text('AAPL\nMSFT\n', encoding='utf-8')
+    try:
+        TickerUniverse(str(bogus))
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✓ Compiled lookup test passed")
+
+
+def test_analyzer_scraper_and_fetcher_use_index(tmp_path):
+    """Test the index drives symbol matching, trending filtering and quote enrichment."""
+    universe = load_universe(_compile(tmp_path))
+    assert isinstance(universe, TickerUniverse)
+    analyzer = SymbolAnalyzer(universe=universe)
+    assert analyzer.extract_symbols("GOOGL and BRK.B beat, IT IS GREAT") == ['GOOGL', 'BRK.B']
+
+    scraper = StockTwitsScraper(rate_limiter=TokenBucket(rate=1000.0, capacity=100.0), universe=universe)
+    scraper.get_most_mentioned_symbols = lambda limit=30: [{'symbol': 'BTC.X'}, {'symbol': 'SPY'}]
+    scraper.get_recent_posts = lambda symbol, limit=30: [{'id': 1, 'body': f'${symbol}'}]
+    data = scraper.collect_community_data(num_symbols=2)
+    assert data['symbols'] == [{'symbol': 'SPY', 'exchange': 'NYSE Arca', 'type': 'ETF'}]
+    assert [m['symbol'] for m in data['messages']] == ['SPY']
+    scraper.close()
+
+    fetcher = MarketDataFetcher(api_key='test', universe=universe)
+    requested = []
+
+    def fake_batch(symbols):
+        requested.extend(symbols)
+        return {s: {'symbol': s, 'price': 1.0} for s in symbols}
+
+    fetcher._fetch_quote_batch = fake_batch
+    prices = fetcher.get_stock_prices(['aapl', 'NOPE', 'MSFT'])
+    assert requested == ['AAPL', 'MSFT']
+    assert prices['AAPL']['name'] == 'Apple Inc.' and prices['MSFT']['name'] == 'Microsoft Corp'
+    universe.close()
+    print("✓ Index integration test passed")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_compiled_lookups(pathlib.Path(tempfile.mkdtemp()))
+    test_analyzer_scraper_and_fetcher_use_index(pathlib.Path(tempfile.mkdtemp()))
+    print("\n✓ All tests passed!")